@@ -1,17 +1,31 @@
 """
 算法模块初始化文件
+各检测器依赖torch与ultralytics，按需在首次访问时导入，避免导入服务层时加载模型框架
 """
 
-from .loitering import LoiteringDetector
-from .leave import LeaveDetector
-from .gather import GatherDetector
-from .banner import BannerDetector
-from .coordinator import VideoProcessingCoordinator
+import importlib
 
-__all__ = [
-    "LoiteringDetector",
-    "LeaveDetector",
-    "GatherDetector",
-    "BannerDetector",
-    "VideoProcessingCoordinator"
-]
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    "LoiteringDetector": ".loitering",
+    "LeaveDetector": ".leave",
+    "GatherDetector": ".gather",
+    "BannerDetector": ".banner",
+    "VideoProcessingCoordinator": ".coordinator"
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """首次访问时导入对应子模块并缓存导出对象"""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """包含按需导入的导出名称"""
+    return sorted(set(globals()) | set(__all__))
@@ -3,6 +3,7 @@
 """
 
 from .detector import BannerDetector
+from .scheduler import BannerScheduler
 from .processor import process_banner_video
 
-__all__ = ["BannerDetector", "process_banner_video"]
+__all__ = ["BannerDetector", "BannerScheduler", "process_banner_video"]
@@ -7,13 +7,16 @@ import cv2
 import numpy as np
 import sys
 import torch
+import torchvision
 import os
 from ultralytics import YOLO
 import time
 
 
 class BannerDetector:
-    def __init__(self, model_path=None, conf_threshold=0.3, iou_threshold=0.45, img_size=640, device='cuda'):
+    def __init__(self, model_path=None, conf_threshold=0.3, iou_threshold=0.45, img_size=640, device='cuda',
+                 tiled=False, tile_size=640, tile_overlap=0.2, global_pass=True,
+                 tile_change_threshold=16.0, tile_max_age=10):
         """
         初始化横幅检测器
 
@@ -23,6 +26,12 @@ class BannerDetector:
             iou_threshold (float): NMS IoU阈值
             img_size (int): 图像处理尺寸
             device (str): 运行设备 ('cuda' 或 'cpu')
+            tiled (bool): 是否启用切片推理（适用于4K等高分辨率画面中的远处小横幅）
+            tile_size (int): 切片边长（像素），同时作为切片推理尺寸
+            tile_overlap (float): 相邻切片的重叠比例 [0, 1)
+            global_pass (bool): 切片模式下是否额外进行一次整帧低分辨率推理（用于检测跨切片的大横幅）
+            tile_change_threshold (float): 切片变化阈值，切片缩略灰度图与上次推理时的最大绝对差（0-255）超过该值时重新推理
+            tile_max_age (int): 切片缓存结果最多复用的切片推理次数，超过后即使画面未变化也重新推理，0表示不复用
         """
         # 获取项目根目录
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -71,9 +80,18 @@ class BannerDetector:
         self.iou_threshold = iou_threshold
         self.img_size = img_size
 
-        # 告警频率控制
-        self.last_alarm_time = 0
-        self.alarm_interval = 10  # 告警间隔时间（秒）
+        # 切片推理参数
+        self.tiled = tiled
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.global_pass = global_pass
+        self.tile_change_threshold = tile_change_threshold
+        self.tile_max_age = tile_max_age
+
+        # 切片缓存：{切片区域: (推理时的缩略图, 该切片在整帧坐标下的检测结果, 推理时的切片推理序号)}，
+        # 画面未变化且未超过最大复用次数的切片直接复用上次结果
+        self.tile_cache = {}
+        self.tile_round = 0
 
         # 绘制参数
         self.SHOW_LABEL = True  # 是否显示检测标签
@@ -87,61 +105,198 @@ class BannerDetector:
         self.detected_banners = []
         print(f"[BannerDetector] 初始化完成")
 
-    def detect_banner(self, frame):
+    def detect_banner(self, frame, detections=None):
         """
         检测视频帧中的横幅
 
         Args:
             frame: 视频帧
+            detections: 预先计算的检测结果 (N, 6) [x1, y1, x2, y2, conf, cls]，
+                由 MultiModelInference 共享预处理推理得到时传入，此时不再调用模型
 
         Returns:
             results: 检测结果
             banners: 横幅信息
         """
-        # 使用YOLOv12检测目标
-        results = self.model(
-            frame,
-            imgsz=self.img_size,
-            conf=self.conf_threshold,
-            iou=self.iou_threshold,
-            verbose=False  # 关闭推理日志输出
-        )
-
-        # 解析检测结果
+        if detections is not None:
+            results = None
+        elif self.tiled:
+            # 切片推理模式
+            results, detections = self.detect_tiled(frame)
+        else:
+            # 使用YOLOv12检测目标
+            results = self.model.infer_frames(
+                frame,
+                imgsz=self.img_size,
+                conf=self.conf_threshold,
+                iou=self.iou_threshold
+            )
+            detections = [r.boxes.data.cpu().numpy() for r in results if r.boxes is not None]
+            detections = np.concatenate(detections) if detections else np.zeros((0, 6), dtype=np.float32)
+
+        # 解析检测结果，detections每行为 [x1, y1, x2, y2, conf, cls]
         banners = []
-        for r in results:
-            boxes = r.boxes  # 检测框信息
-            if boxes is not None:
-                for box in boxes:
-                    # 获取检测框坐标（转换为整数）
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    # 获取置信度和类别
-                    conf = box.conf[0].item()
-                    cls = int(box.cls[0].item())
-                    cls_name = self.model.names[cls]  # 类别名称
-
-                    # 存储检测信息
-                    banners.append({
-                        'box': (x1, y1, x2, y2),
-                        'confidence': conf,
-                        'class': cls_name
-                    })
+        for det in detections:
+            # 获取检测框坐标（转换为整数）
+            x1, y1, x2, y2 = map(int, det[:4])
+            # 获取置信度和类别
+            conf = float(det[4])
+            cls = int(det[5])
+            cls_name = self.model.names[cls]  # 类别名称
+
+            # 存储检测信息
+            banners.append({
+                'box': (x1, y1, x2, y2),
+                'confidence': conf,
+                'class': cls_name
+            })
 
         # 更新检测到的信息
         self.detected_banners = banners
 
-        # 告警频率控制 - 只有在有检测结果且距离上次告警超过间隔时间时才触发告警
-        current_time = time.time()
-        should_trigger_alarm = (
-            len(banners) > 0 and 
-            (current_time - self.last_alarm_time) >= self.alarm_interval
-        )
-        
-        if should_trigger_alarm:
-            self.last_alarm_time = current_time
-
         return results, banners
 
+    def get_tile_regions(self, width, height):
+        """
+        计算覆盖整帧且相互重叠的切片区域
+
+        Args:
+            width: 帧宽度
+            height: 帧高度
+
+        Returns:
+            list: 切片区域列表 [(x1, y1, x2, y2), ...]
+        """
+        tile = self.tile_size
+        step = max(1, int(tile * (1 - self.tile_overlap)))
+
+        def starts(length):
+            # 画面小于切片时只取一个切片；否则按步长滑动，并保证最后一个切片贴齐画面边缘
+            if length <= tile:
+                return [0]
+            positions = list(range(0, length - tile, step))
+            positions.append(length - tile)
+            return positions
+
+        return [
+            (x, y, min(x + tile, width), min(y + tile, height))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+
+    @staticmethod
+    def tile_thumbnail(image):
+        """
+        计算切片内容的缩略灰度图
+
+        缩小为64x64灰度图（640像素的切片每个缩略像素对应10x10像素），区域平均可以抑制传感器噪声，
+        同时保留足够的分辨率，切片中出现或消失的小横幅仍会使对应位置的缩略像素明显变化。
+
+        Args:
+            image: 切片图像
+
+        Returns:
+            np.ndarray: 缩略灰度图 (64, 64)，float32
+        """
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        return cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def tile_stale(self, cached, thumb):
+        """
+        判断切片的缓存结果是否需要重新推理
+
+        与上次推理时（而不是上一帧）的缩略图比较，缓慢累积的变化最终也会触发重新推理；
+        缓存结果复用超过 tile_max_age 次切片推理后强制重新推理，避免漏检的结果被无限期沿用。
+
+        Args:
+            cached: 切片缓存项，None表示没有缓存
+            thumb: 当前切片的缩略灰度图
+
+        Returns:
+            bool: 是否需要重新推理
+        """
+        if cached is None or self.tile_round - cached[2] >= self.tile_max_age:
+            return True
+        return float(np.abs(thumb - cached[0]).max()) > self.tile_change_threshold
+
+    def detect_tiled(self, frame):
+        """
+        切片推理：将高分辨率帧切成重叠的切片，批量送入模型，并在整帧坐标下进行NMS合并
+
+        内容未变化的切片（缩略图与上次推理时的差异不超过阈值）直接复用缓存结果，不再送入模型；
+        每个切片至少每 tile_max_age 次切片推理重新推理一次。
+
+        Args:
+            frame: 视频帧
+
+        Returns:
+            results: 本次实际执行推理的切片检测结果
+            detections: 整帧坐标下的检测结果 (N, 6) [x1, y1, x2, y2, conf, cls]
+        """
+        height, width = frame.shape[:2]
+        regions = self.get_tile_regions(width, height)
+        self.tile_round += 1
+
+        # 画面尺寸变化时切片布局随之变化，清空缓存
+        if set(self.tile_cache) - set(regions) - {"global"}:
+            self.tile_cache = {}
+
+        # 找出内容有变化或缓存已过期、需要重新推理的切片
+        pending_regions, pending_tiles, thumbs = [], [], {}
+        for region in regions:
+            x1, y1, x2, y2 = region
+            tile = frame[y1:y2, x1:x2]
+            thumbs[region] = self.tile_thumbnail(tile)
+            if self.tile_stale(self.tile_cache.get(region), thumbs[region]):
+                pending_regions.append(region)
+                pending_tiles.append(tile)
+
+        # 所有需要推理的切片合并为一个批次，只调用一次模型
+        results = []
+        if pending_tiles:
+            results = self.model.infer_frames(
+                pending_tiles,
+                imgsz=self.tile_size,
+                conf=self.conf_threshold,
+                iou=self.iou_threshold
+            )
+            for region, r in zip(pending_regions, results):
+                dets = r.boxes.data.cpu().numpy() if r.boxes is not None else np.zeros((0, 6), dtype=np.float32)
+                dets = dets[:, :6].copy()
+                # 切片坐标 -> 整帧坐标
+                dets[:, [0, 2]] += region[0]
+                dets[:, [1, 3]] += region[1]
+                self.tile_cache[region] = (thumbs[region], dets, self.tile_round)
+
+        # 整帧低分辨率推理，用于检测尺寸超过单个切片的大横幅
+        if self.global_pass and len(regions) > 1:
+            thumb = self.tile_thumbnail(frame)
+            if self.tile_stale(self.tile_cache.get("global"), thumb):
+                global_results = self.model.infer_frames(
+                    frame,
+                    imgsz=self.img_size,
+                    conf=self.conf_threshold,
+                    iou=self.iou_threshold
+                )
+                boxes = global_results[0].boxes
+                dets = boxes.data.cpu().numpy()[:, :6] if boxes is not None else np.zeros((0, 6), dtype=np.float32)
+                self.tile_cache["global"] = (thumb, dets, self.tile_round)
+                results = list(results) + list(global_results)
+        else:
+            self.tile_cache.pop("global", None)
+
+        detections = [dets for dets in (entry[1] for entry in self.tile_cache.values()) if len(dets)]
+        if not detections:
+            return results, np.zeros((0, 6), dtype=np.float32)
+        detections = np.concatenate(detections)
+
+        # 在整帧坐标下按类别进行NMS，合并重叠切片中的重复检测
+        boxes = torch.from_numpy(detections[:, :4]).float()
+        scores = torch.from_numpy(detections[:, 4]).float()
+        classes = torch.from_numpy(detections[:, 5]).long()
+        keep = torchvision.ops.batched_nms(boxes, scores, classes, self.iou_threshold).numpy()
+        return results, detections[keep]
+
     def draw_detections(self, frame, banners):
         """
         在帧上绘制检测结果
@@ -7,6 +7,20 @@ from typing import Optional, List, Tuple
 from ..video_processing.core import VideoProcessorCore
 from ..video_processing.utils import draw_detection_box, put_text
 from .detector import BannerDetector
+from .scheduler import BannerScheduler
+from ...config.settings import (
+    BANNER_TILED_INFERENCE,
+    BANNER_TILE_SIZE,
+    BANNER_TILE_OVERLAP,
+    BANNER_TILE_GLOBAL_PASS,
+    BANNER_TILE_CHANGE_THRESHOLD,
+    BANNER_TILE_MAX_AGE,
+    BANNER_SCHEDULE_INTERVAL,
+    BANNER_CONFIRM_INTERVAL,
+    BANNER_CONFIRM_K,
+    BANNER_CONFIRM_M,
+    BANNER_SCENE_CHANGE_THRESHOLD
+)
 import cv2
 
 
@@ -43,7 +57,13 @@ def process_banner_video(
         model_path=None,  # 横幅检测使用专用的banner_weight.pt模型
         conf_threshold=conf_threshold,
         iou_threshold=iou_threshold,
-        device=device
+        device=device,
+        tiled=BANNER_TILED_INFERENCE,
+        tile_size=BANNER_TILE_SIZE,
+        tile_overlap=BANNER_TILE_OVERLAP,
+        global_pass=BANNER_TILE_GLOBAL_PASS,
+        tile_change_threshold=BANNER_TILE_CHANGE_THRESHOLD,
+        tile_max_age=BANNER_TILE_MAX_AGE
     )
     print("BannerDetector初始化完成")
 
@@ -62,6 +82,15 @@ def process_banner_video(
     # 初始化视频写入器
     out = core.create_video_writer(output_path, fps, width, height)
 
+    # 横幅检测调度器，使用帧时间作为时钟
+    scheduler = BannerScheduler(
+        interval=BANNER_SCHEDULE_INTERVAL,
+        confirm_k=BANNER_CONFIRM_K,
+        confirm_m=BANNER_CONFIRM_M,
+        confirm_interval=BANNER_CONFIRM_INTERVAL,
+        scene_change_threshold=BANNER_SCENE_CHANGE_THRESHOLD
+    )
+
     frame_count = 0
     total_banners = 0
 
@@ -74,11 +103,12 @@ def process_banner_video(
         if frame_count % 30 == 0:  # 每30帧输出一次进度
             print(f"处理进度: {frame_count}/{total_frames} 帧")
 
-        # 执行横幅检测
-        results, banners = detector.detect_banner(frame)
+        # 按调度执行横幅检测，未采样的帧沿用上次确认的结果
+        frame_time = frame_count / (fps or 30)
+        banners, alert_triggered = scheduler.step(frame, lambda f: detector.detect_banner(f)[1], frame_time)
 
         # 调试输出
-        if banners:
+        if alert_triggered:
             print(f"第{frame_count}帧检测到 {len(banners)} 个横幅")
             for i, banner in enumerate(banners):
                 print(f"  横幅{i + 1}: 类别={banner['class']}, 置信度={banner['confidence']:.2f}, "
@@ -95,7 +125,8 @@ def process_banner_video(
     core.release_resources(cap, out)
 
     print(f"横幅检测处理完成!")
-    print(f"总帧数: {frame_count}, 检测到横幅的总次数: {total_banners}")
+    print(f"总帧数: {frame_count}, 检测到横幅的总次数: {total_banners}, "
+          f"推理帧占比: {scheduler.duty_cycle:.1%}")
 
     return output_path
 
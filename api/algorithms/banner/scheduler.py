@@ -0,0 +1,157 @@
+"""
+横幅检测调度模块
+横幅属于静态目标，无需逐帧推理：按固定周期采样，画面发生明显变化时立即采样，
+并在最近M次采样中至少K次检测到横幅时才确认告警
+"""
+
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class BannerScheduler:
+    """横幅检测低占空比调度器"""
+
+    def __init__(self, interval=5.0, confirm_k=2, confirm_m=3, confirm_interval=1.0,
+                 scene_change_threshold=12.0):
+        """
+        初始化调度器
+
+        Args:
+            interval (float): 常规采样周期（秒），画面无变化时每隔该时间执行一次模型推理
+            confirm_k (int): 确认告警所需的命中次数K
+            confirm_m (int): 确认窗口内的采样次数M
+            confirm_interval (float): 存在未确认的命中时使用的加速采样周期（秒），避免确认耗时K*interval
+            scene_change_threshold (float): 场景变化阈值，缩略灰度图的平均绝对差（0-255）超过该值时立即采样
+        """
+        if not 1 <= confirm_k <= confirm_m:
+            raise ValueError("确认参数必须满足 1 <= K <= M")
+
+        self.interval = interval
+        self.confirm_k = confirm_k
+        self.confirm_interval = confirm_interval
+        self.scene_change_threshold = scene_change_threshold
+
+        # 最近M次采样是否检测到横幅
+        self.history = deque(maxlen=confirm_m)
+
+        # 上次推理的时间和画面缩略图
+        self.last_run_time = None
+        self.reference_thumb = None
+
+        # 当前已确认的横幅（两次采样之间用于绘制）
+        self.confirmed = False
+        self.confirmed_banners = []
+
+        # 统计信息
+        self.frames_seen = 0
+        self.frames_inferred = 0
+
+    @staticmethod
+    def _thumbnail(frame):
+        """
+        生成用于场景变化检测的缩略灰度图
+
+        先按步长抽取像素再缩放，4K画面的计算量也只有几十微秒级别
+        """
+        h, w = frame.shape[:2]
+        step = max(1, min(h, w) // 144)
+        small = frame[::step, ::step]
+        if small.ndim == 3:
+            small = cv2.cvtColor(np.ascontiguousarray(small), cv2.COLOR_BGR2GRAY)
+        return cv2.resize(small, (64, 36), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def scene_changed(self, thumb):
+        """
+        判断画面相对上次推理时是否发生明显变化
+
+        Args:
+            thumb: 当前帧缩略图
+
+        Returns:
+            bool: 是否发生场景变化
+        """
+        if self.reference_thumb is None or self.reference_thumb.shape != thumb.shape:
+            return True
+        return float(np.abs(thumb - self.reference_thumb).mean()) > self.scene_change_threshold
+
+    def should_run(self, frame, now=None):
+        """
+        判断当前帧是否需要执行横幅检测
+
+        Args:
+            frame: 视频帧
+            now: 当前时间（秒），离线处理视频时传入帧时间，默认使用系统时间
+
+        Returns:
+            bool: 是否执行模型推理
+        """
+        now = time.time() if now is None else now
+        self.frames_seen += 1
+
+        if self.last_run_time is None:
+            return True
+
+        # 存在未确认的命中时加速采样
+        pending = any(self.history) and not self.confirmed
+        interval = self.confirm_interval if pending else self.interval
+        if now - self.last_run_time >= interval:
+            return True
+
+        return self.scene_changed(self._thumbnail(frame))
+
+    def update(self, frame, banners, now=None):
+        """
+        记录一次采样结果并进行K/M确认
+
+        Args:
+            frame: 本次推理的视频帧
+            banners: 本次检测到的横幅列表
+            now: 当前时间（秒）
+
+        Returns:
+            bool: 是否新触发告警（由未确认变为已确认）
+        """
+        now = time.time() if now is None else now
+        self.frames_inferred += 1
+        self.last_run_time = now
+        self.reference_thumb = self._thumbnail(frame)
+
+        self.history.append(bool(banners))
+        was_confirmed = self.confirmed
+        self.confirmed = sum(self.history) >= self.confirm_k
+
+        if self.confirmed:
+            # 本次未检测到但仍处于确认状态时，保留上次的横幅位置用于绘制
+            if banners:
+                self.confirmed_banners = banners
+        else:
+            self.confirmed_banners = []
+
+        return self.confirmed and not was_confirmed
+
+    def step(self, frame, detect, now=None):
+        """
+        处理一帧：按需调用检测函数并返回用于绘制的已确认横幅
+
+        Args:
+            frame: 视频帧
+            detect: 检测函数，输入帧，返回横幅列表
+            now: 当前时间（秒）
+
+        Returns:
+            tuple: (已确认的横幅列表, 是否新触发告警)
+        """
+        if not self.should_run(frame, now):
+            return self.confirmed_banners, False
+
+        banners = detect(frame)
+        alert_triggered = self.update(frame, banners, now)
+        return self.confirmed_banners, alert_triggered
+
+    @property
+    def duty_cycle(self):
+        """实际执行推理的帧占比"""
+        return self.frames_inferred / self.frames_seen if self.frames_seen else 0.0
@@ -12,6 +12,8 @@ from .gather.processor import process_gather_video, draw_gather_detections
 from .gather.detector import GatherDetector
 from .banner.processor import process_banner_video, draw_banner_detections
 from .banner.detector import BannerDetector
+from .banner.scheduler import BannerScheduler
+from .video_processing.multi_model import MultiModelInference
 
 
 class VideoProcessingCoordinator:
@@ -31,6 +33,8 @@ class VideoProcessingCoordinator:
         self.camera_id = camera_id
         self.model_name = model_name
         self.frame_rate = 30  # 默认帧率
+        # 当前帧产生、等待抓拍后发布的告警 [(告警消息, 告警区域, 事件ID, 是否为close告警)]
+        self.pending_alarms = []
 
     def _get_loitering_detector(self, loitering_time_threshold: int = 10):
         """
@@ -92,64 +96,261 @@ class VideoProcessingCoordinator:
             print(f"[Coordinator] 未找到横幅专用权重文件 {banner_model_path}，使用默认模型 {self.model_name}")
             model_path = self.model_name
         
+        from ..config.settings import (
+            BANNER_TILED_INFERENCE,
+            BANNER_TILE_SIZE,
+            BANNER_TILE_OVERLAP,
+            BANNER_TILE_GLOBAL_PASS,
+            BANNER_TILE_CHANGE_THRESHOLD,
+            BANNER_TILE_MAX_AGE
+        )
+
         return BannerDetector(
             model_path=model_path,
             conf_threshold=conf_threshold,
-            iou_threshold=iou_threshold
+            iou_threshold=iou_threshold,
+            tiled=BANNER_TILED_INFERENCE,
+            tile_size=BANNER_TILE_SIZE,
+            tile_overlap=BANNER_TILE_OVERLAP,
+            global_pass=BANNER_TILE_GLOBAL_PASS,
+            tile_change_threshold=BANNER_TILE_CHANGE_THRESHOLD,
+            tile_max_age=BANNER_TILE_MAX_AGE
         )
 
-    def _draw_leave_detections(self, frame, roi, status, roi_person_count, absence_start_time, threshold, alert_triggered):
+    def _get_banner_scheduler(self):
         """
-        绘制离岗检测结果
+        获取横幅检测调度器实例
+
+        Returns:
+            BannerScheduler: 横幅检测调度器实例
+        """
+        from ..config.settings import (
+            BANNER_SCHEDULE_INTERVAL,
+            BANNER_CONFIRM_INTERVAL,
+            BANNER_CONFIRM_K,
+            BANNER_CONFIRM_M,
+            BANNER_SCENE_CHANGE_THRESHOLD
+        )
+
+        return BannerScheduler(
+            interval=BANNER_SCHEDULE_INTERVAL,
+            confirm_k=BANNER_CONFIRM_K,
+            confirm_m=BANNER_CONFIRM_M,
+            confirm_interval=BANNER_CONFIRM_INTERVAL,
+            scene_change_threshold=BANNER_SCENE_CHANGE_THRESHOLD
+        )
+
+    def _get_shared_inference(self, leave_detector=None, gather_detector=None, banner_detector=None,
+                              imgsz: int = 640):
+        """
+        获取多模型共享预处理推理器
+
+        同一摄像头同时运行人员类场景和横幅检测时，帧只做一次预处理，再分别送入人员模型和横幅模型。
+        返回的推理器以场景名称作为键输出检测结果，由 detect_shared 作为 detections 参数传给对应检测器。
+        推理尺寸与共享尺寸不同的检测器以及切片模式的横幅检测器不注册，仍按各自的方式单独推理
+
+        Args:
+            leave_detector: 离岗检测器实例
+            gather_detector: 聚集检测器实例
+            banner_detector: 横幅检测器实例
+            imgsz: 共享的推理尺寸
+
+        Returns:
+            MultiModelInference: 共享预处理推理器
+        """
+        shared = MultiModelInference(imgsz=imgsz)
+        # 人员检测器使用各自的推理参数 infer_args，与单独推理时一致（单独推理时使用模型默认的推理尺寸）
+        if leave_detector is not None and leave_detector.model.overrides.get("imgsz", 640) == imgsz:
+            shared.add_model("leave", leave_detector.model, **leave_detector.infer_args)
+        if gather_detector is not None and gather_detector.model.overrides.get("imgsz", 640) == imgsz:
+            shared.add_model("gather", gather_detector.model, **gather_detector.infer_args)
+        if banner_detector is not None and not banner_detector.tiled and banner_detector.img_size == imgsz:
+            shared.add_model("banner", banner_detector.model, conf=banner_detector.conf_threshold,
+                             iou=banner_detector.iou_threshold)
+        return shared
+
+    def detect_shared(self, frame, shared, detectors, requests):
+        """
+        对一帧执行多个场景的检测，所有已注册到共享推理器的场景只做一次预处理
 
         Args:
             frame: 视频帧
-            roi: ROI区域
-            status: 状态（在岗/脱岗）
-            roi_person_count: ROI内人数
-            absence_start_time: 脱岗开始时间
-            threshold: 脱岗阈值
-            alert_triggered: 是否触发警报
+            shared: _get_shared_inference 返回的共享预处理推理器
+            detectors: {场景名称: 检测器实例}
+            requests: 本帧需要检测的场景及其参数，
+                {"leave": {"roi", "absence_start_time", "threshold"}, "gather": {"roi", "threshold"}, "banner": {}}
 
         Returns:
-            frame: 绘制了检测结果的帧
+            dict: {"leave": 离岗检测结果, "gather": 聚集检测结果, "banner": 横幅列表}，只包含requests中的场景
+        """
+        detections = shared(frame, names=list(requests))
+
+        results = {}
+        if "leave" in requests:
+            params = requests["leave"]
+            results["leave"] = detectors["leave"].detect_leave(
+                frame, params["roi"], params["absence_start_time"], params["threshold"],
+                detections=detections.get("leave"))
+        if "gather" in requests:
+            params = requests["gather"]
+            results["gather"] = detectors["gather"].detect_gather(
+                frame, params["roi"], params["threshold"], detections=detections.get("gather"))
+        if "banner" in requests:
+            results["banner"] = detectors["banner"].detect_banner(frame, detections=detections.get("banner"))[1]
+        return results
+
+    def _describe_alarm_event(self, event):
+        """
+        根据告警事件生成告警内容
+
+        Args:
+            event: 告警合并引擎产生的事件
+
+        Returns:
+            tuple: (告警子类型, 告警内容, 位置, 扩展字段字典)
+        """
+        scenario = event["scenario"]
+        payload = event["payload"]
+        if scenario == "loitering":
+            return ("异常行为识别",
+                    f"检测到徘徊行为，持续时间: {payload['duration']:.1f}秒",
+                    payload["position"],
+                    {"object_id": payload["object_id"], "duration": payload["duration"]})
+        if scenario == "leave":
+            return ("异常行为识别-离岗检测",
+                    f"检测到离岗行为，离岗时间: {payload['absence_duration']:.0f}秒",
+                    "",
+                    payload)
+        if scenario == "gather":
+            return ("异常行为识别-聚集检测",
+                    f"检测到人员聚集，当前人数: {payload['person_count']}，阈值: {payload['threshold']}",
+                    "",
+                    payload)
+        banner = max(payload["banners"], key=lambda b: b["confidence"])
+        return ("异常行为识别-横幅检测",
+                f"检测到横幅或可疑标语 {len(payload['banners'])} 处，最高置信度: {banner['confidence']:.2f}",
+                "[{},{},{},{}]".format(*banner["box"]),
+                payload)
+
+    def _publish_alarm_events(self, events, region=None):
+        """
+        把告警合并引擎产生的事件转换为告警消息，加入当前帧的待发布列表
+
+        每个事件在开始时发送一条open告警，持续期间按间隔发送update告警，结束时发送一条close告警，
+        同一事件的所有告警在ext1中携带相同的incident_id。
+        消息在帧绘制完成后由 dispatch_alarms 连同帧一起交给后台抓拍线程，填好图片URL后再发布
+
+        Args:
+            events: 告警事件列表
+            region: 告警区域 [x1, y1, x2, y2]，用于裁剪告警缩略图
         """
-        # 如果触发了离岗警报，发送到RabbitMQ
-        if alert_triggered:
-            from ..services.rabbitmq_service import rabbitmq_producer
-            import json
-            import uuid
-            from datetime import datetime
-            
+        if not events:
+            return
+
+        from ..services.alarm_engine import EVENT_OPEN, EVENT_UPDATE, EVENT_CLOSE
+        import json
+        import uuid
+        from datetime import datetime
+
+        memo_prefix = {EVENT_OPEN: "", EVENT_UPDATE: "[持续] ", EVENT_CLOSE: "[结束] "}
+        tag = {"loitering": "Loitering", "leave": "Leave", "gather": "Gather", "banner": "Banner"}
+
+        for event in events:
+            sub_type, memo, position, ext = self._describe_alarm_event(event)
+
             # 构建告警消息
             alarm_message = {
                 "code": str(uuid.uuid4()),
                 "alarmType": 1,
-                "subType": "异常行为识别-离岗检测",
+                "subType": sub_type,
                 "alarmTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "deviceCode": "camera_001",  # 默认摄像头ID，实际应该从上下文获取
-                "deviceName": "摄像头001",
-                "level": "warning",
-                "memo": f"检测到离岗行为，离岗时间: {threshold}秒",
-                "position": "",  # 可以考虑添加ROI坐标
+                "deviceCode": self.camera_id,
+                "deviceName": self.camera_id,
+                "level": "info" if event["event"] == EVENT_CLOSE else "warning",
+                "memo": memo_prefix[event["event"]] + memo,
+                "image": None,
+                "position": position,
                 "personCode": "",
                 "personName": "",
                 "ext1": json.dumps({
-                    "absence_duration": threshold,
-                    "roi_person_count": roi_person_count
-                })
+                    **ext,
+                    "scene_type": event["scenario"],
+                    "event": event["event"],
+                    "incident_id": event["incident_id"],
+                    "incident_duration": round(event["duration"], 1)
+                }, ensure_ascii=False)
             }
-            
-            # 发送到RabbitMQ
-            try:
-                success = rabbitmq_producer.send_message(alarm_message)
-                if success:
-                    print(f"[Leave] 告警消息发送成功: {alarm_message['memo']}")
-                else:
-                    print(f"[Leave] 告警消息发送失败: {alarm_message['memo']}")
-            except Exception as e:
-                print(f"[Leave] 发送告警消息时出错: {e}")
-                
+
+            print(f"[{tag[event['scenario']]}] 生成告警消息: {alarm_message['memo']}")
+            self.pending_alarms.append((alarm_message, region, event["incident_id"], event["event"] == EVENT_CLOSE))
+
+    def dispatch_alarms(self, frame):
+        """
+        把当前帧产生的告警连同帧的引用交给后台抓拍线程（非阻塞），抓拍完成后提交到后台告警发布队列
+
+        Args:
+            frame: 绘制完成的视频帧，调用方在此之后不得再修改该帧；None表示不抓拍（沿用事件已有的图片）
+        """
+        if not self.pending_alarms:
+            return
+
+        from ..services.snapshot_service import snapshot_service
+
+        for alarm_message, region, incident_id, final in self.pending_alarms:
+            # close告警的画面已不包含告警目标，沿用该事件已有的抓拍
+            if not snapshot_service.submit(alarm_message, None if final else frame, region, incident_id, final):
+                print(f"[Coordinator] 抓拍队列已满，告警消息不带图片直接发布: {alarm_message['memo']}")
+        self.pending_alarms = []
+
+    def close_incidents(self, scenario: Optional[str] = None):
+        """
+        关闭当前摄像头下进行中的告警事件（场景停用或视频流结束时调用）
+
+        同一摄像头可能同时运行多路不同场景的视频流，调用方应只关闭本视频流所负责场景的事件
+
+        Args:
+            scenario: 场景类型，None表示该摄像头下的全部场景
+        """
+        from ..services.alarm_engine import alarm_engine
+        self._publish_alarm_events(alarm_engine.close_all(self.camera_id, scenario))
+        self.dispatch_alarms(None)
+
+    @staticmethod
+    def _roi_region(roi):
+        """ROI多边形的外接矩形 [x1, y1, x2, y2]，ROI为空时返回None（整帧）"""
+        if not roi:
+            return None
+        xs = [p[0] for p in roi]
+        ys = [p[1] for p in roi]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _draw_leave_detections(self, frame, roi, status, roi_person_count, absence_start_time, threshold, alert_triggered):
+        """
+        绘制离岗检测结果
+
+        Args:
+            frame: 视频帧
+            roi: ROI区域
+            status: 状态（在岗/脱岗）
+            roi_person_count: ROI内人数
+            absence_start_time: 脱岗开始时间
+            threshold: 脱岗阈值
+            alert_triggered: 离岗条件是否成立（告警由告警合并引擎按事件发送）
+
+        Returns:
+            frame: 绘制了检测结果的帧
+        """
+        from ..services.alarm_engine import alarm_engine
+        from datetime import datetime
+
+        absence_duration = (datetime.now() - absence_start_time).total_seconds() if absence_start_time else 0.0
+        events = alarm_engine.observe(self.camera_id, "leave", "roi", alert_triggered, {
+            "absence_duration": absence_duration,
+            "roi_person_count": roi_person_count,
+            "threshold": threshold
+        })
+        self._publish_alarm_events(events, self._roi_region(roi))
+
         return draw_leave_detections(frame, roi, status, roi_person_count, absence_start_time, threshold, alert_triggered)
 
     def _draw_gather_detections(self, frame, roi, roi_person_count, gather_threshold, alert_triggered):
@@ -161,47 +362,19 @@ class VideoProcessingCoordinator:
             roi: ROI区域
             roi_person_count: ROI内人数
             gather_threshold: 聚集人数阈值
-            alert_triggered: 是否触发警报
+            alert_triggered: 聚集条件是否成立（告警由告警合并引擎按事件发送）
 
         Returns:
             frame: 绘制了检测结果的帧
         """
-        # 如果触发了聚集警报，发送到RabbitMQ
-        if alert_triggered:
-            from ..services.rabbitmq_service import rabbitmq_producer
-            import json
-            import uuid
-            from datetime import datetime
-            
-            # 构建告警消息
-            alarm_message = {
-                "code": str(uuid.uuid4()),
-                "alarmType": 1,
-                "subType": "异常行为识别-聚集检测",
-                "alarmTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "deviceCode": "camera_001",  # 默认摄像头ID，实际应该从上下文获取
-                "deviceName": "摄像头001",
-                "level": "warning",
-                "memo": f"检测到人员聚集，当前人数: {roi_person_count}，阈值: {gather_threshold}",
-                "position": "",  # 可以考虑添加ROI坐标
-                "personCode": "",
-                "personName": "",
-                "ext1": json.dumps({
-                    "person_count": roi_person_count,
-                    "threshold": gather_threshold
-                })
-            }
-            
-            # 发送到RabbitMQ
-            try:
-                success = rabbitmq_producer.send_message(alarm_message)
-                if success:
-                    print(f"[Gather] 告警消息发送成功: {alarm_message['memo']}")
-                else:
-                    print(f"[Gather] 告警消息发送失败: {alarm_message['memo']}")
-            except Exception as e:
-                print(f"[Gather] 发送告警消息时出错: {e}")
-        
+        from ..services.alarm_engine import alarm_engine
+
+        events = alarm_engine.observe(self.camera_id, "gather", "roi", alert_triggered, {
+            "person_count": roi_person_count,
+            "threshold": gather_threshold
+        })
+        self._publish_alarm_events(events, self._roi_region(roi))
+
         return draw_gather_detections(frame, roi, roi_person_count, gather_threshold, alert_triggered)
 
     def _draw_banner_detections(self, frame, banners):
@@ -210,49 +383,28 @@ class VideoProcessingCoordinator:
 
         Args:
             frame: 视频帧
-            banners: 检测到的横幅信息
+            banners: 已确认的横幅信息（画面中的所有横幅合并为同一个事件）
 
         Returns:
             frame: 绘制了检测结果的帧
         """
-        # 如果检测到横幅，发送到RabbitMQ
-        # 只有在真正触发告警时（由detector控制）才发送消息
+        from ..services.alarm_engine import alarm_engine
+
+        events = alarm_engine.observe(self.camera_id, "banner", "scene", bool(banners), {
+            "banners": [
+                {"box": [int(v) for v in banner['box']], "confidence": float(banner['confidence']),
+                 "class": banner['class']}
+                for banner in banners
+            ]
+        })
+        region = None
         if banners:
-            from ..services.rabbitmq_service import rabbitmq_producer
-            import json
-            import uuid
-            from datetime import datetime
-            
-            for banner in banners:
-                # 构建告警消息
-                alarm_message = {
-                    "code": str(uuid.uuid4()),
-                    "alarmType": 1,
-                    "subType": "异常行为识别-横幅检测",
-                    "alarmTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "deviceCode": "camera_001",  # 默认摄像头ID，实际应该从上下文获取
-                    "deviceName": "摄像头001",
-                    "level": "warning",
-                    "memo": f"检测到横幅或可疑标语，置信度: {banner['confidence']:.2f}",
-                    "position": f"[{banner['box'][0]},{banner['box'][1]},{banner['box'][2]},{banner['box'][3]}]",
-                    "personCode": "",
-                    "personName": "",
-                    "ext1": json.dumps({
-                        "confidence": banner['confidence'],
-                        "class": banner['class']
-                    })
-                }
-                
-                # 发送到RabbitMQ
-                try:
-                    success = rabbitmq_producer.send_message(alarm_message)
-                    if success:
-                        print(f"[Banner] 告警消息发送成功: {alarm_message['memo']}")
-                    else:
-                        print(f"[Banner] 告警消息发送失败: {alarm_message['memo']}")
-                except Exception as e:
-                    print(f"[Banner] 发送告警消息时出错: {e}")
-        
+            # 所有横幅的外接矩形
+            boxes = [banner['box'] for banner in banners]
+            region = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                      max(b[2] for b in boxes), max(b[3] for b in boxes))
+        self._publish_alarm_events(events, region)
+
         return draw_banner_detections(frame, banners)
 
     def _draw_loitering_detections(self, frame, detections, alarms):
@@ -262,49 +414,23 @@ class VideoProcessingCoordinator:
         Args:
             frame: 视频帧
             detections: 检测结果
-            alarms: 警报信息
+            alarms: 当前处于徘徊状态的对象（每个对象对应一个告警事件）
 
         Returns:
             frame: 绘制了检测结果的帧
         """
-        # 如果有警报，发送到RabbitMQ
-        if alarms:
-            from ..services.rabbitmq_service import rabbitmq_producer
-            import json
-            import uuid
-            from datetime import datetime
-            
-            for obj_id, alarm in alarms.items():
-                # 构建告警消息
-                alarm_message = {
-                    "code": str(uuid.uuid4()),
-                    "alarmType": 1,
-                    "subType": "异常行为识别",
-                    "alarmTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "deviceCode": "camera_001",  # 默认摄像头ID，实际应该从上下文获取
-                    "deviceName": "摄像头001",
-                    "level": "warning",
-                    "memo": f"检测到徘徊行为，持续时间: {alarm['duration']:.1f}秒",
-                    "image": None,
-                    "position": f"[{alarm['position'][0]},{alarm['position'][1]},{alarm['position'][2]},{alarm['position'][3]}]",
-                    "personCode": "",
-                    "personName": "",
-                    "ext1": json.dumps({
-                        "object_id": str(obj_id),
-                        "duration": alarm['duration']
-                    })
-                }
-                
-                # 发送到RabbitMQ
-                try:
-                    success = rabbitmq_producer.send_message(alarm_message)
-                    if success:
-                        print(f"[Loitering] 告警消息发送成功: {alarm_message['memo']}")
-                    else:
-                        print(f"[Loitering] 告警消息发送失败: {alarm_message['memo']}")
-                except Exception as e:
-                    print(f"[Loitering] 发送告警消息时出错: {e}")
-        
+        from ..services.alarm_engine import alarm_engine
+
+        for obj_id, alarm in alarms.items():
+            events = alarm_engine.observe(self.camera_id, "loitering", obj_id, True, {
+                "object_id": str(obj_id),
+                "duration": float(alarm['duration']),
+                "position": "[{},{},{},{}]".format(*alarm['position'])
+            })
+            self._publish_alarm_events(events, alarm['position'])
+        # 离开画面或不再徘徊的对象超出合并窗口后关闭事件
+        self._publish_alarm_events(alarm_engine.sweep(self.camera_id, "loitering", alarms.keys()))
+
         return draw_loitering_detections(frame, detections, alarms)
 
     def process_loitering_video(self,
@@ -43,10 +43,8 @@ class GatherDetector:
             self.model.set_classes(["person"])
 
         self.img_size = img_size
-        
-        # 用于控制告警频率的变量
-        self.last_alarm_time = 0
-        self.alarm_interval = 10  # 告警间隔时间（秒）
+        # 人员检测的推理参数（降低置信度阈值提高检测灵敏度），单独推理与共享预处理推理使用同一份参数
+        self.infer_args = {"conf": 0.1, "iou": 0.7, "classes": [0]}
 
     def point_in_roi(self, point, roi):
         """
@@ -70,7 +68,7 @@ class GatherDetector:
                 inside = not inside
         return inside
 
-    def detect_gather(self, frame, roi, gather_threshold):
+    def detect_gather(self, frame, roi, gather_threshold, detections=None):
         """
         检测人员聚集情况
 
@@ -78,22 +76,26 @@ class GatherDetector:
             frame: 视频帧
             roi: ROI区域 [(x1, y1), (x2, y2), ...]
             gather_threshold: 聚集人数阈值
+            detections: 预先计算的检测结果 (N, 6) [x1, y1, x2, y2, conf, cls]，
+                由 MultiModelInference 共享预处理推理得到时传入，此时不再调用模型
 
         Returns:
             dict: 检测结果
         """
         logger.info(f"开始聚集检测，ROI: {roi}, 阈值: {gather_threshold}")
 
-        # 检测行人，降低置信度阈值提高检测灵敏度
-        results = self.model(frame, classes=[0], conf=0.1, verbose=False)
-        logger.info(f"YOLO检测结果: 检测到 {len(results[0].boxes)} 个目标")
+        if detections is None:
+            # 检测行人
+            results = self.model.infer_frames(frame, **self.infer_args)
+            detections = results[0].boxes.data.cpu().numpy()
+        logger.info(f"YOLO检测结果: 检测到 {len(detections)} 个目标")
 
         person_boxes = []
         roi_person_boxes = []  # 仅存储ROI区域内的人员框
-        for box in results[0].boxes:
-            cls = int(box.cls[0])
+        for det in detections:
+            cls = int(det[5])
             if cls == 0:  # 只处理人员类别
-                box_coords = box.xyxy.cpu().numpy()[0]
+                box_coords = det[:4]
                 person_boxes.append(box_coords)
                 # 检查该人员是否在ROI区域内
                 x1, y1, x2, y2 = box_coords.astype(int)
@@ -107,18 +109,8 @@ class GatherDetector:
         # ROI内人数
         roi_person_count = len(roi_person_boxes)
 
-        # 判断是否触发聚集警报（带频率控制）
-        current_time = time.time()
-        should_trigger_alert = (
-            roi_person_count >= gather_threshold and 
-            (current_time - self.last_alarm_time) >= self.alarm_interval
-        )
-        
-        alert_triggered = False
-        if should_trigger_alert:
-            alert_triggered = True
-            self.last_alarm_time = current_time
-            logger.info(f"触发聚集告警，已更新上次告警时间")
+        # 判断聚集条件是否成立（告警的合并与频率控制由告警合并引擎负责）
+        alert_triggered = roi_person_count >= gather_threshold
 
         logger.info(f"聚集检测结果: {roi_person_count} >= {gather_threshold} = {alert_triggered}")
 
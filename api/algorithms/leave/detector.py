@@ -37,6 +37,8 @@ class LeaveDetector:
             self.model.set_classes(["person"])
 
         self.img_size = img_size
+        # 人员检测的推理参数，单独推理与共享预处理推理使用同一份参数
+        self.infer_args = {"conf": 0.25, "iou": 0.7, "classes": [0]}
 
     def point_in_roi(self, point, roi):
         """
@@ -64,7 +66,7 @@ class LeaveDetector:
                 inside = not inside
         return inside
 
-    def detect_leave(self, frame, roi, absence_start_time, absence_threshold):
+    def detect_leave(self, frame, roi, absence_start_time, absence_threshold, detections=None):
         """
         检测离岗情况
 
@@ -73,17 +75,21 @@ class LeaveDetector:
             roi: ROI区域 [(x1, y1), (x2, y2), ...]
             absence_start_time: 开始脱岗时间
             absence_threshold: 脱岗判定阈值（秒）
+            detections: 预先计算的检测结果 (N, 6) [x1, y1, x2, y2, conf, cls]，
+                由 MultiModelInference 共享预处理推理得到时传入，此时不再调用模型
 
         Returns:
             dict: 检测结果
         """
-        # 检测行人
-        results = self.model(frame, classes=[0], verbose=False)
+        if detections is None:
+            # 检测行人
+            results = self.model.infer_frames(frame, **self.infer_args)
+            detections = results[0].boxes.data.cpu().numpy()
         person_boxes = []
-        for box in results[0].boxes:
-            cls = int(box.cls[0])
+        for det in detections:
+            cls = int(det[5])
             if cls == 0:  # 只处理人员类别
-                person_boxes.append(box.xyxy.cpu().numpy()[0])
+                person_boxes.append(det[:4])
 
         # 统计ROI内人数
         roi_person_count = 0
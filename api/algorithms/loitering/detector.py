@@ -113,14 +113,9 @@ class LoiteringDetector:
 
         # 存储跟踪对象的信息
         self.tracked_objects = {}
+        # 当前处于徘徊状态的对象（告警的合并与频率控制由告警合并引擎负责）
         self.loitering_alarms = {}
 
-        # 用于控制告警频率的字典，记录每个对象上次发送告警的时间
-        self.last_alarm_times = {}
-
-        # 告警间隔时间（秒）
-        self.alarm_interval = 10  # 每10秒最多发送一次告警
-
         # 跟踪ID计数器
         self.next_object_id = 0
 
@@ -330,25 +325,13 @@ class LoiteringDetector:
                                 total_time = frame_time - first_seen_time
 
                                 if total_time > self.loitering_time_threshold and total_distance < 50:  # 50像素作为移动阈值
-                                    # 检查是否应该发送告警（根据告警间隔时间）
-                                    should_send_alarm = True
-                                    current_time = frame_time
-                                    
-                                    if object_id in self.last_alarm_times:
-                                        time_since_last_alarm = current_time - self.last_alarm_times[object_id]
-                                        if time_since_last_alarm < self.alarm_interval:
-                                            should_send_alarm = False
-                                    
-                                    # 如果应该发送告警，则记录当前时间并添加到告警列表
-                                    if should_send_alarm:
-                                        self.last_alarm_times[object_id] = current_time
-                                        current_alarms[object_id] = {
-                                            'start_time': first_seen_time,
-                                            'current_time': frame_time,
-                                            'duration': total_time,
-                                            'position': box,
-                                            'class': class_name
-                                        }
+                                    current_alarms[object_id] = {
+                                        'start_time': first_seen_time,
+                                        'current_time': frame_time,
+                                        'duration': total_time,
+                                        'position': box,
+                                        'class': class_name
+                                    }
                                 # 如果移动距离较大，且之前有警报，则移除警报
                                 elif total_distance >= 50 and object_id in self.loitering_alarms:
                                     del self.loitering_alarms[object_id]
@@ -363,8 +346,6 @@ class LoiteringDetector:
                 del self.tracked_objects[obj_id]
             if obj_id in self.loitering_alarms:
                 del self.loitering_alarms[obj_id]
-            if obj_id in self.last_alarm_times:
-                del self.last_alarm_times[obj_id]
 
     def detect_loitering(self, frame, frame_time):
         """
@@ -389,7 +370,9 @@ class LoiteringDetector:
             scale = 1
 
         # 使用YOLOv12检测目标
-        results = self.model(resized_frame, conf=self.conf_threshold, imgsz=self.img_size, device=self.device)
+        # 使用数组形式的精简结果：每帧一个结构化数组（xyxy、conf、cls），不逐框创建Boxes对象
+        results = self.model.infer_frames(resized_frame, conf=self.conf_threshold, imgsz=self.img_size, device=self.device,
+                                          lean_results=True)
 
         detections = []
         # 首先使用YOLOv12的基本检测方法
@@ -398,9 +381,9 @@ class LoiteringDetector:
             if boxes is not None:
                 for i, box in enumerate(boxes):
                     # 获取边界框坐标
-                    coords = box.xyxy[0].cpu().numpy()
-                    confidence = box.conf[0].cpu().numpy()
-                    class_id = int(box.cls[0].cpu().numpy())
+                    coords = box["xyxy"]
+                    confidence = box["conf"]
+                    class_id = int(box["cls"])
 
                     # 恢复原始图像坐标
                     if scale < 1:
@@ -435,9 +418,9 @@ class LoiteringDetector:
                     # 准备ByteTrack输入
                     dets = []
                     for i, box in enumerate(boxes):
-                        coords = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
+                        coords = box["xyxy"]
+                        confidence = box["conf"]
+                        class_id = int(box["cls"])
 
                         # 恢复原始图像坐标
                         if scale < 1:
@@ -0,0 +1,138 @@
+"""
+多模型共享预处理推理模块
+同一帧需要送入多个模型（如人员模型 + 横幅模型）时，只做一次letterbox、通道转换和归一化，
+再将同一个输入张量依次送入各模型，最后一次性把所有模型的检测框还原到原图坐标。
+配置了尺寸桶或有编译推理的模型时，帧按分辨率letterbox到固定的尺寸桶，输入尺寸保持稳定
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from ultralytics.data.augment import LetterBox, letterbox_buckets, select_bucket
+from ultralytics.utils import ops
+
+from ...config.settings import MODEL_LETTERBOX_BUCKETS
+
+
+class MultiModelInference:
+    """多模型共享预处理推理器"""
+
+    def __init__(self, imgsz: int = 640, buckets: Optional[List[Tuple[int, int]]] = MODEL_LETTERBOX_BUCKETS):
+        """
+        初始化多模型推理器
+
+        Args:
+            imgsz: 共享的推理尺寸
+            buckets: letterbox尺寸桶 [(h, w), ...]，None表示只有编译推理的模型使用默认尺寸桶（16:9、4:3 和正方形）
+        """
+        self.imgsz = imgsz
+        self.buckets = buckets
+        # 已注册的模型 {名称: (YOLO模型, 推理参数)}
+        self.entries: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+
+    def add_model(self, name: str, model, conf: float = 0.25, iou: float = 0.45,
+                  classes: Optional[List[int]] = None, max_det: int = 300):
+        """
+        注册一个参与共享推理的模型
+
+        Args:
+            name: 模型名称（用于取回结果）
+            model: ultralytics YOLO 模型实例
+            conf: 置信度阈值
+            iou: NMS IoU阈值
+            classes: 只保留的类别ID列表，None表示全部类别
+            max_det: 每帧最大检测数
+        """
+        self.entries[name] = (model, {"conf": conf, "iou": iou, "classes": classes, "max_det": max_det})
+
+    @staticmethod
+    def _backend(model):
+        """获取YOLO模型已初始化的AutoBackend，未初始化时按 Model.predict 的方式创建预测器"""
+        if model.predictor is None:
+            args = {**model.overrides, "conf": 0.25, "batch": 1, "save": False, "mode": "predict", "verbose": False}
+            model.predictor = model._smart_load("predictor")(overrides=args, _callbacks=model.callbacks)
+            model.predictor.setup_model(model=model.model, verbose=False)
+        return model.predictor.model
+
+    def preprocess(self, frame: np.ndarray, backends) -> Tuple[torch.Tensor, Dict[Tuple, torch.Tensor]]:
+        """
+        对帧进行一次letterbox和归一化
+
+        Args:
+            frame: BGR视频帧
+            backends: 参与推理的AutoBackend列表
+
+        Returns:
+            tuple: (letterbox后的uint8张量 (1, 3, h, w), {(设备, 是否fp16): 归一化后的输入张量})
+        """
+        stride = max(int(b.stride) for b in backends)
+        # 只有全部为PyTorch模型时才能使用最小填充，导出格式需要固定输入尺寸
+        auto = all(b.pt for b in backends)
+        if auto and (self.buckets or any(b.compiled for b in backends)):
+            # 按分辨率选择固定的尺寸桶，同一摄像头的输入尺寸始终不变，编译图可以复用
+            buckets = letterbox_buckets(self.imgsz, stride, canvases=self.buckets)
+            letterbox = LetterBox(select_bucket(frame.shape[:2], buckets, self.imgsz), stride=stride)
+        else:
+            letterbox = LetterBox((self.imgsz, self.imgsz), auto=auto, stride=stride)
+        image = letterbox(image=frame)
+        image = np.ascontiguousarray(image[..., ::-1].transpose(2, 0, 1)[None])  # BGR->RGB, HWC->CHW
+        image = torch.from_numpy(image)
+
+        # 不同设备/精度的模型各转换一次，同设备同精度的模型共享同一个输入张量
+        inputs = {}
+        for b in backends:
+            key = (str(b.device), b.fp16)
+            if key not in inputs:
+                im = image.to(b.device)
+                inputs[key] = (im.half() if b.fp16 else im.float()) / 255
+        return image, inputs
+
+    @torch.inference_mode()
+    def __call__(self, frame: np.ndarray, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        对一帧执行已注册模型的推理
+
+        Args:
+            frame: BGR视频帧
+            names: 本帧需要推理的模型名称，None表示全部已注册模型（按检测间隔跳过的场景不参与本帧推理）
+
+        Returns:
+            Dict[str, np.ndarray]: {模型名称: 原图坐标下的检测结果 (N, 6) [x1, y1, x2, y2, conf, cls]}
+        """
+        names = list(self.entries) if names is None else [name for name in names if name in self.entries]
+        if not names:
+            return {}
+
+        backends = [self._backend(self.entries[name][0]) for name in names]
+        image, inputs = self.preprocess(frame, backends)
+
+        # 同一个模型被多个场景注册时只前向一次，仅NMS参数不同
+        outputs = {}
+        preds = []
+        for name, backend in zip(names, backends):
+            args = self.entries[name][1]
+            if id(backend) not in outputs:
+                outputs[id(backend)] = backend(inputs[(str(backend.device), backend.fp16)])
+            out = outputs[id(backend)]
+            det = ops.non_max_suppression(
+                out,
+                args["conf"],
+                args["iou"],
+                classes=args["classes"],
+                max_det=args["max_det"],
+            )[0]
+            preds.append(det[:, :6].float().cpu())
+
+        # 所有模型的检测框拼接后一次性还原到原图坐标
+        counts = [len(p) for p in preds]
+        merged = torch.cat(preds) if preds else torch.zeros((0, 6))
+        if len(merged):
+            merged[:, :4] = ops.scale_boxes(image.shape[2:], merged[:, :4], frame.shape)
+        merged = merged.numpy()
+
+        results, start = {}, 0
+        for name, n in zip(names, counts):
+            results[name] = merged[start:start + n]
+            start += n
+        return results
@@ -14,6 +14,18 @@ PROCESSED_DIR = os.path.join(BASE_DIR, "processed_videos")
 # 模型配置
 MODEL_DIR = os.path.join(BASE_DIR, "..", "yolov12")
 DEFAULT_MODEL = "yolov12n.pt"
+MODEL_BACKEND = "auto"            # 推理后端：auto按设备选择最快的已导出格式，或指定 pytorch/onnx/openvino/engine
+MODEL_AUTO_EXPORT = False         # 没有导出文件时是否在首次加载时自动导出并缓存到权重旁边
+MODEL_AUTO_EXPORT_FORMAT = "onnx"  # 自动导出的格式（onnx 或 openvino）
+MODEL_CPU_THREADS = 0             # CPU推理线程数（ONNX Runtime/OpenVINO/PyTorch），0表示由运行时决定
+MODEL_INT8 = True                 # CPU上存在INT8量化模型时优先加载
+MODEL_INT8_MAX_MAP_DROP = 0.02    # 量化报告中mAP50-95下降超过该值时不使用INT8模型
+MODEL_AUTO_EXPORT_INT8 = False    # 自动导出时进行INT8静态量化（从上传目录的视频中抽帧校准）
+MODEL_COMPILE = False             # PyTorch后端的编译推理：False不编译，"compile"使用torch.compile，"trace"使用TorchScript追踪
+MODEL_COMPILE_IMGSZ = 640         # 编译推理的输入按该尺寸letterbox到固定的尺寸桶，加载模型时预先为每个桶构建编译图
+MODEL_READY_CACHE = True          # PyTorch后端首次加载时缓存融合好的可直接服务的模型，之后启动时内存映射加载
+MODEL_READY_CACHE_DIR = None      # 可直接服务模型的缓存目录，None表示权重所在目录
+MODEL_LETTERBOX_BUCKETS = None    # letterbox尺寸桶 [(h, w), ...]，按摄像头分辨率确定性地选择并按桶分批推理；None时编译推理使用16:9、4:3和正方形
 
 # 创建必要的目录
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -26,10 +38,87 @@ DEFAULT_GATHER_THRESHOLD = 5      # 聚集检测阈值(人)
 DEFAULT_BANNER_CONFIDENCE_THRESHOLD = 0.5  # 横幅检测置信度阈值
 DEFAULT_BANNER_IOU_THRESHOLD = 0.45  # 横幅检测IOU阈值
 
+# 横幅切片推理配置（高分辨率画面中的远处小横幅）
+BANNER_TILED_INFERENCE = False  # 是否启用切片推理
+BANNER_TILE_SIZE = 640          # 切片边长（像素）
+BANNER_TILE_OVERLAP = 0.2       # 相邻切片重叠比例
+BANNER_TILE_GLOBAL_PASS = True  # 切片模式下是否额外进行整帧低分辨率推理
+BANNER_TILE_CHANGE_THRESHOLD = 16.0  # 切片变化阈值（缩略灰度图最大绝对差），超过时重新推理该切片
+BANNER_TILE_MAX_AGE = 10           # 切片缓存结果最多复用的切片推理次数，超过后强制重新推理
+
+# 横幅检测调度配置（横幅为静态目标，低频采样即可）
+BANNER_SCHEDULE_INTERVAL = 5.0          # 常规采样周期（秒）
+BANNER_CONFIRM_INTERVAL = 1.0           # 存在未确认命中时的加速采样周期（秒）
+BANNER_CONFIRM_K = 2                    # M次采样中至少K次命中才确认告警
+BANNER_CONFIRM_M = 3
+BANNER_SCENE_CHANGE_THRESHOLD = 12.0    # 场景变化阈值（缩略灰度图平均绝对差）
+
+# 告警合并配置（告警数量与事件数量成正比，而不是与帧数成正比）
+ALARM_COALESCE_WINDOW = 10.0   # 条件消失超过该时间（秒）才关闭事件，窗口内再次成立视为同一事件
+ALARM_UPDATE_INTERVAL = 60.0   # 持续事件的更新告警间隔（秒），0表示不发送更新
+ALARM_RATE_LIMIT = 30          # 每个摄像头在统计周期内最多发送的open/update告警数，0表示不限制
+ALARM_RATE_PERIOD = 60.0       # 速率限制统计周期（秒）
+
+# 告警抓拍配置（后台线程编码并写入按内容寻址的本地存储）
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "snapshots")
+SNAPSHOT_URL_PREFIX = "/snapshots"   # 告警消息中图片URL的前缀，可改为带域名的完整地址
+SNAPSHOT_QUEUE_SIZE = 32             # 待抓拍队列容量（每项持有一帧画面的引用）
+SNAPSHOT_THUMB_SIZE = 320            # 告警区域缩略图长边像素
+SNAPSHOT_JPEG_QUALITY = 85           # JPEG编码质量
+SNAPSHOT_CROP_MARGIN = 0.2           # 裁剪告警区域时四周外扩比例
+os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+
+# 告警库配置（SQLite WAL模式，后台线程批量写入）
+ALARM_DB_DIR = os.path.join(BASE_DIR, "data")
+ALARM_DB_FILE = os.path.join(ALARM_DB_DIR, "alarms.db")
+ALARM_STORE_QUEUE_SIZE = 10000       # 待写入队列容量
+ALARM_STORE_BATCH_SIZE = 500         # 单个事务写入的最大告警数
+ALARM_STORE_FLUSH_INTERVAL = 0.5     # 未凑满一批时的最长等待时间（秒）
+os.makedirs(ALARM_DB_DIR, exist_ok=True)
+
+# 实时告警推送配置（/alerts/stream，SSE）
+ALARM_STREAM_QUEUE_SIZE = 256        # 每个订阅者的待发送队列容量，溢出时断开该订阅者
+ALARM_STREAM_REPLAY_SIZE = 1000      # 回放环保留的最近告警数（用于 Last-Event-ID 断线续传）
+ALARM_STREAM_MAX_SUBSCRIBERS = 1000  # 最大订阅连接数
+ALARM_STREAM_HEARTBEAT = 15.0        # 心跳间隔（秒）
+
+# 摄像头注册表配置（修改后由后台线程合并写回配置文件）
+CAMERA_CONFIG_FILE = os.path.join(BASE_DIR, "config", "cameras.json")
+CAMERA_SAVE_INTERVAL = 1.0           # 写回合并间隔（秒），该时间内的多次修改只写一次文件
+CAMERA_CONFIG_WATCH_INTERVAL = 2.0   # 配置文件变更检查间隔（秒），外部修改后由运行中的视频流在下一帧生效
+
+# 摄像头采集配置（连接由采集监管器持有，断线后带抖动的指数退避重连）
+CAPTURE_OPEN_TIMEOUT = 5.0           # 打开网络视频流的超时（秒）
+CAPTURE_READ_TIMEOUT = 5.0           # 读取一帧的超时（秒）
+CAPTURE_BACKOFF_MIN = 0.5            # 重连退避初始间隔（秒）
+CAPTURE_BACKOFF_MAX = 30.0           # 重连退避最大间隔（秒）
+CAPTURE_STALE_AFTER = 2.0            # 超过该时间没有新帧视为画面中断（秒）
+CAPTURE_STALE_INTERVAL = 1.0         # 画面中断期间推送标记帧的间隔（秒）
+
+# GA/T 1400 设备心跳配置（连续错过若干次保活判定为离线）
+DEVICE_KEEPALIVE_INTERVAL = 30.0     # 设备保活间隔（秒）
+DEVICE_KEEPALIVE_MISSES = 3          # 连续错过的保活次数
+DEVICE_HEARTBEAT_TICK = 1.0          # 离线判定精度（秒）
+
+# GA/T 1400 订阅通知配置（长连接池批量推送，失败退避重试并熔断）
+SUBSCRIPTION_FILE = os.path.join(ALARM_DB_DIR, "subscriptions.json")
+SUBSCRIPTION_SAVE_INTERVAL = 1.0       # 订阅变更写回合并间隔（秒）
+SUBSCRIPTION_QUEUE_SIZE = 10000        # 待匹配告警队列容量
+SUBSCRIPTION_WORKERS = 16              # 推送线程数（每个接收主机的最大连接数）
+SUBSCRIPTION_BATCH_SIZE = 50           # 单次推送的最大通知数
+SUBSCRIPTION_MAX_PENDING = 1000        # 每个订阅者最多积压的通知数，超出时丢弃最旧的
+SUBSCRIPTION_HTTP_TIMEOUT = 5.0        # 推送请求超时（秒）
+SUBSCRIPTION_POOL_HOSTS = 100          # 连接池缓存的接收主机数
+SUBSCRIPTION_RETRY_BASE = 1.0          # 重试退避初始间隔（秒）
+SUBSCRIPTION_RETRY_MAX = 60.0          # 重试退避最大间隔（秒）
+SUBSCRIPTION_BREAKER_THRESHOLD = 5     # 连续失败多少次后熔断
+SUBSCRIPTION_BREAKER_COOLDOWN = 60.0   # 熔断持续时间（秒）
+
 # 默认ROI区域配置
 DEFAULT_LEAVE_ROI = [(600, 100), (1000, 100), (1000, 700), (600, 700)]
 DEFAULT_GATHER_ROI = [(220, 300), (700, 300), (700, 700), (200, 700)]
 DEFAULT_BANNER_ROI = [(0, 0), (1280, 0), (1280, 720), (0, 720)]  # 默认全屏检测
+DEFAULT_PERSON_ROI = [(220, 300), (700, 300), (700, 700), (200, 700)]  # 离岗/聚集视频流未配置ROI时使用
 
 # RabbitMQ配置
 RABBITMQ_HOST = "127.0.0.1"
@@ -52,3 +141,12 @@ RABBITMQ_MESSAGE_DURABLE = True
 # 连接重试配置
 RABBITMQ_CONNECTION_RETRIES = 3
 RABBITMQ_CONNECTION_RETRY_DELAY = 5
+
+# 后台告警发布配置（视频帧循环中只做非阻塞入队）
+ALARM_PUBLISH_QUEUE_SIZE = 10000          # 内存队列容量
+ALARM_PUBLISH_BATCH_SIZE = 100            # 单批发布的最大消息数
+ALARM_PUBLISH_BACKOFF_MIN = 1.0           # 重连退避初始间隔（秒）
+ALARM_PUBLISH_BACKOFF_MAX = 60.0          # 重连退避最大间隔（秒）
+ALARM_SPOOL_DIR = os.path.join(BASE_DIR, "spool")
+ALARM_SPOOL_FILE = os.path.join(ALARM_SPOOL_DIR, "alarms.jsonl")  # 消息队列不可达时的追加写磁盘缓存
+os.makedirs(ALARM_SPOOL_DIR, exist_ok=True)
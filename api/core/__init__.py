@@ -1,16 +1,20 @@
 """
 核心算法模块
-包含所有计算机视觉检测算法的统一接口
+包含所有计算机视觉检测算法的统一接口，检测器在首次访问时按需导入
 """
 
-from ..algorithms.loitering import LoiteringDetector
-from ..algorithms.leave import LeaveDetector
-from ..algorithms.gather import GatherDetector
-from ..algorithms.banner import BannerDetector
-
 __all__ = [
     "LoiteringDetector",
     "LeaveDetector",
     "GatherDetector",
     "BannerDetector"
 ]
+
+
+def __getattr__(name):
+    """首次访问时从算法模块导入检测器"""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .. import algorithms
+
+    return getattr(algorithms, name)
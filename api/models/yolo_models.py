@@ -1,28 +1,218 @@
 """
 YOLO 模型加载和管理模块
+加载模型时按设备选择最快的推理后端：CPU上优先使用权重旁已导出的 INT8 量化或 OpenVINO/ONNX 模型，
+GPU上优先使用 TensorRT 引擎；没有导出文件时可在首次加载时自动导出并缓存。
+使用 PyTorch 后端时从缓存的可直接服务模型（已融合Conv+BN、按权重哈希和torch版本缓存）内存映射加载，
+并可开启编译推理，编译图在加载时预热
 """
 
 import os
 import sys
+import ast
+import threading
+import time
+import importlib.util
+import numpy as np
 from ultralytics import YOLO
+from ultralytics.nn.tasks import ready_checkpoint
+from ultralytics.utils import yaml_load
 import torch
 
+from ..config.settings import (
+    UPLOAD_DIR,
+    MODEL_BACKEND,
+    MODEL_AUTO_EXPORT,
+    MODEL_AUTO_EXPORT_FORMAT,
+    MODEL_AUTO_EXPORT_INT8,
+    MODEL_CPU_THREADS,
+    MODEL_COMPILE,
+    MODEL_COMPILE_IMGSZ,
+    MODEL_LETTERBOX_BUCKETS,
+    MODEL_READY_CACHE,
+    MODEL_READY_CACHE_DIR,
+    MODEL_INT8,
+    MODEL_INT8_MAX_MAP_DROP
+)
+
+# 导出后端：(导出文件相对权重的后缀, 运行时模块, 导出格式, 是否INT8量化)
+EXPORT_BACKENDS = {
+    "openvino_int8": ("_int8_openvino_model", "openvino", "openvino", True),
+    "onnx_int8": ("_int8.onnx", "onnxruntime", "onnx", True),
+    "openvino": ("_openvino_model", "openvino", "openvino", False),
+    "onnx": (".onnx", "onnxruntime", "onnx", False),
+    "engine": (".engine", "tensorrt", "engine", False),
+}
+
+# 各设备上的后端优先级（从快到慢）
+DEVICE_BACKENDS = {
+    "cpu": ("openvino_int8", "onnx_int8", "openvino", "onnx", "pytorch"),
+    "cuda": ("engine", "pytorch"),
+}
+
+# 导出锁，避免多个检测器同时导出同一个模型
+_export_lock = threading.Lock()
+
+
+def exported_path(weights_path, backend):
+    """
+    获取权重对应的导出文件路径（与 ultralytics 导出的命名一致）
+
+    Args:
+        weights_path: PyTorch 权重路径
+        backend: 导出后端
+
+    Returns:
+        导出文件路径（OpenVINO 为目录）
+    """
+    return os.path.splitext(weights_path)[0] + EXPORT_BACKENDS[backend][0]
+
+
+def backend_available(backend):
+    """判断后端的运行时是否已安装"""
+    return backend == "pytorch" or importlib.util.find_spec(EXPORT_BACKENDS[backend][1]) is not None
+
+
+def int8_report(path):
+    """
+    读取INT8量化模型导出时记录的量化报告
+
+    Args:
+        path: INT8 模型路径（ONNX 文件或 OpenVINO 目录）
+
+    Returns:
+        dict: 留出集上的mAP变化与加速比，没有报告时返回None
+    """
+    try:
+        if os.path.isdir(path):
+            report = yaml_load(os.path.join(path, "metadata.yaml")).get("int8")
+        else:
+            import onnx
+            metadata = {p.key: p.value for p in onnx.load(path).metadata_props}
+            report = ast.literal_eval(metadata["int8"]) if "int8" in metadata else None
+        return report or None
+    except Exception as e:
+        print(f"Error reading INT8 report of {path}: {e}")
+        return None
+
 
 class YOLOModelManager:
     """YOLO 模型管理器"""
 
-    def __init__(self, model_dir="yolov12"):
+    def __init__(self, model_dir="yolov12", backend=MODEL_BACKEND, auto_export=MODEL_AUTO_EXPORT,
+                 export_format=MODEL_AUTO_EXPORT_FORMAT, threads=MODEL_CPU_THREADS,
+                 int8=MODEL_INT8, int8_max_map_drop=MODEL_INT8_MAX_MAP_DROP, export_int8=MODEL_AUTO_EXPORT_INT8,
+                 calibration_dir=UPLOAD_DIR, compile=MODEL_COMPILE, compile_imgsz=MODEL_COMPILE_IMGSZ,
+                 buckets=MODEL_LETTERBOX_BUCKETS, ready_cache=MODEL_READY_CACHE,
+                 ready_cache_dir=MODEL_READY_CACHE_DIR):
         """
         初始化模型管理器
 
         Args:
             model_dir: 模型文件目录
+            backend: 推理后端，auto 表示按设备自动选择
+            auto_export: 没有导出文件时是否在首次加载时自动导出
+            export_format: 自动导出的格式
+            threads: CPU推理线程数，0表示由运行时决定
+            int8: 是否优先加载INT8量化模型
+            int8_max_map_drop: 允许的量化mAP50-95下降上限，超过时不使用该INT8模型
+            export_int8: 自动导出时是否进行INT8静态量化
+            calibration_dir: INT8量化校准视频所在目录
+            compile: PyTorch后端的编译推理方式（False、"compile" 或 "trace"）
+            compile_imgsz: 编译推理的输入尺寸，加载时为该尺寸下的每个尺寸桶预热编译图
+            buckets: letterbox尺寸桶 [(h, w), ...]，None时只有编译推理使用默认尺寸桶
+            ready_cache: PyTorch后端是否从缓存的可直接服务模型加载
+            ready_cache_dir: 可直接服务模型的缓存目录，None表示权重所在目录
         """
         # 获取项目根目录的绝对路径
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.model_dir = os.path.join(project_root, model_dir) if model_dir == "yolov12" else model_dir
+        self.backend = backend
+        self.auto_export = auto_export
+        self.export_format = export_format
+        self.threads = threads
+        self.int8 = int8
+        self.int8_max_map_drop = int8_max_map_drop
+        self.export_int8 = export_int8
+        self.calibration_dir = calibration_dir
+        self.compile = compile
+        self.compile_imgsz = compile_imgsz
+        self.buckets = buckets
+        self.ready_cache = ready_cache
+        self.ready_cache_dir = ready_cache_dir
         self.models = {}
 
+    def select_backend(self, model_path, device):
+        """
+        为权重选择推理后端
+
+        依次检查设备上从快到慢的后端，使用第一个导出文件存在、不旧于权重且运行时已安装的后端，
+        INT8模型还要求量化报告中的mAP下降不超过上限；都没有时按配置自动导出，导出失败则回退到 PyTorch
+
+        Args:
+            model_path: PyTorch 权重路径
+            device: 运行设备
+
+        Returns:
+            tuple: (后端, 模型路径)
+        """
+        candidates = DEVICE_BACKENDS.get(device, ("pytorch",)) if self.backend == "auto" else (self.backend, "pytorch")
+        for backend in candidates:
+            if backend == "pytorch":
+                break
+            if EXPORT_BACKENDS[backend][3] and not self.int8 and self.backend == "auto":
+                continue
+            path = exported_path(model_path, backend)
+            if backend_available(backend) and os.path.exists(path) \
+                    and os.path.getmtime(path) >= os.path.getmtime(model_path) and self.int8_accepted(backend, path):
+                return backend, path
+
+        backend = self.backend
+        if backend == "auto":
+            backend = f"{self.export_format}_int8" if self.export_int8 and self.int8 else self.export_format
+        if self.auto_export and backend in candidates and backend in EXPORT_BACKENDS and backend_available(backend):
+            path = self.export_model(model_path, backend, device)
+            if path and self.int8_accepted(backend, path):
+                return backend, path
+        return "pytorch", model_path
+
+    def int8_accepted(self, backend, path):
+        """INT8模型的量化mAP下降不超过上限时才使用（非INT8模型或没有报告时直接使用）"""
+        if not EXPORT_BACKENDS[backend][3]:
+            return True
+        report = int8_report(path)
+        if report and -report.get("map_delta", 0.0) > self.int8_max_map_drop:
+            print(f"Skipping INT8 model {path}: mAP50-95 drop {-report['map_delta']:.3f} "
+                  f"exceeds {self.int8_max_map_drop:.3f}")
+            return False
+        return True
+
+    def export_model(self, model_path, backend, device):
+        """
+        导出模型并缓存到权重旁边（动态输入尺寸，适配不同的推理尺寸和批大小）
+
+        Args:
+            model_path: PyTorch 权重路径
+            backend: 导出后端
+            device: 运行设备
+
+        Returns:
+            导出文件路径，导出失败时返回None
+        """
+        with _export_lock:
+            path = exported_path(model_path, backend)
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(model_path):
+                return path
+            print(f"Exporting {model_path} to {backend} for faster inference on {device}...")
+            export_format, int8 = EXPORT_BACKENDS[backend][2:]
+            try:
+                # INT8 量化从上传目录的监控视频中抽帧校准，并在留出帧上报告mAP变化与加速比
+                YOLO(model_path).export(format=export_format, dynamic=True, device=0 if device == "cuda" else "cpu",
+                                        int8=int8, data=self.calibration_dir if int8 else None)
+                return path
+            except Exception as e:
+                print(f"Error exporting model {model_path} to {backend}: {e}, falling back to PyTorch")
+                return None
+
     def load_model(self, model_name="yolov12n.pt", device='cuda'):
         """
         加载 YOLO 模型
@@ -47,20 +237,76 @@ class YOLOModelManager:
             try:
                 if not os.path.exists(model_path):
                     raise FileNotFoundError(f"Model file not found: {model_path}")
-                    
-                model = YOLO(model_path)
-                model.to(device)
+
+                backend, path = self.select_backend(model_path, device) if model_path.endswith(".pt") \
+                    else ("exported", model_path)
+                if backend == "pytorch":
+                    path = self.ready_model_path(model_path)
+                    model = YOLO(path)
+                    model.to(device)
+                    if device == 'cpu' and self.threads:
+                        torch.set_num_threads(self.threads)
+                else:
+                    # 导出模型不能移动设备，通过推理参数指定设备和线程数
+                    model = YOLO(path, task="detect")
+                    model.overrides.update(device="0" if device == "cuda" else device, threads=self.threads)
+                if self.buckets:
+                    # 输入按分辨率letterbox到固定尺寸桶并按桶分批推理（固定输入尺寸的导出模型会忽略该参数）
+                    model.overrides["buckets"] = [list(b) for b in self.buckets]
+                if backend == "pytorch" and self.compile:
+                    self.warmup_compiled(model)
                 self.models[model_name] = {
                     'model': model,
-                    'device': device
+                    'device': device,
+                    'backend': backend,
+                    'path': path
                 }
-                print(f"Model {model_name} loaded successfully!")
+                print(f"Model {model_name} loaded successfully with {backend} backend from {path}!")
             except Exception as e:
                 print(f"Error loading model {model_name}: {e}")
                 raise
 
         return self.models[model_name]['model']
 
+    def ready_model_path(self, model_path):
+        """
+        获取权重对应的可直接服务模型路径
+
+        可直接服务模型已融合Conv+BN、处于推理模式，按权重哈希和torch版本缓存，
+        加载时内存映射张量，省去读取检查点后的类型转换和融合；首次加载时构建，失败时回退到原始权重
+
+        Args:
+            model_path: PyTorch 权重路径
+
+        Returns:
+            可直接服务模型路径，未开启缓存或构建失败时返回原始权重路径
+        """
+        if not self.ready_cache:
+            return model_path
+        try:
+            return str(ready_checkpoint(model_path, cache_dir=self.ready_cache_dir))
+        except Exception as e:
+            print(f"Error building ready-to-serve model for {model_path}: {e}, loading the weights directly")
+            return model_path
+
+    def warmup_compiled(self, model):
+        """
+        开启模型的编译推理并在加载时预热
+
+        之后的推理都按推理尺寸letterbox到固定的几个尺寸桶（配置的尺寸桶，默认为16:9、4:3 和正方形），
+        这里用一帧空白图触发预测器初始化，为每个尺寸桶构建编译图，避免首帧推理时才编译
+
+        Args:
+            model: YOLO 模型实例（PyTorch后端）
+        """
+        model.overrides["compile"] = self.compile
+        t = time.time()
+        model.infer_frames(np.zeros((self.compile_imgsz, self.compile_imgsz, 3), dtype=np.uint8),
+                           imgsz=self.compile_imgsz)
+        graphs = model.predictor.model.graphs
+        print(f"Compiled {len(graphs)} input shapes with {model.predictor.model.compiled} in {time.time() - t:.1f}s: "
+              f"{[key[2:4] for key in graphs]}")
+
     def get_model_device(self, model_name="yolov12n.pt"):
         """
         获取模型运行设备
@@ -75,6 +321,20 @@ class YOLOModelManager:
             return self.models[model_name]['device']
         return None
 
+    def get_model_backend(self, model_name="yolov12n.pt"):
+        """
+        获取模型推理后端
+
+        Args:
+            model_name: 模型文件名
+
+        Returns:
+            后端名称（pytorch/onnx/openvino/onnx_int8/openvino_int8/engine，直接加载导出文件时为exported）
+        """
+        if model_name in self.models:
+            return self.models[model_name]['backend']
+        return None
+
     def set_model_classes(self, model_name="yolov12n.pt", classes=None):
         """
         设置模型检测类别
@@ -4,12 +4,17 @@
 """
 
 from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+import os
+import re
 import uuid
 from pydantic import BaseModel, Field
-from ..services.rabbitmq_service import rabbitmq_producer
+from ..services.rabbitmq_service import rabbitmq_producer, serialize_message
+from ..services.snapshot_service import snapshot_service
+from ..services.alarm_bus import alarm_bus
+from ..services.subscription_service import subscription_service
 
 
 class Alarm(BaseModel):
@@ -92,10 +97,13 @@ async def send_alarm(
             "ext1": ext1
         }
 
-        # 发送消息到RabbitMQ
-        success = rabbitmq_producer.send_message(alarm_message)
+        # 发送消息到RabbitMQ（在线程池中执行，不阻塞事件循环）
+        success = await rabbitmq_producer.send_message_async(alarm_message)
 
         if success:
+            # 推送给实时订阅者和GA/T 1400订阅者
+            alarm_bus.publish(alarm_message)
+            subscription_service.dispatch(alarm_message)
             return JSONResponse(content={
                 "status": "success",
                 "message": "告警信息已成功发送到消息队列",
@@ -121,6 +129,9 @@ async def batch_send_alarm(
     """
     批量发送告警信息到RabbitMQ队列
 
+    所有告警先统一序列化，再在同一通道上流水线式发布（启用发布确认），
+    每条消息的成功与否以服务器确认结果为准；发布过程在线程池中执行，不阻塞事件循环。
+
     参数说明：
     - alarms: 告警信息列表，每个告警信息的字段与send_alarm接口相同
 
@@ -137,8 +148,10 @@ async def batch_send_alarm(
                 detail="告警列表不能为空"
             )
 
-        success_count = 0
-        failed_count = 0
+        # 先统一构建并序列化全部告警消息
+        alarm_codes = []
+        alarm_messages = []
+        bodies = []
         failed_alarms = []
 
         for alarm in alarms:
@@ -163,17 +176,26 @@ async def batch_send_alarm(
                     "ext1": alarm.ext1
                 }
 
-                # 发送消息到RabbitMQ
-                if rabbitmq_producer.send_message(full_alarm):
-                    success_count += 1
-                else:
-                    failed_count += 1
-                    failed_alarms.append(alarm_code)
+                bodies.append(serialize_message(full_alarm))
+                alarm_codes.append(alarm_code)
+                alarm_messages.append(full_alarm)
 
             except Exception as e:
-                failed_count += 1
                 failed_alarms.append(alarm.code or "unknown")
 
+        # 流水线发布，按确认结果统计每条消息
+        results = await rabbitmq_producer.publish_pipelined_async(bodies)
+        failed_alarms.extend(code for code, acked in zip(alarm_codes, results) if not acked)
+
+        # 已确认的告警推送给实时订阅者和GA/T 1400订阅者
+        for message, acked in zip(alarm_messages, results):
+            if acked:
+                alarm_bus.publish(message)
+                subscription_service.dispatch(message)
+
+        failed_count = len(failed_alarms)
+        success_count = len(alarms) - failed_count
+
         return JSONResponse(content={
             "status": "success",
             "message": f"批量发送完成，成功{success_count}条，失败{failed_count}条",
@@ -192,3 +214,24 @@ async def batch_send_alarm(
             status_code=500,
             detail=f"批量发送告警信息时发生错误: {str(e)}"
         )
+
+
+@router.get("/snapshots/{name}")
+async def get_snapshot(name: str):
+    """
+    获取告警抓拍图片
+
+    图片按内容寻址（文件名为图片内容的SHA-256），同名文件内容不会变化，可长期缓存。
+
+    参数说明：
+    - name: 图片文件名，来自告警消息的image字段或ext1中的thumbnail字段
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}\.jpg", name):
+        raise HTTPException(status_code=400, detail="图片文件名无效")
+
+    path = snapshot_service.path_for(name)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="告警图片不存在")
+
+    return FileResponse(path, media_type="image/jpeg",
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
@@ -3,16 +3,14 @@
 处理实时摄像头流和摄像头管理功能
 """
 
-from fastapi import APIRouter, HTTPException, Query, Form
+from fastapi import APIRouter, HTTPException, Query, Form, Body
 from fastapi.responses import StreamingResponse, JSONResponse
-from typing import List, Optional
-from ..services.camera_service import CameraService
+from typing import List, Optional, Dict, Any
+from ..services.camera_service import camera_service
+from ..services.capture_supervisor import capture_supervisor
 
 router = APIRouter()
 
-# 初始化摄像头服务
-camera_service = CameraService()
-
 @router.get("/cameras")
 async def get_all_cameras():
     """
@@ -25,6 +23,61 @@ async def get_all_cameras():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cameras/health")
+async def get_cameras_health(camera_id: Optional[str] = None):
+    """
+    获取摄像头连接健康状态
+    - camera_id: 摄像头ID，不传表示全部正在采集的摄像头
+    返回每路连接的状态（connecting/online/stale/ended）、实际帧率、最近一帧的时间、重连次数等
+    """
+    try:
+        return JSONResponse(content=capture_supervisor.health(camera_id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cameras/config/{camera_id}")
+async def get_camera_config(camera_id: str):
+    """
+    获取摄像头各场景的配置
+    - camera_id: 摄像头ID
+    返回配置版本号以及各场景的ROI、阈值、检测间隔（stride）和是否启用（enabled）
+    """
+    try:
+        return JSONResponse(content=camera_service.get_camera_config(camera_id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/cameras/config/{camera_id}/{scenario}")
+async def update_camera_config(camera_id: str, scenario: str, changes: Dict[str, Any] = Body(...)):
+    """
+    修改摄像头某个场景的配置，正在运行的视频流在下一帧生效，无需重新连接
+    - camera_id: 摄像头ID
+    - scenario: 场景类型 (loitering, leave, gather, banner)
+    - 请求体: 要修改的配置项，如 {"roi": [[220,300],[700,300],[700,700],[200,700]], "threshold": 3, "stride": 2, "enabled": true}，值为null表示恢复默认值
+    """
+    try:
+        result = camera_service.update_scenario_config(camera_id, scenario, changes)
+        return JSONResponse(content=result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/cameras/config/reload")
+async def reload_camera_config():
+    """
+    立即从配置文件重新加载摄像头配置（配置文件被修改后也会自动重新加载）
+    """
+    try:
+        changed = camera_service.reload_config()
+        return JSONResponse(content={"message": "摄像头配置已重新加载", "changed_cameras": changed})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/cameras/scene/{camera_id}")
 async def get_camera_scene(camera_id: str):
     """
@@ -138,7 +191,7 @@ async def remove_camera(camera_id: str):
 async def process_camera(
         camera_id: str = "default",
         detection_type: str = "loitering",
-        loitering_time_threshold: int = 20,
+        loitering_time_threshold: Optional[int] = None,
         leave_roi: Optional[str] = None,
         leave_threshold: Optional[int] = None,
         gather_roi: Optional[str] = None,
@@ -149,6 +202,9 @@ async def process_camera(
 ):
     """
     实时处理摄像头视频流
+    未指定的ROI和阈值使用摄像头的场景配置，视频流运行期间修改场景配置会在下一帧生效
+    - detection_type: 检测类型；以逗号分隔多个场景（如 leave,gather,banner）时在同一路视频流上组合检测，
+      各场景共用一次预处理，组合检测支持 leave、gather、banner
     """
     # 检查摄像头是否已分配场景
     try:
@@ -188,7 +244,22 @@ async def process_camera(
             pass
 
     # 根据检测类型选择不同的处理函数
-    if detection_type == "leave":
+    if "," in detection_type:
+        # 多场景组合检测
+        scenarios = list(dict.fromkeys(t.strip() for t in detection_type.split(",") if t.strip()))
+        unsupported = set(scenarios) - {"leave", "gather", "banner"}
+        if unsupported:
+            raise HTTPException(status_code=400, detail=f"组合检测不支持的场景: {', '.join(sorted(unsupported))}")
+        return StreamingResponse(
+            camera_service.process_combined_stream(
+                camera_id, scenarios,
+                parsed_leave_roi, leave_threshold,
+                parsed_gather_roi, gather_threshold,
+                banner_conf_threshold, banner_iou_threshold
+            ),
+            media_type="multipart/x-mixed-replace; boundary=frame"
+        )
+    elif detection_type == "leave":
         # 离岗检测
         return StreamingResponse(
             camera_service.process_leave_stream(camera_id, parsed_leave_roi, leave_threshold),
@@ -196,10 +267,6 @@ async def process_camera(
         )
     elif detection_type == "gather":
         # 聚集检测
-        # 如果没有提供ROI，则使用默认值
-        if not parsed_gather_roi:
-            parsed_gather_roi = [(220, 300), (700, 300), (700, 700), (200, 700)]
-
         return StreamingResponse(
             camera_service.process_gather_stream(camera_id, parsed_gather_roi, gather_threshold),
             media_type="multipart/x-mixed-replace; boundary=frame"
@@ -64,6 +64,26 @@ async def keepalive_device(device_info: Dict[str, Any] = Body(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/keepalive/batch")
+async def keepalive_devices(keepalive_info: Dict[str, Any] = Body(...)):
+    """
+    批量设备保活接口 (GA/T 1400 扩展接口)
+    - device_ids: 设备ID列表，一次请求为多个设备保活
+    """
+    try:
+        device_ids = keepalive_info.get("device_ids")
+        if not isinstance(device_ids, list):
+            raise HTTPException(status_code=400, detail="缺少设备ID列表参数")
+
+        result = ga1400_service.keepalive_devices(device_ids)
+        if result["status"] == "error":
+            raise HTTPException(status_code=400, detail=result["message"])
+        return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/sync_time")
 async def sync_device_time(time_info: Dict[str, Any] = Body(...)):
     """
@@ -84,14 +104,18 @@ async def sync_device_time(time_info: Dict[str, Any] = Body(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/devices")
-async def get_device_list(scene_type: Optional[str] = None):
+async def get_device_list(scene_type: Optional[str] = None, location: Optional[str] = None):
     """
     数据采集接口 - 获取设备列表 (GA/T 1400 标准接口)
+    - scene_type: 按场景类型过滤
+    - location: 按位置过滤
     """
     try:
         query_params = {}
         if scene_type:
             query_params["scene_type"] = scene_type
+        if location:
+            query_params["location"] = location
 
         result = ga1400_service.get_device_list(query_params)
         if result["status"] == "error":
@@ -117,6 +141,40 @@ async def subscribe_notifications(subscription_info: Dict[str, Any] = Body(...))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/unsubscribe")
+async def unsubscribe_notifications(subscription_info: Dict[str, Any] = Body(...)):
+    """
+    取消订阅接口 (GA/T 1400 标准接口)
+    """
+    try:
+        subscription_id = subscription_info.get("subscription_id")
+        if not subscription_id:
+            raise HTTPException(status_code=400, detail="缺少订阅ID参数")
+
+        result = ga1400_service.unsubscribe_notifications(subscription_id)
+        if result["status"] == "error":
+            raise HTTPException(status_code=404, detail=result["message"])
+        return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/subscriptions")
+async def get_subscriptions():
+    """
+    查询订阅列表及推送状态 (GA/T 1400 扩展接口)
+    """
+    try:
+        result = ga1400_service.get_subscriptions()
+        if result["status"] == "error":
+            raise HTTPException(status_code=400, detail=result["message"])
+        return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/alarm/report")
 async def report_alarm(alarm_info: Dict[str, Any] = Body(...)):
     """
@@ -2,21 +2,22 @@
 任务管理相关路由
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Header, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from typing import List, Optional
 import os
 import json
+import asyncio
 from ..services.video_service import VideoService
+from ..services.alarm_store import alarm_store
+from ..services.alarm_bus import alarm_bus
+from ..config.settings import ALARM_STREAM_HEARTBEAT
 
 router = APIRouter()
 
 # 初始化视频服务
 video_service = VideoService()
 
-# 报警信息存储（实际项目中应该使用数据库）
-alerts_data = []
-
 
 @router.get("/task_status/{task_id}")
 async def get_task_status(task_id: str):
@@ -59,51 +60,105 @@ async def query_alerts(
         camera_ids: List[str] = Query(...),
         scene_type: str = Query(...),
         start_time: Optional[str] = None,
-        end_time: Optional[str] = None
+        end_time: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None
 ):
     """
-    查询报警数据
+    查询报警数据（按时间倒序，键集分页）
     - camera_ids: 摄像头ID列表
     - scene_type: 场景类型
     - start_time: 开始时间 (格式: YYYY-MM-DD HH:MM:SS)
     - end_time: 结束时间 (格式: YYYY-MM-DD HH:MM:SS)
+    - limit: 每页条数
+    - cursor: 下一页游标，取自上一页响应头 X-Next-Cursor；响应头不存在表示没有更多数据
     """
-    # 过滤报警数据
-    filtered_alerts = []
-    for alert in alerts_data:
-        # 检查摄像头ID
-        if alert["camera_id"] not in camera_ids:
-            continue
-
-        # 检查场景类型
-        if alert["scene_type"] != scene_type:
-            continue
-
-        # 检查时间范围
-        if start_time and alert["timestamp"] < start_time:
-            continue
+    try:
+        alerts, next_cursor = alarm_store.query(camera_ids, scene_type, start_time, end_time, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        if end_time and alert["timestamp"] > end_time:
-            continue
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONResponse(content=alerts, headers=headers)
 
-        filtered_alerts.append(alert)
 
-    return JSONResponse(content=filtered_alerts)
+@router.get("/alerts/count")
+async def count_alerts(
+        camera_ids: Optional[List[str]] = Query(None),
+        scene_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        group_by: Optional[str] = None
+):
+    """
+    统计报警数量
+    - camera_ids: 摄像头ID列表，不传表示全部摄像头
+    - scene_type: 场景类型，不传表示全部场景
+    - start_time: 开始时间 (格式: YYYY-MM-DD HH:MM:SS)
+    - end_time: 结束时间 (格式: YYYY-MM-DD HH:MM:SS)
+    - group_by: 分组方式 (camera_id, scene_type, day, hour)，不传只返回总数
+    """
+    try:
+        result = alarm_store.count(camera_ids, scene_type, start_time, end_time, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content=result)
 
 
 @router.get("/alerts/stream")
-async def stream_alerts():
+async def stream_alerts(
+        request: Request,
+        camera_ids: Optional[List[str]] = Query(None),
+        scene_types: Optional[List[str]] = Query(None),
+        last_event_id: Optional[str] = Header(None),
+        resume_from: Optional[str] = Query(None, alias="last_event_id")
+):
     """
     实时报警推送接口
-    返回服务器发送事件(SSE)流
+    返回服务器发送事件(SSE)流，每条告警为一个 alarm 事件，设备上下线为 device 事件，事件ID用于断线续传
+    - camera_ids: 只推送这些摄像头的告警，不传表示全部
+    - scene_types: 只推送这些场景的告警，不传表示全部（指定时不推送 device 事件）
+    - Last-Event-ID 请求头（浏览器 EventSource 重连时自动携带）或 last_event_id 参数：
+      从最近告警的回放环中补发该ID之后的告警；超出回放范围时先发送 gap 事件，客户端应通过 /alerts 补查
+    - 客户端跟不上推送速度时收到 overflow 事件后连接被关闭，重连即可续传
+    - 无告警时每隔一段时间发送心跳注释，防止代理断开空闲连接
     """
+    resume = last_event_id or resume_from
+    try:
+        resume_id = int(resume) if resume else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID 无效")
 
-    # 这里只是一个示例实现，实际项目中应该使用WebSocket或其他实时通信技术
-    def generate():
-        # 模拟实时报警推送
-        yield f"data: {json.dumps({'message': '连接已建立，等待报警信息...'})}\n\n"
-
-        # 在实际应用中，这里会持续监听报警事件并推送
-        # 例如通过消息队列或事件总线
-
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    try:
+        subscriber, gap = alarm_bus.subscribe(camera_ids, scene_types, resume_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def generate():
+        try:
+            yield "retry: 3000\n\n"
+            if gap:
+                yield f"event: gap\ndata: {json.dumps({'last_event_id': resume_id})}\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), timeout=ALARM_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": heartbeat\n\n"
+                    continue
+                # 把队列中已积压的事件合并为一次写出
+                frames = [frame]
+                while frame is not None and not subscriber.queue.empty():
+                    frame = subscriber.queue.get_nowait()
+                    frames.append(frame)
+                if frames[-1] is None:
+                    # 溢出时已积压的事件均已丢弃，通知客户端从最后收到的事件续传
+                    yield f"event: overflow\ndata: {json.dumps({'reason': 'slow consumer'})}\n\n"
+                    break
+                yield b"".join(frames)
+        finally:
+            alarm_bus.unsubscribe(subscriber)
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
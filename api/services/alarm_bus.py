@@ -0,0 +1,179 @@
+"""
+告警发布/订阅总线
+所有告警都经过进程内总线分发给实时订阅者（如 /alerts/stream 的SSE连接）：
+告警可以在任意线程发布，由事件循环统一分发到每个订阅者的有界队列；
+跟不上的订阅者被断开并提示带 Last-Event-ID 重连，重连后从最近告警的回放环中补发
+"""
+
+import asyncio
+import json
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from .alarm_store import scene_type_of
+from ..config.settings import (
+    ALARM_STREAM_QUEUE_SIZE,
+    ALARM_STREAM_REPLAY_SIZE,
+    ALARM_STREAM_MAX_SUBSCRIBERS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AlarmSubscriber:
+    """告警订阅者"""
+
+    def __init__(self, camera_ids: Optional[Iterable[str]], scene_types: Optional[Iterable[str]], queue_size: int):
+        """
+        初始化订阅者
+
+        Args:
+            camera_ids: 只接收这些摄像头的告警，None表示全部
+            scene_types: 只接收这些场景的告警，None表示全部
+            queue_size: 待发送队列容量
+        """
+        self.camera_ids: Optional[Set[str]] = set(camera_ids) if camera_ids else None
+        self.scene_types: Optional[Set[str]] = set(scene_types) if scene_types else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # 已放入队列的最大事件ID，用于回放与实时分发之间去重
+        self.last_id = 0
+        # 因队列溢出被断开
+        self.overflowed = False
+
+    def matches(self, camera_id: str, scene_type: str) -> bool:
+        """判断告警是否符合订阅条件"""
+        return ((self.camera_ids is None or camera_id in self.camera_ids) and
+                (self.scene_types is None or scene_type in self.scene_types))
+
+    def offer(self, event: Tuple[int, str, str, bytes]) -> bool:
+        """
+        非阻塞地放入一条事件（必须在事件循环线程中调用）
+
+        Returns:
+            bool: 队列是否仍有空间（False表示订阅者跟不上，已被断开）
+        """
+        event_id, camera_id, scene_type, frame = event
+        if self.overflowed or event_id <= self.last_id or not self.matches(camera_id, scene_type):
+            return True
+        try:
+            self.queue.put_nowait(frame)
+            self.last_id = event_id
+            return True
+        except asyncio.QueueFull:
+            # 丢弃积压的事件并放入断开标记，客户端重连后通过 Last-Event-ID 从回放环补发
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class AlarmBus:
+    """进程内告警发布/订阅总线"""
+
+    def __init__(self,
+                 queue_size: int = ALARM_STREAM_QUEUE_SIZE,
+                 replay_size: int = ALARM_STREAM_REPLAY_SIZE,
+                 max_subscribers: int = ALARM_STREAM_MAX_SUBSCRIBERS):
+        """
+        初始化告警总线
+
+        Args:
+            queue_size: 每个订阅者的待发送队列容量
+            replay_size: 回放环保留的最近告警数
+            max_subscribers: 最大订阅者数
+        """
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.replay = deque(maxlen=replay_size)
+        self.subscribers: Set[AlarmSubscriber] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 事件ID从启动时刻的毫秒数开始递增，进程重启后客户端的 Last-Event-ID 不会与新事件混淆
+        self._next_id = int(time.time() * 1000)
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.stats = {"published": 0, "delivered": 0, "overflowed": 0}
+
+    def publish(self, message: Dict[str, Any], event_type: str = "alarm") -> int:
+        """
+        发布一条告警（线程安全，不阻塞调用方）
+
+        告警在发布线程中一次性编码为SSE事件帧，事件循环只负责把同一份字节分发给各订阅者
+
+        Args:
+            message: 告警消息字典
+            event_type: SSE事件类型，告警为alarm，设备上下线为device
+
+        Returns:
+            int: 分配的事件ID
+        """
+        data = json.dumps(message, ensure_ascii=False)
+        camera_id, scene_type = message.get("deviceCode") or "", scene_type_of(message)
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            event = (event_id, camera_id, scene_type, f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8"))
+            self.replay.append(event)
+            self.stats["published"] += 1
+            # 在锁内调度，保证分发顺序与事件ID顺序一致
+            if self.loop is not None and self.subscribers and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._fanout, event)
+        return event_id
+
+    def _fanout(self, event: Tuple[int, str, str, bytes]):
+        """把事件分发给所有订阅者（在事件循环线程中执行）"""
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(event):
+                self.stats["overflowed"] += 1
+                logger.warning(f"告警订阅者跟不上推送速度，已断开（事件ID {event[0]}）")
+        self.stats["delivered"] += 1
+
+    def subscribe(self, camera_ids: Optional[Iterable[str]] = None, scene_types: Optional[Iterable[str]] = None,
+                  last_event_id: Optional[int] = None) -> Tuple[AlarmSubscriber, bool]:
+        """
+        创建订阅（必须在事件循环中调用）
+
+        Args:
+            camera_ids: 摄像头ID过滤条件
+            scene_types: 场景类型过滤条件
+            last_event_id: 客户端最后收到的事件ID，提供时从回放环补发之后的告警
+
+        Returns:
+            tuple: (订阅者, 是否有告警已超出回放环而无法补发)
+        """
+        if len(self.subscribers) >= self.max_subscribers:
+            raise RuntimeError("告警订阅连接数已达上限")
+
+        self.loop = asyncio.get_running_loop()
+        subscriber = AlarmSubscriber(camera_ids, scene_types, self.queue_size)
+
+        gap = False
+        with self._lock:
+            if last_event_id is not None:
+                replay: List = [event for event in self.replay if event[0] > last_event_id]
+                oldest = replay[0][0] if replay else self._next_id
+                gap = oldest > last_event_id + 1
+                replay = [event for event in replay if subscriber.matches(event[1], event[2])]
+                # 补发量超过队列容量时只补发最近的部分，其余视为缺口
+                if len(replay) >= self.queue_size:
+                    replay = replay[-(self.queue_size - 1):]
+                    gap = True
+                for event in replay:
+                    subscriber.offer(event)
+            # 在锁内登记，之后发布的告警都会分发给该订阅者；已调度但尚未执行的分发按事件ID去重
+            subscriber.last_id = max(subscriber.last_id, self._next_id - 1)
+            self.subscribers.add(subscriber)
+        return subscriber, gap
+
+    def unsubscribe(self, subscriber: AlarmSubscriber):
+        """取消订阅"""
+        self.subscribers.discard(subscriber)
+
+
+# 创建全局告警总线实例
+alarm_bus = AlarmBus()
@@ -0,0 +1,214 @@
+"""
+告警合并引擎
+位于检测器与告警发布之间：检测器只逐帧上报“告警条件是否成立”，由引擎按
+(摄像头, 场景, 目标/区域) 维护事件状态，把连续成立的条件合并为一个事件，
+按 open/update/close 生命周期产生告警，并按摄像头限制告警发送速率，
+使告警消息数量与事件数量成正比，而不是与帧数成正比
+"""
+
+import threading
+import time
+import uuid
+import logging
+from typing import Dict, Any, List, Optional, Iterable, Hashable, Tuple
+
+from ..config.settings import (
+    ALARM_COALESCE_WINDOW,
+    ALARM_UPDATE_INTERVAL,
+    ALARM_RATE_LIMIT,
+    ALARM_RATE_PERIOD
+)
+
+logger = logging.getLogger(__name__)
+
+# 事件生命周期类型
+EVENT_OPEN = "open"
+EVENT_UPDATE = "update"
+EVENT_CLOSE = "close"
+
+
+class AlarmEngine:
+    """告警合并引擎"""
+
+    def __init__(self,
+                 coalesce_window: float = ALARM_COALESCE_WINDOW,
+                 update_interval: float = ALARM_UPDATE_INTERVAL,
+                 rate_limit: int = ALARM_RATE_LIMIT,
+                 rate_period: float = ALARM_RATE_PERIOD):
+        """
+        初始化告警合并引擎
+
+        Args:
+            coalesce_window: 合并窗口（秒），条件消失超过该时间才关闭事件，窗口内再次成立视为同一事件
+            update_interval: 持续事件的更新告警间隔（秒），0表示持续期间不发送更新
+            rate_limit: 每个摄像头在rate_period内最多发送的open/update告警数，0表示不限制
+            rate_period: 速率限制的统计周期（秒）
+        """
+        self.coalesce_window = coalesce_window
+        self.update_interval = update_interval
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+
+        # 进行中的事件 {(摄像头, 场景, 目标/区域): 事件状态}
+        self.incidents: Dict[Tuple[str, str, Hashable], Dict[str, Any]] = {}
+        # 每个摄像头的令牌桶 {摄像头: [剩余令牌, 上次补充时间]}
+        self.buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.stats = {"observations": 0, "opened": 0, "updated": 0, "closed": 0, "suppressed": 0}
+
+    def observe(self, camera_id: str, scenario: str, key: Hashable, active: bool,
+                payload: Optional[Dict[str, Any]] = None, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        上报一次告警条件观测
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型（loitering/leave/gather/banner）
+            key: 场景内的目标或区域标识（如跟踪ID、ROI名称）
+            active: 告警条件当前是否成立
+            payload: 告警详情（持续时间、人数、位置等），条件成立时记录为事件的最新详情
+            now: 当前时间（秒），默认使用系统时间
+
+        Returns:
+            List[Dict[str, Any]]: 本次观测产生的告警事件（通常为空）
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self.stats["observations"] += 1
+            incident_key = (camera_id, scenario, key)
+            incident = self.incidents.get(incident_key)
+
+            if not active:
+                if incident is not None and now - incident["last_seen"] >= self.coalesce_window:
+                    return self._close(incident_key, now)
+                return []
+
+            if incident is None:
+                incident = {
+                    "incident_id": str(uuid.uuid4()),
+                    "camera_id": camera_id,
+                    "scenario": scenario,
+                    "key": key,
+                    "start_time": now,
+                    "last_seen": now,
+                    "last_emit": None,
+                    "reported": False,
+                    "observations": 0,
+                    "payload": {}
+                }
+                self.incidents[incident_key] = incident
+
+            incident["last_seen"] = now
+            incident["observations"] += 1
+            if payload:
+                incident["payload"] = payload
+
+            if not incident["reported"]:
+                # 新事件，或因速率限制尚未发出的事件
+                return self._emit(incident, EVENT_OPEN, now)
+            if self.update_interval > 0 and now - incident["last_emit"] >= self.update_interval:
+                return self._emit(incident, EVENT_UPDATE, now)
+            return []
+
+    def sweep(self, camera_id: str, scenario: str, active_keys: Iterable[Hashable],
+              now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        对本帧未上报的目标视为条件不成立，用于目标离开画面等无法逐个上报的情况
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型
+            active_keys: 本帧条件成立的目标/区域标识
+            now: 当前时间（秒）
+
+        Returns:
+            List[Dict[str, Any]]: 因超出合并窗口而关闭的事件
+        """
+        now = time.time() if now is None else now
+        active_keys = set(active_keys)
+        events = []
+        with self._lock:
+            expired = [k for k, incident in self.incidents.items()
+                       if k[0] == camera_id and k[1] == scenario and k[2] not in active_keys
+                       and now - incident["last_seen"] >= self.coalesce_window]
+            for incident_key in expired:
+                events.extend(self._close(incident_key, now))
+        return events
+
+    def close_all(self, camera_id: str, scenario: Optional[str] = None,
+                  now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        立即关闭摄像头（或其某个场景）下的全部事件，用于视频流结束
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型，None表示全部场景
+            now: 当前时间（秒）
+
+        Returns:
+            List[Dict[str, Any]]: 关闭事件
+        """
+        now = time.time() if now is None else now
+        events = []
+        with self._lock:
+            keys = [k for k in self.incidents if k[0] == camera_id and (scenario is None or k[1] == scenario)]
+            for incident_key in keys:
+                events.extend(self._close(incident_key, now))
+        return events
+
+    def is_open(self, camera_id: str, scenario: str, key: Hashable) -> bool:
+        """判断指定目标/区域当前是否存在进行中的事件"""
+        return (camera_id, scenario, key) in self.incidents
+
+    def _close(self, incident_key, now: float) -> List[Dict[str, Any]]:
+        """关闭事件，只有已发出open告警的事件才发送close告警"""
+        incident = self.incidents.pop(incident_key)
+        if not incident["reported"]:
+            return []
+        self.stats["closed"] += 1
+        return [self._event(incident, EVENT_CLOSE, now)]
+
+    def _emit(self, incident: Dict[str, Any], event_type: str, now: float) -> List[Dict[str, Any]]:
+        """按摄像头速率限制发出open/update告警"""
+        if not self._take_token(incident["camera_id"], now):
+            self.stats["suppressed"] += 1
+            return []
+        incident["reported"] = True
+        incident["last_emit"] = now
+        self.stats["opened" if event_type == EVENT_OPEN else "updated"] += 1
+        return [self._event(incident, event_type, now)]
+
+    def _take_token(self, camera_id: str, now: float) -> bool:
+        """令牌桶：每个摄像头每rate_period秒补充rate_limit个令牌"""
+        if self.rate_limit <= 0:
+            return True
+        bucket = self.buckets.setdefault(camera_id, [float(self.rate_limit), now])
+        rate = self.rate_limit / self.rate_period
+        bucket[0] = min(float(self.rate_limit), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    @staticmethod
+    def _event(incident: Dict[str, Any], event_type: str, now: float) -> Dict[str, Any]:
+        """构建告警事件"""
+        return {
+            "event": event_type,
+            "incident_id": incident["incident_id"],
+            "camera_id": incident["camera_id"],
+            "scenario": incident["scenario"],
+            "key": incident["key"],
+            "start_time": incident["start_time"],
+            "last_seen": incident["last_seen"],
+            "duration": (incident["last_seen"] if event_type == EVENT_CLOSE else now) - incident["start_time"],
+            "observations": incident["observations"],
+            "payload": incident["payload"]
+        }
+
+
+# 创建全局告警合并引擎实例，所有摄像头共享
+alarm_engine = AlarmEngine()
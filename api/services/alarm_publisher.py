@@ -0,0 +1,237 @@
+"""
+后台告警发布服务
+视频帧循环只做非阻塞入队，由后台线程批量发布到RabbitMQ（启用发布确认）；
+消息队列不可达时按指数退避重连，并把消息追加写入磁盘缓存，恢复后按顺序重放
+"""
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Optional
+
+from .rabbitmq_service import RabbitMQProducer, serialize_message
+from ..config.settings import (
+    ALARM_PUBLISH_QUEUE_SIZE,
+    ALARM_PUBLISH_BATCH_SIZE,
+    ALARM_PUBLISH_BACKOFF_MIN,
+    ALARM_PUBLISH_BACKOFF_MAX,
+    ALARM_SPOOL_FILE
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AlarmPublisher:
+    """后台告警发布器"""
+
+    def __init__(self,
+                 queue_size: int = ALARM_PUBLISH_QUEUE_SIZE,
+                 batch_size: int = ALARM_PUBLISH_BATCH_SIZE,
+                 spool_file: str = ALARM_SPOOL_FILE,
+                 backoff_min: float = ALARM_PUBLISH_BACKOFF_MIN,
+                 backoff_max: float = ALARM_PUBLISH_BACKOFF_MAX,
+                 producer: Optional[RabbitMQProducer] = None):
+        """
+        初始化后台告警发布器
+
+        Args:
+            queue_size: 内存队列容量，队列满时新消息被丢弃并计数
+            batch_size: 单批发布的最大消息数
+            spool_file: 磁盘缓存文件路径（JSON Lines，仅追加写）
+            backoff_min: 重连退避初始间隔（秒）
+            backoff_max: 重连退避最大间隔（秒）
+            producer: RabbitMQ生产者，默认创建启用发布确认的独立连接
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.spool_file = spool_file
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.producer = producer or RabbitMQProducer(confirm=True)
+
+        self._thread = None
+        # 保护后台线程的启动以及统计信息（统计信息由调用方线程与后台发布线程共同修改）
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        # 重连退避状态
+        self._backoff = backoff_min
+        self._next_connect_time = 0.0
+
+        # 统计信息
+        self.stats = {"enqueued": 0, "published": 0, "spooled": 0, "replayed": 0, "dropped": 0}
+
+    def start(self):
+        """启动后台发布线程（首次入队时自动调用）"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="alarm-publisher", daemon=True)
+                self._thread.start()
+
+    def _count(self, key: str, n: int = 1):
+        """累加统计信息"""
+        with self._lock:
+            self.stats[key] += n
+
+    def publish(self, message: Dict[str, Any]) -> bool:
+        """
+        非阻塞地提交一条告警消息
+
+        Args:
+            message: 告警消息字典
+
+        Returns:
+            bool: 是否成功入队（队列已满时返回False，消息被丢弃）
+        """
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(message)
+            self._count("enqueued")
+            return True
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+    def stop(self, timeout: float = 5.0):
+        """
+        停止后台线程，未发布的消息写入磁盘缓存，下次启动时重放
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._spool(self._drain(self.queue.qsize()))
+        self.producer.close()
+
+    def _drain(self, limit: int) -> List[str]:
+        """从内存队列中非阻塞地取出至多limit条消息并序列化"""
+        bodies = []
+        while len(bodies) < limit:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            bodies.append(serialize_message(message))
+        return bodies
+
+    def _next_batch(self, timeout: float = 1.0) -> List[str]:
+        """阻塞等待第一条消息，再非阻塞地凑满一批"""
+        try:
+            message = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        return [serialize_message(message)] + self._drain(self.batch_size - 1)
+
+    def _run(self):
+        """后台发布主循环"""
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+
+            if not self._ensure_connected():
+                # 消息队列不可达，消息落盘，避免内存队列积压
+                self._spool(batch)
+                continue
+
+            # 先重放磁盘缓存，保证消息顺序
+            if not self._replay_spool():
+                self._spool(batch)
+                continue
+
+            if batch:
+                published = self.producer.publish_batch(batch)
+                self._count("published", published)
+                if published < len(batch):
+                    self._spool(batch[published:])
+                    self._schedule_reconnect()
+
+    def _ensure_connected(self) -> bool:
+        """
+        确保与消息队列的连接可用，连接失败时按带抖动的指数退避安排下一次尝试
+
+        Returns:
+            bool: 当前是否已连接
+        """
+        producer = self.producer
+        if producer.connected and producer.connection and producer.connection.is_open:
+            return True
+        if time.monotonic() < self._next_connect_time:
+            return False
+        try:
+            producer._connect(retries=1)
+            self._backoff = self.backoff_min
+            return True
+        except Exception as e:
+            logger.warning(f"告警发布器连接RabbitMQ失败，{self._backoff:.1f}秒后重试: {str(e)}")
+            self._schedule_reconnect()
+            return False
+
+    def _schedule_reconnect(self):
+        """安排下一次重连时间并增大退避间隔"""
+        self._next_connect_time = time.monotonic() + self._backoff * random.uniform(0.5, 1.0)
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+
+    def _spool(self, bodies: List[str]):
+        """把消息追加写入磁盘缓存"""
+        if not bodies:
+            return
+        try:
+            with open(self.spool_file, "a", encoding="utf-8") as f:
+                f.write("\n".join(bodies) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._count("spooled", len(bodies))
+        except OSError as e:
+            self._count("dropped", len(bodies))
+            logger.error(f"写入告警磁盘缓存失败，丢弃 {len(bodies)} 条消息: {str(e)}")
+
+    def _replay_spool(self) -> bool:
+        """
+        按写入顺序重放磁盘缓存
+
+        Returns:
+            bool: 磁盘缓存是否已全部发布（无缓存时也返回True）
+        """
+        if not os.path.exists(self.spool_file) or os.path.getsize(self.spool_file) == 0:
+            return True
+
+        with open(self.spool_file, "r", encoding="utf-8") as f:
+            bodies = [line.rstrip("\n") for line in f if line.strip()]
+
+        logger.info(f"开始重放告警磁盘缓存，共 {len(bodies)} 条消息")
+        published = 0
+        for i in range(0, len(bodies), self.batch_size):
+            chunk = bodies[i:i + self.batch_size]
+            n = self.producer.publish_batch(chunk)
+            published += n
+            if n < len(chunk):
+                break
+
+        self._count("replayed", published)
+        remaining = bodies[published:]
+
+        # 原子替换：先写临时文件再覆盖，避免重放中途异常导致缓存损坏
+        tmp_file = self.spool_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            if remaining:
+                f.write("\n".join(remaining) + "\n")
+        os.replace(tmp_file, self.spool_file)
+
+        if remaining:
+            self._schedule_reconnect()
+            return False
+        logger.info("告警磁盘缓存重放完成")
+        return True
+
+
+# 创建全局后台告警发布器实例，进程退出时把未发布的消息写入磁盘缓存
+alarm_publisher = AlarmPublisher()
+atexit.register(alarm_publisher.stop)
@@ -0,0 +1,528 @@
+"""
+告警存储服务
+基于SQLite（WAL模式）的本地告警库：告警流水线只做非阻塞入队，由后台线程按批次在单个事务中写入；
+按 (摄像头, 场景, 时间) 建立复合索引，查询按摄像头/场景分别走索引范围扫描后归并，
+使用键集分页（游标）代替OFFSET，百万级数据的时间范围查询保持在毫秒级
+"""
+
+import atexit
+import base64
+import heapq
+import json
+import queue
+import sqlite3
+import threading
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from ..config.settings import (
+    ALARM_DB_FILE,
+    ALARM_STORE_QUEUE_SIZE,
+    ALARM_STORE_BATCH_SIZE,
+    ALARM_STORE_FLUSH_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 告警记录字段（与表结构的列顺序一致，不含自增主键）
+COLUMNS = ("code", "camera_id", "scene_type", "alarm_time", "event", "incident_id",
+           "sub_type", "level", "memo", "image", "position", "ext1")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alarms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code TEXT NOT NULL,
+    camera_id TEXT NOT NULL,
+    scene_type TEXT NOT NULL,
+    alarm_time TEXT NOT NULL,
+    event TEXT,
+    incident_id TEXT,
+    sub_type TEXT,
+    level TEXT,
+    memo TEXT,
+    image TEXT,
+    position TEXT,
+    ext1 TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_alarms_code ON alarms (code);
+CREATE INDEX IF NOT EXISTS idx_alarms_camera_scene_time ON alarms (camera_id, scene_type, alarm_time, id);
+CREATE INDEX IF NOT EXISTS idx_alarms_time ON alarms (alarm_time, id);
+CREATE TABLE IF NOT EXISTS alarm_daily_counts (
+    camera_id TEXT NOT NULL,
+    scene_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (camera_id, scene_type, day)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_alarms_daily_count AFTER INSERT ON alarms BEGIN
+    INSERT INTO alarm_daily_counts (camera_id, scene_type, day, n)
+    VALUES (NEW.camera_id, NEW.scene_type, substr(NEW.alarm_time, 1, 10), 1)
+    ON CONFLICT (camera_id, scene_type, day) DO UPDATE SET n = n + 1;
+END;
+"""
+
+# 聚合统计支持的分组方式 {分组名: 告警表上的SQL表达式}
+GROUP_BY = {
+    "camera_id": "camera_id",
+    "scene_type": "scene_type",
+    "day": "substr(alarm_time, 1, 10)",
+    "hour": "substr(alarm_time, 1, 13)"
+}
+
+# 按天汇总表支持的分组方式（按小时分组只能在告警表上统计）
+DAILY_GROUP_BY = {
+    "camera_id": "camera_id",
+    "scene_type": "scene_type",
+    "day": "day"
+}
+
+
+def normalize_time(value) -> Optional[str]:
+    """
+    把时间统一为 "YYYY-MM-DD HH:MM:SS" 字符串（该格式按字典序比较即按时间比较）
+
+    Args:
+        value: datetime、ISO格式字符串或 "YYYY-MM-DD HH:MM:SS" 字符串
+
+    Returns:
+        Optional[str]: 标准化后的时间字符串，输入为空时返回None
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).strftime(TIME_FORMAT)
+
+
+def parse_ext(message: Dict[str, Any]) -> Dict[str, Any]:
+    """解析告警消息的ext1扩展字段，无法解析时返回空字典"""
+    ext1 = message.get("ext1")
+    try:
+        ext = json.loads(ext1) if isinstance(ext1, str) and ext1 else {}
+    except ValueError:
+        return {}
+    return ext if isinstance(ext, dict) else {}
+
+
+def scene_type_of(message: Dict[str, Any], ext: Optional[Dict[str, Any]] = None) -> str:
+    """
+    获取告警消息的场景类型
+
+    告警合并引擎产生的告警在ext1中携带scene_type，也可以直接在消息中提供sceneType
+    """
+    if message.get("sceneType"):
+        return message["sceneType"]
+    return (parse_ext(message) if ext is None else ext).get("scene_type") or "unknown"
+
+
+def _shift_day(day: str, days: int) -> str:
+    """把 "YYYY-MM-DD" 日期前后移动若干天"""
+    return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def encode_cursor(alarm_time: str, alarm_id: int) -> str:
+    """把分页位置编码为不透明游标"""
+    return base64.urlsafe_b64encode(f"{alarm_time}|{alarm_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """解析分页游标"""
+    alarm_time, alarm_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+    return alarm_time, int(alarm_id)
+
+
+class AlarmStore:
+    """SQLite告警库"""
+
+    def __init__(self,
+                 db_file: str = ALARM_DB_FILE,
+                 queue_size: int = ALARM_STORE_QUEUE_SIZE,
+                 batch_size: int = ALARM_STORE_BATCH_SIZE,
+                 flush_interval: float = ALARM_STORE_FLUSH_INTERVAL):
+        """
+        初始化告警库
+
+        Args:
+            db_file: SQLite数据库文件路径
+            queue_size: 待写入队列容量，队列满时新告警被丢弃并计数
+            batch_size: 单个事务写入的最大告警数
+            flush_interval: 未凑满一批时的最长等待时间（秒）
+        """
+        self.db_file = db_file
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # 每个线程使用独立连接，WAL模式下读写互不阻塞
+        self._local = threading.local()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+        # 统计信息
+        self.stats = {"enqueued": 0, "written": 0, "batches": 0, "dropped": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def start(self):
+        """启动后台写入线程（首次入队时自动调用）"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="alarm-store", daemon=True)
+                self._thread.start()
+
+    def add(self, message: Dict[str, Any]) -> bool:
+        """
+        非阻塞地提交一条告警消息等待写入
+
+        Args:
+            message: 告警消息字典（与发送到RabbitMQ的告警消息格式相同）
+
+        Returns:
+            bool: 是否成功入队（队列已满时返回False，告警不入库）
+        """
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(message)
+            self.stats["enqueued"] += 1
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+    def flush(self):
+        """等待已提交的告警全部写入"""
+        if self._thread is not None:
+            self.queue.join()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        写完已提交的告警后停止后台线程
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """后台写入主循环：阻塞等待第一条告警，再在flush_interval内凑满一批"""
+        while not (self._stop_event.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.insert_many(batch)
+            except Exception as e:
+                self.stats["dropped"] += len(batch)
+                logger.error(f"写入告警库失败，丢弃 {len(batch)} 条告警: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    @staticmethod
+    def to_row(message: Dict[str, Any]) -> Tuple:
+        """
+        把告警消息转换为表记录
+
+        场景类型、事件类型和事件ID从ext1中读取（告警合并引擎产生的告警均携带这些字段），
+        也可以直接在消息中提供sceneType
+        """
+        ext = parse_ext(message)
+
+        return (
+            message.get("code") or str(uuid.uuid4()),
+            message.get("deviceCode") or "",
+            scene_type_of(message, ext),
+            normalize_time(message.get("alarmTime")) or datetime.now().strftime(TIME_FORMAT),
+            ext.get("event"),
+            ext.get("incident_id"),
+            message.get("subType"),
+            message.get("level"),
+            message.get("memo"),
+            message.get("image"),
+            message.get("position"),
+            message.get("ext1")
+        )
+
+    def insert_many(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """
+        在单个事务中同步写入一批告警（code重复的告警被忽略，重放时不会重复入库）
+
+        Args:
+            messages: 告警消息列表
+
+        Returns:
+            int: 实际写入的告警数
+        """
+        rows = [self.to_row(m) for m in messages]
+        if not rows:
+            return 0
+        conn = self._connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO alarms ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+            # total_changes 同时包含触发器对按天汇总表的修改，每条新告警对应两次修改
+            written = (conn.total_changes - before) // 2
+        self.stats["written"] += written
+        self.stats["batches"] += 1
+        return written
+
+    def _streams(self, camera_ids: Optional[List[str]], scene_type: Optional[str]) -> Optional[List[Tuple[str, str]]]:
+        """
+        确定需要扫描的 (摄像头, 场景) 组合，每个组合对应复合索引上的一段连续区间
+
+        Returns:
+            Optional[List[Tuple[str, str]]]: 组合列表，未指定摄像头时返回None（改用时间索引）
+        """
+        if not camera_ids:
+            return None
+        if scene_type:
+            return [(camera_id, scene_type) for camera_id in dict.fromkeys(camera_ids)]
+        # 按天汇总表很小，用于找出这些摄像头出现过的场景
+        placeholders = ", ".join("?" * len(camera_ids))
+        rows = self._connection().execute(
+            f"SELECT DISTINCT camera_id, scene_type FROM alarm_daily_counts WHERE camera_id IN ({placeholders})",
+            list(camera_ids)
+        ).fetchall()
+        return [(row["camera_id"], row["scene_type"]) for row in rows]
+
+    @staticmethod
+    def _time_conditions(start_time: Optional[str], end_time: Optional[str],
+                         cursor: Optional[Tuple[str, int]]) -> Tuple[str, List[Any]]:
+        """构建时间范围和游标条件"""
+        conditions, params = [], []
+        if start_time:
+            conditions.append("alarm_time >= ?")
+            params.append(start_time)
+        if end_time:
+            conditions.append("alarm_time <= ?")
+            params.append(end_time)
+        if cursor:
+            conditions.append("(alarm_time < ? OR (alarm_time = ? AND id < ?))")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+        return "".join(f" AND {c}" for c in conditions), params
+
+    def query(self,
+              camera_ids: Optional[List[str]] = None,
+              scene_type: Optional[str] = None,
+              start_time=None,
+              end_time=None,
+              limit: int = 100,
+              cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        按时间倒序分页查询告警
+
+        Args:
+            camera_ids: 摄像头ID列表，为空表示全部摄像头
+            scene_type: 场景类型，为空表示全部场景
+            start_time: 开始时间（包含）
+            end_time: 结束时间（包含）
+            limit: 每页条数
+            cursor: 上一页返回的游标，为空表示第一页
+
+        Returns:
+            tuple: (告警列表, 下一页游标；没有更多数据时为None)
+        """
+        start_time, end_time = normalize_time(start_time), normalize_time(end_time)
+        position = decode_cursor(cursor) if cursor else None
+        where, params = self._time_conditions(start_time, end_time, position)
+        conn = self._connection()
+        # 多取一条用于判断是否还有下一页
+        fetch = limit + 1
+
+        streams = self._streams(camera_ids, scene_type)
+        if streams is None or self._prefer_time_scan(camera_ids, scene_type, streams, start_time, end_time):
+            # 沿时间索引倒序扫描并过滤，取到一页即停止
+            conditions, filter_params = "", []
+            if camera_ids:
+                conditions += f" AND camera_id IN ({', '.join('?' * len(camera_ids))})"
+                filter_params.extend(dict.fromkeys(camera_ids))
+            if scene_type:
+                conditions += " AND scene_type = ?"
+                filter_params.append(scene_type)
+            rows = conn.execute(
+                f"SELECT * FROM alarms INDEXED BY idx_alarms_time WHERE 1 = 1{conditions}{where} "
+                f"ORDER BY alarm_time DESC, id DESC LIMIT ?",
+                filter_params + params + [fetch]
+            ).fetchall()
+        else:
+            # 每个 (摄像头, 场景) 在复合索引上各取至多 limit+1 个 (时间, id)（覆盖索引，无需回表），
+            # 归并后只回表读取最终一页的记录，避免对整个范围排序
+            sql = (f"SELECT alarm_time, id FROM alarms WHERE camera_id = ? AND scene_type = ?{where} "
+                   f"ORDER BY alarm_time DESC, id DESC LIMIT ?")
+            parts = [conn.execute(sql, [camera_id, scene] + params + [fetch]).fetchall()
+                     for camera_id, scene in streams]
+            keys = [tuple(key) for _, key in zip(range(fetch), heapq.merge(*parts, key=tuple, reverse=True))]
+            ids = [key[1] for key in keys]
+            by_id = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                for row in conn.execute(f"SELECT * FROM alarms WHERE id IN ({', '.join('?' * len(chunk))})", chunk):
+                    by_id[row["id"]] = row
+            rows = [by_id[alarm_id] for alarm_id in ids]
+
+        alarms = [self._to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last["alarm_time"], last["id"])
+        return alarms, next_cursor
+
+    def _prefer_time_scan(self, camera_ids: List[str], scene_type: Optional[str], streams: List[Tuple[str, str]],
+                          start_time: Optional[str], end_time: Optional[str]) -> bool:
+        """
+        根据按天汇总表估算选择率，决定分页查询的执行方式
+
+        归并方式需要在每个 (摄像头, 场景) 上各读取一页；沿时间索引扫描平均需要读取 一页/选择率 条记录。
+        选中的告警占范围内全部告警的比例超过 1/组合数 时，沿时间索引扫描读取的记录更少
+        """
+        if len(streams) <= 1:
+            return False
+        first_day = start_time[:10] if start_time else None
+        last_day = end_time[:10] if end_time else None
+        selected = self._count_days(camera_ids, scene_type, first_day, last_day, None)[0][1]
+        total = self._count_days(None, None, first_day, last_day, None)[0][1]
+        return selected * len(streams) > total
+
+    def count(self,
+              camera_ids: Optional[List[str]] = None,
+              scene_type: Optional[str] = None,
+              start_time=None,
+              end_time=None,
+              group_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        统计告警数量
+
+        时间范围内的整天从按天汇总表读取，只有首尾不完整的两天在告警表的索引上计数，
+        统计耗时与告警总量无关
+
+        Args:
+            camera_ids: 摄像头ID列表，为空表示全部摄像头
+            scene_type: 场景类型，为空表示全部场景
+            start_time: 开始时间（包含）
+            end_time: 结束时间（包含）
+            group_by: 分组方式（camera_id/scene_type/day/hour），为空只统计总数
+
+        Returns:
+            Dict[str, Any]: {"total": 总数, "groups": {分组值: 数量}}（未分组时没有groups）
+        """
+        if group_by is not None and group_by not in GROUP_BY:
+            raise ValueError(f"不支持的分组方式: {group_by}")
+
+        start_time, end_time = normalize_time(start_time), normalize_time(end_time)
+        streams = self._streams(camera_ids, scene_type)
+
+        # 范围内完整覆盖的第一天和最后一天（None表示不限）
+        first_day = start_time and (start_time[:10] if start_time[11:] == "00:00:00"
+                                    else _shift_day(start_time[:10], 1))
+        last_day = end_time and (end_time[:10] if end_time[11:] == "23:59:59"
+                                 else _shift_day(end_time[:10], -1))
+
+        if group_by == "hour" or (first_day and last_day and first_day > last_day):
+            parts = [self._count_range(streams, scene_type, start_time, end_time, group_by)]
+        else:
+            parts = [self._count_days(camera_ids, scene_type, first_day, last_day, group_by)]
+            if start_time and start_time < f"{first_day} 00:00:00":
+                parts.append(self._count_range(streams, scene_type, start_time,
+                                               f"{_shift_day(first_day, -1)} 23:59:59", group_by))
+            if end_time and end_time > f"{last_day} 23:59:59":
+                parts.append(self._count_range(streams, scene_type,
+                                               f"{_shift_day(last_day, 1)} 00:00:00", end_time, group_by))
+
+        total, groups = 0, {}
+        for rows in parts:
+            for grp, n in rows:
+                total += n
+                if group_by and n:
+                    groups[grp] = groups.get(grp, 0) + n
+
+        result = {"total": total}
+        if group_by:
+            result["groups"] = dict(sorted(groups.items()))
+        return result
+
+    def _count_days(self, camera_ids: Optional[List[str]], scene_type: Optional[str],
+                    first_day: Optional[str], last_day: Optional[str], group_by: Optional[str]) -> List[Tuple]:
+        """在按天汇总表上统计整天的告警数量"""
+        conditions, params = [], []
+        if camera_ids:
+            conditions.append(f"camera_id IN ({', '.join('?' * len(camera_ids))})")
+            params.extend(dict.fromkeys(camera_ids))
+        if scene_type:
+            conditions.append("scene_type = ?")
+            params.append(scene_type)
+        if first_day:
+            conditions.append("day >= ?")
+            params.append(first_day)
+        if last_day:
+            conditions.append("day <= ?")
+            params.append(last_day)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        if group_by:
+            sql = f"SELECT {DAILY_GROUP_BY[group_by]}, SUM(n) FROM alarm_daily_counts{where} GROUP BY 1"
+        else:
+            sql = f"SELECT NULL, COALESCE(SUM(n), 0) FROM alarm_daily_counts{where}"
+        return self._connection().execute(sql, params).fetchall()
+
+    def _count_range(self, streams: Optional[List[Tuple[str, str]]], scene_type: Optional[str],
+                     start_time: Optional[str], end_time: Optional[str], group_by: Optional[str]) -> List[Tuple]:
+        """在告警表的索引上统计时间范围内的告警数量"""
+        where, params = self._time_conditions(start_time, end_time, None)
+        select = f"{GROUP_BY[group_by]}, COUNT(*)" if group_by else "NULL, COUNT(*)"
+        group = " GROUP BY 1" if group_by else ""
+        conn = self._connection()
+
+        if streams is None:
+            scene_where = " AND scene_type = ?" if scene_type else ""
+            scene_params = [scene_type] if scene_type else []
+            return conn.execute(f"SELECT {select} FROM alarms WHERE 1 = 1{scene_where}{where}{group}",
+                                scene_params + params).fetchall()
+
+        # 每个 (摄像头, 场景) 的计数都只在复合索引上完成（覆盖索引，无需回表）
+        sql = f"SELECT {select} FROM alarms WHERE camera_id = ? AND scene_type = ?{where}{group}"
+        rows = []
+        for camera_id, scene in streams:
+            rows.extend(conn.execute(sql, [camera_id, scene] + params).fetchall())
+        return rows
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """把表记录转换为告警字典"""
+        alarm = dict(row)
+        alarm["timestamp"] = alarm.pop("alarm_time")
+        return alarm
+
+
+# 创建全局告警库实例，进程退出时写完已提交的告警
+alarm_store = AlarmStore()
+atexit.register(alarm_store.stop)
@@ -1,49 +1,468 @@
 """
 摄像头服务层
 处理摄像头相关的业务逻辑
+
+摄像头注册表以摄像头ID为键保存在字典中，并按场景、位置建立二级索引，所有查询均为O(1)；
+修改只标记为待保存，由后台线程合并一段时间内的修改后原子地写回配置文件（写后持久化）
+
+各摄像头的场景配置（ROI、阈值、检测间隔、是否启用）支持热更新：通过接口修改或直接编辑配置文件后，
+配置版本号递增，运行中的视频流在每帧开始时比较版本号，在下一个帧边界整体换用新配置，
+解码连接、模型和跟踪器状态均保持不变
 """
 
+import atexit
 import os
 import json
-from typing import List, Dict, Any, Optional
-from ..config.settings import UPLOAD_DIR, PROCESSED_DIR
-from ..algorithms import VideoProcessingCoordinator
+import threading
+import logging
+from typing import List, Dict, Any, Optional, Set
+from ..config.settings import (
+    UPLOAD_DIR,
+    PROCESSED_DIR,
+    CAMERA_CONFIG_FILE,
+    CAMERA_SAVE_INTERVAL,
+    CAMERA_CONFIG_WATCH_INTERVAL,
+    DEFAULT_LOITERING_THRESHOLD,
+    DEFAULT_LEAVE_THRESHOLD,
+    DEFAULT_GATHER_THRESHOLD,
+    DEFAULT_BANNER_CONFIDENCE_THRESHOLD,
+    DEFAULT_BANNER_IOU_THRESHOLD,
+    DEFAULT_PERSON_ROI
+)
+from .capture_supervisor import capture_supervisor
+
+logger = logging.getLogger(__name__)
+
+# 支持的场景类型
+SCENE_TYPES = ("loitering", "leave", "gather", "banner")
+
+# 各场景可热更新的配置项及默认值（enabled: 是否执行检测；stride: 每隔多少帧执行一次检测）
+SCENARIO_CONFIG_DEFAULTS = {
+    "loitering": {"enabled": True, "stride": 1, "time_threshold": DEFAULT_LOITERING_THRESHOLD},
+    "leave": {"enabled": True, "stride": 1, "roi": None, "threshold": DEFAULT_LEAVE_THRESHOLD},
+    "gather": {"enabled": True, "stride": 1, "roi": None, "threshold": DEFAULT_GATHER_THRESHOLD},
+    "banner": {"enabled": True, "stride": 1, "conf_threshold": DEFAULT_BANNER_CONFIDENCE_THRESHOLD,
+               "iou_threshold": DEFAULT_BANNER_IOU_THRESHOLD}
+}
+
+
+def _normalize_config_value(key: str, value: Any) -> Any:
+    """校验并规范化一个场景配置项，非法时抛出ValueError"""
+    if value is None:
+        return None
+    if key == "enabled":
+        if not isinstance(value, bool):
+            raise ValueError("enabled 必须为布尔值")
+        return value
+    if key == "stride":
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError("stride 必须为正整数")
+        return value
+    if key == "roi":
+        try:
+            roi = [(int(point[0]), int(point[1])) for point in value]
+        except (TypeError, ValueError, IndexError):
+            raise ValueError("roi 格式应为 [[x1, y1], [x2, y2], ...]")
+        if len(roi) < 3:
+            raise ValueError("roi 至少需要3个顶点")
+        return roi
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{key} 必须为非负数")
+    if key in ("conf_threshold", "iou_threshold") and value > 1:
+        raise ValueError(f"{key} 取值范围为 0~1")
+    return value
+
+
+class ScenarioConfigSubscription:
+    """运行中的视频流对摄像头场景配置的订阅"""
+
+    def __init__(self, service: "CameraService", camera_id: str, scenario: str,
+                 overrides: Optional[Dict[str, Any]] = None):
+        """
+        初始化配置订阅
+
+        Args:
+            service: 摄像头服务
+            camera_id: 摄像头ID
+            scenario: 场景类型
+            overrides: 视频流请求参数中指定的配置，优先于已保存的配置，之后被修改的配置项以新值为准
+        """
+        self.service = service
+        self.camera_id = camera_id
+        self.scenario = scenario
+        self.version = service.config_version(camera_id)
+        self.stored = service.get_scenario_config(camera_id, scenario)
+        # 当前生效的配置，每次变更整体替换，处理循环在一帧内始终使用同一份
+        self.config = {**self.stored, **{k: v for k, v in (overrides or {}).items() if v is not None}}
+
+    def poll(self) -> Set[str]:
+        """
+        在帧边界检查配置变更（版本号未变时只做一次整数比较）
+
+        Returns:
+            Set[str]: 本次生效的变更配置项，没有变更时为空集合
+        """
+        if self.service.config_versions.get(self.camera_id, 0) == self.version:
+            return set()
+        with self.service._lock:
+            version = self.service.config_version(self.camera_id)
+            stored = self.service.get_scenario_config(self.camera_id, self.scenario)
+        changed = {key for key, value in stored.items() if self.stored.get(key) != value}
+        if changed:
+            self.config = {**self.config, **{key: stored[key] for key in changed}}
+        self.stored, self.version = stored, version
+        return changed
 
 
 class CameraService:
     """摄像头服务类"""
 
-    def __init__(self):
-        """初始化摄像头服务"""
-        self.cameras_data = []
-        self.camera_scene_mapping = {}
-        self.camera_device_mapping = {}
+    def __init__(self, config_file: str = CAMERA_CONFIG_FILE, save_interval: float = CAMERA_SAVE_INTERVAL,
+                 watch_interval: float = CAMERA_CONFIG_WATCH_INTERVAL):
+        """
+        初始化摄像头服务
+
+        Args:
+            config_file: 摄像头配置文件路径
+            save_interval: 写后持久化的合并间隔（秒），该时间内的多次修改只写一次文件
+            watch_interval: 配置文件变更检查间隔（秒）
+        """
+        self.config_file = config_file
+        self.save_interval = save_interval
+        self.watch_interval = watch_interval
+
+        # 摄像头注册表 {摄像头ID: 摄像头信息}，保持注册顺序
+        self.cameras: Dict[str, Dict[str, Any]] = {}
+        self.camera_scene_mapping: Dict[str, str] = {}
+        self.camera_device_mapping: Dict[str, Any] = {}
+        # 二级索引 {场景类型/位置: {摄像头ID: 摄像头信息}}
+        self.scene_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.location_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # 场景配置 {摄像头ID: {场景类型: 与默认值不同的配置项}}，按摄像头整体替换
+        self.scenario_configs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # 场景配置版本号 {摄像头ID: 版本号}，配置变更时递增
+        self.config_versions: Dict[str, int] = {}
+
+        self._lock = threading.RLock()
+        # 修改版本号与已保存的版本号，不一致时表示有待保存的修改
+        self._version = 0
+        self._saved_version = 0
+        self._save_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        # 配置文件签名（修改时间, 大小），用于识别外部修改；自身写入后同步更新
+        self._file_signature = None
+        self._watch_thread = None
+
         self.initialize_cameras()
 
     def initialize_cameras(self):
         """
-        初始化摄像头数据（在真实项目中，这应该从数据库加载）
+        从配置文件加载摄像头数据并建立索引
         """
-        # 检查是否存在摄像头配置文件
-        config_file = os.path.join(os.path.dirname(__file__), "..", "config", "cameras.json")
-        if os.path.exists(config_file):
+        config = {}
+        signature = self._config_file_signature()
+        if signature is not None:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.cameras_data = config.get("cameras", [])
-                    self.camera_scene_mapping = config.get("camera_scenes", {})
-                    self.camera_device_mapping = config.get("camera_devices", {})
+                config = self._read_config_file()
             except Exception as e:
                 print(f"加载摄像头配置文件失败: {e}")
-                # 初始化为空列表和字典
-                self.cameras_data = []
-                self.camera_scene_mapping = {}
-                self.camera_device_mapping = {}
-        else:
-            # 如果配置文件不存在，初始化为空
-            self.cameras_data = []
-            self.camera_scene_mapping = {}
-            self.camera_device_mapping = {}
+                config = {}
+
+        with self._lock:
+            self._apply_config(config)
+            self._file_signature = signature
+
+    def _config_file_signature(self):
+        """配置文件的（修改时间, 大小），文件不存在时返回None"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_config_file(self) -> Dict[str, Any]:
+        """读取并校验配置文件"""
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        scenario_configs = {}
+        for camera_id, scenarios in (config.get("camera_configs") or {}).items():
+            scenario_configs[camera_id] = {
+                scenario: self._normalize_scenario_config(scenario, values)
+                for scenario, values in scenarios.items()
+            }
+        config["camera_configs"] = scenario_configs
+        return config
+
+    def _apply_config(self, config: Dict[str, Any]) -> Set[str]:
+        """
+        用配置文件内容替换注册表并重建索引（调用方需持有锁）
+
+        Returns:
+            Set[str]: 场景配置发生变化的摄像头ID（其配置版本号已递增）
+        """
+        cameras = config.get("cameras", [])
+        scenes = config.get("camera_scenes", {})
+        devices = config.get("camera_devices", {})
+        scenario_configs = config.get("camera_configs", {})
+
+        changed = {camera_id for camera_id in set(self.scenario_configs) | set(scenario_configs)
+                   if self.scenario_configs.get(camera_id) != scenario_configs.get(camera_id)}
+        self.scenario_configs = dict(scenario_configs)
+        for camera_id in changed:
+            self.config_versions[camera_id] = self.config_versions.get(camera_id, 0) + 1
+
+        self.cameras = {cam["id"]: cam for cam in cameras}
+        self.camera_scene_mapping = dict(scenes)
+        self.camera_device_mapping = dict(devices)
+        self.scene_index = {}
+        self.location_index = {}
+        for camera_id, camera in self.cameras.items():
+            self._index_location(camera)
+            if camera_id in self.camera_scene_mapping:
+                self.scene_index.setdefault(self.camera_scene_mapping[camera_id], {})[camera_id] = camera
+        self._saved_version = self._version
+        return changed
+
+    def _index_location(self, camera: Dict[str, Any]):
+        """把摄像头加入位置索引"""
+        self.location_index.setdefault(camera.get("location") or "", {})[camera["id"]] = camera
+
+    @staticmethod
+    def _unindex(index: Dict[str, Dict[str, Dict[str, Any]]], value: Any, camera_id: str):
+        """从二级索引中移除摄像头，空的索引项一并删除"""
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(camera_id, None)
+            if not bucket:
+                del index[value]
+
+    def _require_camera(self, camera_id: str) -> Dict[str, Any]:
+        """获取摄像头，不存在时抛出ValueError"""
+        camera = self.cameras.get(camera_id)
+        if camera is None:
+            raise ValueError("摄像头未找到")
+        return camera
+
+    def _mark_dirty(self):
+        """标记注册表已修改，由后台线程合并后写回配置文件（调用方需持有锁）"""
+        self._version += 1
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="camera-registry-saver", daemon=True)
+            self._thread.start()
+        self._dirty.set()
+
+    def _run(self):
+        """后台写回主循环"""
+        while not self._stop_event.is_set():
+            self._dirty.wait()
+            if self._stop_event.is_set():
+                break
+            # 等待合并间隔，期间的后续修改随本次一并写入
+            self._stop_event.wait(self.save_interval)
+            self._dirty.clear()
+            try:
+                self.save_camera_config()
+            except Exception as e:
+                logger.error(f"保存摄像头配置失败: {str(e)}")
+
+    def save_camera_config(self) -> bool:
+        """
+        立即把注册表原子地写回配置文件（先写临时文件再替换，不会留下写了一半的配置）
+
+        Returns:
+            bool: 是否写入了文件（没有待保存的修改时返回False）
+        """
+        with self._save_lock:
+            with self._lock:
+                if self._version == self._saved_version:
+                    return False
+                version = self._version
+                config = {
+                    "cameras": [dict(cam) for cam in self.cameras.values()],
+                    "camera_scenes": dict(self.camera_scene_mapping),
+                    "camera_devices": dict(self.camera_device_mapping),
+                    "camera_configs": {camera_id: dict(scenarios) for camera_id, scenarios in self.scenario_configs.items()}
+                }
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.config_file)), exist_ok=True)
+            tmp_file = f"{self.config_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            # 记录自身写入后的文件签名，配置文件监视不会把它当作外部修改
+            self._file_signature = self._config_file_signature()
+
+            with self._lock:
+                self._saved_version = version
+            return True
+
+    def flush(self):
+        """立即写入所有待保存的修改"""
+        self.save_camera_config()
+
+    def reload_config(self) -> List[str]:
+        """
+        从配置文件重新加载注册表与场景配置（配置文件被外部修改时调用）
+
+        文件内容优先：尚未写回的修改会被文件内容覆盖；文件无法解析时保留当前配置
+
+        Returns:
+            List[str]: 场景配置发生变化的摄像头ID，运行中的视频流会在下一帧换用新配置
+        """
+        with self._save_lock:
+            signature = self._config_file_signature()
+            if signature is None:
+                return []
+            try:
+                config = self._read_config_file()
+            except Exception as e:
+                logger.error(f"重新加载摄像头配置文件失败，保留当前配置: {str(e)}")
+                self._file_signature = signature
+                return []
+            with self._lock:
+                if self._version != self._saved_version:
+                    logger.warning("摄像头配置文件已被外部修改，尚未写回的修改以文件内容为准")
+                changed = self._apply_config(config)
+                self._file_signature = signature
+        if changed:
+            logger.info(f"摄像头配置文件已重新加载，场景配置变更的摄像头: {sorted(changed)}")
+        return sorted(changed)
+
+    def start_watching(self):
+        """启动配置文件监视线程（首个视频流订阅配置时自动调用）"""
+        with self._lock:
+            if self._watch_thread is None or not self._watch_thread.is_alive():
+                self._watch_thread = threading.Thread(target=self._watch, name="camera-config-watcher", daemon=True)
+                self._watch_thread.start()
+
+    def _watch(self):
+        """配置文件监视主循环：按修改时间和大小识别外部修改"""
+        while not self._stop_event.wait(self.watch_interval):
+            try:
+                if self._config_file_signature() != self._file_signature:
+                    self.reload_config()
+            except Exception as e:
+                logger.error(f"检查摄像头配置文件失败: {str(e)}")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        停止后台写回线程并写入剩余的修改
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        self._stop_event.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout)
+            self._watch_thread = None
+        self.save_camera_config()
+
+    @staticmethod
+    def _normalize_scenario_config(scenario: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """校验场景配置，返回规范化后的配置项，非法时抛出ValueError"""
+        if scenario not in SCENARIO_CONFIG_DEFAULTS:
+            raise ValueError(f"不支持的场景类型: {scenario}")
+        unknown = set(values) - set(SCENARIO_CONFIG_DEFAULTS[scenario])
+        if unknown:
+            raise ValueError(f"场景 {scenario} 不支持的配置项: {', '.join(sorted(unknown))}")
+        return {key: _normalize_config_value(key, value) for key, value in values.items()}
+
+    def config_version(self, camera_id: str) -> int:
+        """获取摄像头场景配置的版本号"""
+        return self.config_versions.get(camera_id, 0)
+
+    def get_scenario_config(self, camera_id: str, scenario: str) -> Dict[str, Any]:
+        """
+        获取摄像头某个场景的生效配置（默认值叠加已保存的配置）
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型
+
+        Returns:
+            Dict[str, Any]: 场景配置
+        """
+        if scenario not in SCENARIO_CONFIG_DEFAULTS:
+            raise ValueError(f"不支持的场景类型: {scenario}")
+        return {**SCENARIO_CONFIG_DEFAULTS[scenario], **self.scenario_configs.get(camera_id, {}).get(scenario, {})}
+
+    def get_camera_config(self, camera_id: str) -> Dict[str, Any]:
+        """
+        获取摄像头所有场景的生效配置
+
+        Args:
+            camera_id: 摄像头ID
+
+        Returns:
+            Dict[str, Any]: 配置版本号与各场景配置
+        """
+        with self._lock:
+            return {
+                "camera_id": camera_id,
+                "version": self.config_version(camera_id),
+                "scenarios": {scenario: self.get_scenario_config(camera_id, scenario) for scenario in SCENE_TYPES}
+            }
+
+    def update_scenario_config(self, camera_id: str, scenario: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        修改摄像头某个场景的配置，运行中的视频流在下一帧整体换用新配置
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型
+            changes: 要修改的配置项，值为None表示恢复默认值
+
+        Returns:
+            Dict[str, Any]: 修改结果与新的场景配置
+        """
+        changes = self._normalize_scenario_config(scenario, changes)
+        with self._lock:
+            self._require_camera(camera_id)
+            scenarios = self.scenario_configs.get(camera_id, {})
+            values = {**scenarios.get(scenario, {}), **changes}
+            values = {key: value for key, value in values.items()
+                      if value is not None and value != SCENARIO_CONFIG_DEFAULTS[scenario][key]}
+            if values != scenarios.get(scenario, {}):
+                # 整体替换该摄像头的配置，读取方不会看到修改了一半的配置
+                scenarios = {**scenarios, scenario: values}
+                self.scenario_configs[camera_id] = {k: v for k, v in scenarios.items() if v}
+                if not self.scenario_configs[camera_id]:
+                    del self.scenario_configs[camera_id]
+                self.config_versions[camera_id] = self.config_version(camera_id) + 1
+                self._mark_dirty()
+            return {
+                "message": f"摄像头 {camera_id} 的 {scenario} 场景配置已更新",
+                "camera_id": camera_id,
+                "scenario": scenario,
+                "version": self.config_version(camera_id),
+                "config": self.get_scenario_config(camera_id, scenario)
+            }
+
+    def subscribe_config(self, camera_id: str, scenario: str,
+                         overrides: Optional[Dict[str, Any]] = None) -> ScenarioConfigSubscription:
+        """
+        订阅摄像头场景配置（视频流处理循环启动时调用），并确保配置文件监视已启动
+
+        Args:
+            camera_id: 摄像头ID
+            scenario: 场景类型
+            overrides: 视频流请求参数中指定的配置
+
+        Returns:
+            ScenarioConfigSubscription: 配置订阅，处理循环在每帧开始时调用poll
+        """
+        self.start_watching()
+        with self._lock:
+            return ScenarioConfigSubscription(self, camera_id, scenario, overrides)
 
     def get_all_cameras(self) -> List[Dict[str, Any]]:
         """
@@ -52,7 +471,47 @@ class CameraService:
         Returns:
             List[Dict[str, Any]]: 摄像头列表
         """
-        return self.cameras_data
+        return list(self.cameras.values())
+
+    def get_camera(self, camera_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取指定摄像头
+
+        Args:
+            camera_id: 摄像头ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 摄像头信息，不存在时返回None
+        """
+        return self.cameras.get(camera_id)
+
+    def has_camera(self, camera_id: str) -> bool:
+        """判断摄像头是否已注册"""
+        return camera_id in self.cameras
+
+    def find_cameras(self, scene_type: Optional[str] = None, location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        按场景类型和/或位置查找摄像头（走二级索引）
+
+        Args:
+            scene_type: 场景类型，None表示不限
+            location: 位置，None表示不限
+
+        Returns:
+            List[Dict[str, Any]]: 符合条件的摄像头列表
+        """
+        with self._lock:
+            if scene_type is None and location is None:
+                return list(self.cameras.values())
+            if scene_type is None:
+                return list(self.location_index.get(location, {}).values())
+            by_scene = self.scene_index.get(scene_type, {})
+            if location is None:
+                return list(by_scene.values())
+            # 从较小的索引项出发，逐个检查另一个条件
+            by_location = self.location_index.get(location, {})
+            smaller, other = (by_scene, by_location) if len(by_scene) <= len(by_location) else (by_location, by_scene)
+            return [cam for camera_id, cam in smaller.items() if camera_id in other]
 
     def get_camera_scene(self, camera_id: str) -> Dict[str, Any]:
         """
@@ -81,20 +540,21 @@ class CameraService:
         Returns:
             Dict[str, Any]: 分配结果
         """
-        # 验证摄像头是否存在
-        camera_exists = any(cam["id"] == camera_id for cam in self.cameras_data)
-        if not camera_exists:
-            raise ValueError("摄像头未找到")
-
-        # 验证场景类型
-        if scene_type not in ["loitering", "leave", "gather", "banner"]:
-            raise ValueError("无效的场景类型")
-
-        # 分配场景
-        self.camera_scene_mapping[camera_id] = scene_type
-
-        # 在真实项目中，这里应该保存到数据库
-        # self.save_camera_config()
+        with self._lock:
+            # 验证摄像头是否存在
+            camera = self._require_camera(camera_id)
+
+            # 验证场景类型
+            if scene_type not in SCENE_TYPES:
+                raise ValueError("无效的场景类型")
+
+            # 分配场景并更新场景索引
+            old_scene = self.camera_scene_mapping.get(camera_id)
+            if old_scene is not None:
+                self._unindex(self.scene_index, old_scene, camera_id)
+            self.camera_scene_mapping[camera_id] = scene_type
+            self.scene_index.setdefault(scene_type, {})[camera_id] = camera
+            self._mark_dirty()
 
         return {"message": f"摄像头 {camera_id} 已成功分配到 {scene_type} 场景"}
 
@@ -109,11 +569,6 @@ class CameraService:
         Returns:
             Dict[str, Any]: 绑定结果
         """
-        # 验证摄像头是否存在
-        camera_exists = any(cam["id"] == camera_id for cam in self.cameras_data)
-        if not camera_exists:
-            raise ValueError("摄像头未找到")
-
         # 尝试解析设备源为数字
         try:
             device_source = int(device_source)
@@ -121,11 +576,13 @@ class CameraService:
             # 如果不是数字，则保持为字符串（如RTSP地址）
             pass
 
-        # 绑定设备
-        self.camera_device_mapping[camera_id] = device_source
+        with self._lock:
+            # 验证摄像头是否存在
+            self._require_camera(camera_id)
 
-        # 在真实项目中，这里应该保存到数据库
-        # self.save_camera_config()
+            # 绑定设备
+            self.camera_device_mapping[camera_id] = device_source
+            self._mark_dirty()
 
         return {"message": f"摄像头 {camera_id} 已成功绑定到设备源 {device_source}"}
 
@@ -139,20 +596,17 @@ class CameraService:
         Returns:
             Dict[str, Any]: 解绑结果
         """
-        # 验证摄像头是否存在
-        camera_exists = any(cam["id"] == camera_id for cam in self.cameras_data)
-        if not camera_exists:
-            raise ValueError("摄像头未找到")
+        with self._lock:
+            # 验证摄像头是否存在
+            self._require_camera(camera_id)
 
-        # 检查是否已绑定设备
-        if camera_id not in self.camera_device_mapping:
-            raise ValueError("摄像头未绑定任何设备")
-
-        # 解除绑定
-        removed_device = self.camera_device_mapping.pop(camera_id)
+            # 检查是否已绑定设备
+            if camera_id not in self.camera_device_mapping:
+                raise ValueError("摄像头未绑定任何设备")
 
-        # 在真实项目中，这里应该保存到数据库
-        # self.save_camera_config()
+            # 解除绑定
+            removed_device = self.camera_device_mapping.pop(camera_id)
+            self._mark_dirty()
 
         return {"message": f"摄像头 {camera_id} 已解除与设备 {removed_device} 的绑定"}
 
@@ -184,21 +638,21 @@ class CameraService:
         Returns:
             Dict[str, Any]: 添加结果
         """
-        # 检查摄像头ID是否已存在
-        if any(cam["id"] == camera_id for cam in self.cameras_data):
-            raise ValueError("摄像头ID已存在")
-
-        # 添加新摄像头
-        new_camera = {
-            "id": camera_id,
-            "name": name,
-            "location": location,
-            "status": "inactive"  # 初始状态为未激活
-        }
-        self.cameras_data.append(new_camera)
-
-        # 在真实项目中，这里应该保存到数据库
-        # self.save_camera_config()
+        with self._lock:
+            # 检查摄像头ID是否已存在
+            if camera_id in self.cameras:
+                raise ValueError("摄像头ID已存在")
+
+            # 添加新摄像头
+            new_camera = {
+                "id": camera_id,
+                "name": name,
+                "location": location,
+                "status": "inactive"  # 初始状态为未激活
+            }
+            self.cameras[camera_id] = new_camera
+            self._index_location(new_camera)
+            self._mark_dirty()
 
         return {"message": f"摄像头 {camera_id} 已成功添加", "camera": new_camera}
 
@@ -212,28 +666,25 @@ class CameraService:
         Returns:
             Dict[str, Any]: 删除结果
         """
-        # 查找要删除的摄像头
-        camera_index = None
-        for i, cam in enumerate(self.cameras_data):
-            if cam["id"] == camera_id:
-                camera_index = i
-                break
+        with self._lock:
+            if camera_id not in self.cameras:
+                raise ValueError("摄像头未找到")
 
-        if camera_index is None:
-            raise ValueError("摄像头未找到")
+            # 删除摄像头及其位置索引
+            removed_camera = self.cameras.pop(camera_id)
+            self._unindex(self.location_index, removed_camera.get("location") or "", camera_id)
 
-        # 删除摄像头
-        removed_camera = self.cameras_data.pop(camera_index)
+            # 同时删除相关的场景和设备映射
+            if camera_id in self.camera_scene_mapping:
+                self._unindex(self.scene_index, self.camera_scene_mapping.pop(camera_id), camera_id)
 
-        # 同时删除相关的场景和设备映射
-        if camera_id in self.camera_scene_mapping:
-            del self.camera_scene_mapping[camera_id]
+            if camera_id in self.camera_device_mapping:
+                del self.camera_device_mapping[camera_id]
 
-        if camera_id in self.camera_device_mapping:
-            del self.camera_device_mapping[camera_id]
+            if self.scenario_configs.pop(camera_id, None):
+                self.config_versions[camera_id] = self.config_version(camera_id) + 1
 
-        # 在真实项目中，这里应该保存到数据库
-        # self.save_camera_config()
+            self._mark_dirty()
 
         return {"message": f"摄像头 {camera_id} 已成功删除", "camera": removed_camera}
 
@@ -253,13 +704,21 @@ class CameraService:
             # 默认使用系统摄像头0
             return 0
 
+    @staticmethod
+    def _mjpeg_part(frame) -> bytes:
+        """把一帧编码为MJPEG流的一个分段"""
+        import cv2
+        _, buffer = cv2.imencode('.jpg', frame)
+        return (b'--frame\r\n'
+                b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+
     def process_loitering_stream(self, camera_id: str, loitering_time_threshold: int = 20):
         """
         处理摄像头徘徊检测视频流
 
         Args:
             camera_id: 摄像头ID
-            loitering_time_threshold: 徘徊时间阈值（秒）
+            loitering_time_threshold: 徘徊时间阈值（秒），运行中可通过场景配置热更新
 
         Yields:
             bytes: 编码后的视频帧
@@ -270,30 +729,43 @@ class CameraService:
         # 初始化视频处理器
         processor = VideoProcessingCoordinator(camera_id=camera_id)
 
-        # 获取摄像头源
+        # 获取摄像头源，连接由采集监管器在后台打开并负责断线重连
         camera_source = self.get_camera_source(camera_id)
+        connection = capture_supervisor.acquire(camera_id, camera_source)
 
-        # 打开摄像头
-        cap = cv2.VideoCapture(camera_source)
-        if not cap.isOpened():
-            raise Exception(f"无法打开摄像头 {camera_id} (源: {camera_source})")
+        # 订阅场景配置，配置变更在帧边界生效，检测器与跟踪器状态保持不变
+        config = self.subscribe_config(camera_id, "loitering", {"time_threshold": loitering_time_threshold})
 
         try:
             # 初始化检测器
-            detector = processor._get_loitering_detector(loitering_time_threshold=loitering_time_threshold)
+            detector = processor._get_loitering_detector(loitering_time_threshold=config.config["time_threshold"])
 
             frame_count = 0
-            fps = cap.get(cv2.CAP_PROP_FPS) or 30  # 默认FPS为30
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            detections, alarms = None, None
+            for frame, stale in connection.frames():
+                if stale:
+                    # 画面中断期间只推送标记帧，不执行检测
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 帧边界：应用配置变更，本帧内始终使用同一份配置
+                changed = config.poll()
+                settings = config.config
+                if "time_threshold" in changed:
+                    detector.loitering_time_threshold = settings["time_threshold"]
+                if not settings["enabled"]:
+                    # 场景已停用：只推送原始画面，关闭进行中的告警事件
+                    if "enabled" in changed:
+                        processor.close_incidents("loitering")
+                    yield self._mjpeg_part(frame)
+                    continue
 
                 frame_count += 1
-                frame_time = frame_count / fps
+                frame_time = frame_count / (connection.source_fps or 30)  # 默认FPS为30
 
-                # 执行徘徊检测
-                detections, alarms = detector.detect_loitering(frame, frame_time)
+                # 执行徘徊检测，按检测间隔跳过的帧沿用上次的结果
+                if detections is None or "enabled" in changed or frame_count % settings["stride"] == 0:
+                    detections, alarms = detector.detect_loitering(frame, frame_time)
 
                 # 在帧上绘制检测结果
                 annotated_frame = processor._draw_loitering_detections(frame, detections, alarms)
@@ -302,10 +774,15 @@ class CameraService:
                 _, buffer = cv2.imencode('.jpg', annotated_frame)
                 frame_bytes = buffer.tobytes()
 
+                # 帧已绘制完成，把本帧产生的告警连同帧交给后台抓拍后发布
+                processor.dispatch_alarms(annotated_frame)
+
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
         finally:
-            cap.release()
+            capture_supervisor.release(connection)
+            # 视频流结束，关闭本视频流场景进行中的告警事件（同一摄像头其他视频流的事件不受影响）
+            processor.close_incidents("loitering")
 
     def process_leave_stream(self, camera_id: str, roi: list = None, threshold: int = None):
         """
@@ -313,8 +790,8 @@ class CameraService:
 
         Args:
             camera_id: 摄像头ID
-            roi: ROI区域
-            threshold: 阈值
+            roi: ROI区域（未指定时使用摄像头的场景配置）
+            threshold: 阈值（未指定时使用摄像头的场景配置）
 
         Yields:
             bytes: 编码后的视频帧
@@ -325,40 +802,56 @@ class CameraService:
         # 初始化视频处理器
         processor = VideoProcessingCoordinator(camera_id=camera_id)
 
-        # 获取摄像头源
+        # 获取摄像头源，连接由采集监管器在后台打开并负责断线重连
         camera_source = self.get_camera_source(camera_id)
+        connection = capture_supervisor.acquire(camera_id, camera_source)
 
-        # 打开摄像头
-        cap = cv2.VideoCapture(camera_source)
-        if not cap.isOpened():
-            raise Exception(f"无法打开摄像头 {camera_id} (源: {camera_source})")
+        # 订阅场景配置，配置变更在帧边界生效，检测器状态保持不变
+        config = self.subscribe_config(camera_id, "leave", {"roi": roi, "threshold": threshold})
 
         try:
             # 初始化检测器
             detector = processor._get_leave_detector()
 
-            # 设置默认ROI区域（如果没有通过参数传递）
-            if roi is None:
-                # 默认ROI区域可以根据您的需要修改
-                roi = [(220, 300), (700, 300), (700, 700), (200, 700)]
-
             # 状态变量
             absence_start_time = None
-            alert_triggered = False
-
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            result = None
+            frame_count = 0
 
-                # 执行离岗检测
-                result = detector.detect_leave(frame, roi, absence_start_time, threshold if threshold is not None else 5)
-                absence_start_time = result['absence_start_time']
+            for frame, stale in connection.frames():
+                if stale:
+                    # 画面中断期间只推送标记帧，不执行检测
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 帧边界：应用配置变更，本帧内始终使用同一份配置
+                changed = config.poll()
+                settings = config.config
+                if changed & {"enabled", "roi"}:
+                    # 重新启用或ROI变更后重新开始离岗计时
+                    absence_start_time, result = None, None
+                if not settings["enabled"]:
+                    # 场景已停用：只推送原始画面，关闭进行中的告警事件
+                    if "enabled" in changed:
+                        processor.close_incidents("leave")
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 设置默认ROI区域（如果没有通过参数或配置指定）
+                # 默认ROI区域在 settings.DEFAULT_PERSON_ROI 中修改
+                roi = settings["roi"] or DEFAULT_PERSON_ROI
+                threshold = settings["threshold"]
+
+                # 执行离岗检测，按检测间隔跳过的帧沿用上次的结果
+                frame_count += 1
+                if result is None or frame_count % settings["stride"] == 0:
+                    result = detector.detect_leave(frame, roi, absence_start_time, threshold)
+                    absence_start_time = result['absence_start_time']
 
                 # 在帧上绘制检测结果
                 annotated_frame = processor._draw_leave_detections(
                     frame, roi, result['status'], result['roi_person_count'],
-                    absence_start_time, threshold if threshold is not None else 5, result['alert_triggered']
+                    absence_start_time, threshold, result['alert_triggered']
                 )
 
                 # 绘制检测到的人员框
@@ -370,10 +863,15 @@ class CameraService:
                 _, buffer = cv2.imencode('.jpg', annotated_frame)
                 frame_bytes = buffer.tobytes()
 
+                # 帧已绘制完成，把本帧产生的告警连同帧交给后台抓拍后发布
+                processor.dispatch_alarms(annotated_frame)
+
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
         finally:
-            cap.release()
+            capture_supervisor.release(connection)
+            # 视频流结束，关闭本视频流场景进行中的告警事件（同一摄像头其他视频流的事件不受影响）
+            processor.close_incidents("leave")
 
     def process_gather_stream(self, camera_id: str, roi: list = None, threshold: int = None):
         """
@@ -381,8 +879,8 @@ class CameraService:
 
         Args:
             camera_id: 摄像头ID
-            roi: ROI区域
-            threshold: 阈值
+            roi: ROI区域（未指定时使用摄像头的场景配置）
+            threshold: 阈值（未指定时使用摄像头的场景配置）
 
         Yields:
             bytes: 编码后的视频帧
@@ -393,34 +891,51 @@ class CameraService:
         # 初始化视频处理器
         processor = VideoProcessingCoordinator(camera_id=camera_id)
 
-        # 获取摄像头源
+        # 获取摄像头源，连接由采集监管器在后台打开并负责断线重连
         camera_source = self.get_camera_source(camera_id)
+        connection = capture_supervisor.acquire(camera_id, camera_source)
 
-        # 打开摄像头
-        cap = cv2.VideoCapture(camera_source)
-        if not cap.isOpened():
-            raise Exception(f"无法打开摄像头 {camera_id} (源: {camera_source})")
+        # 订阅场景配置，配置变更在帧边界生效，检测器状态保持不变
+        config = self.subscribe_config(camera_id, "gather", {"roi": roi, "threshold": threshold})
 
         try:
             # 初始化检测器
             detector = processor._get_gather_detector()
 
-            # 设置默认ROI区域（如果没有通过参数传递）
-            if roi is None:
-                # 默认ROI区域可以根据您的需要修改
-                roi = [(220, 300), (700, 300), (700, 700), (200, 700)]
-
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            result = None
+            frame_count = 0
 
-                # 执行聚集检测
-                result = detector.detect_gather(frame, roi, threshold if threshold is not None else 5)
+            for frame, stale in connection.frames():
+                if stale:
+                    # 画面中断期间只推送标记帧，不执行检测
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 帧边界：应用配置变更，本帧内始终使用同一份配置
+                changed = config.poll()
+                settings = config.config
+                if changed:
+                    result = None
+                if not settings["enabled"]:
+                    # 场景已停用：只推送原始画面，关闭进行中的告警事件
+                    if "enabled" in changed:
+                        processor.close_incidents("gather")
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 设置默认ROI区域（如果没有通过参数或配置指定）
+                # 默认ROI区域在 settings.DEFAULT_PERSON_ROI 中修改
+                roi = settings["roi"] or DEFAULT_PERSON_ROI
+                threshold = settings["threshold"]
+
+                # 执行聚集检测，按检测间隔跳过的帧沿用上次的结果
+                frame_count += 1
+                if result is None or frame_count % settings["stride"] == 0:
+                    result = detector.detect_gather(frame, roi, threshold)
 
                 # 在帧上绘制检测结果
                 annotated_frame = processor._draw_gather_detections(
-                    frame, roi, result['roi_person_count'], threshold if threshold is not None else 5, result['alert_triggered']
+                    frame, roi, result['roi_person_count'], threshold, result['alert_triggered']
                 )
 
                 # 绘制检测到的人员框（仅ROI区域内的人员框）
@@ -432,10 +947,15 @@ class CameraService:
                 _, buffer = cv2.imencode('.jpg', annotated_frame)
                 frame_bytes = buffer.tobytes()
 
+                # 帧已绘制完成，把本帧产生的告警连同帧交给后台抓拍后发布
+                processor.dispatch_alarms(annotated_frame)
+
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
         finally:
-            cap.release()
+            capture_supervisor.release(connection)
+            # 视频流结束，关闭本视频流场景进行中的告警事件（同一摄像头其他视频流的事件不受影响）
+            processor.close_incidents("gather")
 
     def process_banner_stream(self, camera_id: str, roi: list = None, conf_threshold: float = None, iou_threshold: float = None):
         """
@@ -444,8 +964,8 @@ class CameraService:
         Args:
             camera_id: 摄像头ID
             roi: ROI区域
-            conf_threshold: 置信度阈值
-            iou_threshold: IOU阈值
+            conf_threshold: 置信度阈值（未指定时使用摄像头的场景配置）
+            iou_threshold: IOU阈值（未指定时使用摄像头的场景配置）
 
         Yields:
             bytes: 编码后的视频帧
@@ -456,28 +976,49 @@ class CameraService:
         # 初始化视频处理器
         processor = VideoProcessingCoordinator(camera_id=camera_id)
 
-        # 获取摄像头源
+        # 获取摄像头源，连接由采集监管器在后台打开并负责断线重连
         camera_source = self.get_camera_source(camera_id)
+        connection = capture_supervisor.acquire(camera_id, camera_source)
 
-        # 打开摄像头
-        cap = cv2.VideoCapture(camera_source)
-        if not cap.isOpened():
-            raise Exception(f"无法打开摄像头 {camera_id} (源: {camera_source})")
+        # 订阅场景配置，配置变更在帧边界生效，检测器状态保持不变
+        config = self.subscribe_config(camera_id, "banner",
+                                       {"conf_threshold": conf_threshold, "iou_threshold": iou_threshold})
 
         try:
             # 初始化检测器
             detector = processor._get_banner_detector(
-                conf_threshold=conf_threshold if conf_threshold is not None else 0.5,
-                iou_threshold=iou_threshold if iou_threshold is not None else 0.45
+                conf_threshold=config.config["conf_threshold"],
+                iou_threshold=config.config["iou_threshold"]
             )
 
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            # 横幅为静态目标，由调度器决定哪些帧需要执行模型推理
+            scheduler = processor._get_banner_scheduler()
 
-                # 执行横幅检测
-                results, banners = detector.detect_banner(frame)
+            banners = None
+            frame_count = 0
+            for frame, stale in connection.frames():
+                if stale:
+                    # 画面中断期间只推送标记帧，不执行检测
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 帧边界：应用配置变更，本帧内始终使用同一份配置
+                changed = config.poll()
+                settings = config.config
+                if changed & {"conf_threshold", "iou_threshold"}:
+                    detector.conf_threshold = settings["conf_threshold"]
+                    detector.iou_threshold = settings["iou_threshold"]
+                if not settings["enabled"]:
+                    # 场景已停用：只推送原始画面，关闭进行中的告警事件
+                    if "enabled" in changed:
+                        processor.close_incidents("banner")
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 按调度执行横幅检测，未采样的帧沿用上次确认的结果；检测间隔大于1时只在间隔帧上调度
+                frame_count += 1
+                if banners is None or frame_count % settings["stride"] == 0:
+                    banners, _ = scheduler.step(frame, lambda f: detector.detect_banner(f)[1])
 
                 # 在帧上绘制检测结果
                 annotated_frame = processor._draw_banner_detections(frame, banners)
@@ -486,7 +1027,188 @@ class CameraService:
                 _, buffer = cv2.imencode('.jpg', annotated_frame)
                 frame_bytes = buffer.tobytes()
 
+                # 帧已绘制完成，把本帧产生的告警连同帧交给后台抓拍后发布
+                processor.dispatch_alarms(annotated_frame)
+
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
         finally:
-            cap.release()
+            capture_supervisor.release(connection)
+            # 视频流结束，关闭本视频流场景进行中的告警事件（同一摄像头其他视频流的事件不受影响）
+            processor.close_incidents("banner")
+
+
+    def process_combined_stream(self, camera_id: str, scenarios: List[str],
+                                leave_roi: list = None, leave_threshold: int = None,
+                                gather_roi: list = None, gather_threshold: int = None,
+                                conf_threshold: float = None, iou_threshold: float = None):
+        """
+        处理摄像头多场景组合检测视频流
+
+        离岗、聚集、横幅场景在同一路视频流上同时运行，每帧只做一次预处理，
+        需要检测的场景共用同一个输入张量（人员场景共用同一个模型时只前向一次），检测结果绘制在同一帧上
+
+        Args:
+            camera_id: 摄像头ID
+            scenarios: 场景列表，取值为 leave、gather、banner
+            leave_roi: 离岗ROI区域（未指定时使用摄像头的场景配置）
+            leave_threshold: 离岗阈值（未指定时使用摄像头的场景配置）
+            gather_roi: 聚集ROI区域（未指定时使用摄像头的场景配置）
+            gather_threshold: 聚集阈值（未指定时使用摄像头的场景配置）
+            conf_threshold: 横幅置信度阈值（未指定时使用摄像头的场景配置）
+            iou_threshold: 横幅IOU阈值（未指定时使用摄像头的场景配置）
+
+        Yields:
+            bytes: 编码后的视频帧
+        """
+        from ..algorithms import VideoProcessingCoordinator
+        import cv2
+
+        unsupported = set(scenarios) - {"leave", "gather", "banner"}
+        if unsupported:
+            raise ValueError(f"组合检测不支持的场景: {', '.join(sorted(unsupported))}")
+
+        # 初始化视频处理器
+        processor = VideoProcessingCoordinator(camera_id=camera_id)
+
+        # 获取摄像头源，连接由采集监管器在后台打开并负责断线重连
+        camera_source = self.get_camera_source(camera_id)
+        connection = capture_supervisor.acquire(camera_id, camera_source)
+
+        # 每个场景各自订阅配置，配置变更在帧边界生效
+        overrides = {
+            "leave": {"roi": leave_roi, "threshold": leave_threshold},
+            "gather": {"roi": gather_roi, "threshold": gather_threshold},
+            "banner": {"conf_threshold": conf_threshold, "iou_threshold": iou_threshold}
+        }
+        configs = {scenario: self.subscribe_config(camera_id, scenario, overrides[scenario]) for scenario in scenarios}
+
+        try:
+            # 初始化检测器，离岗与聚集使用同一个人员模型
+            detectors = {}
+            if "leave" in configs:
+                detectors["leave"] = processor._get_leave_detector()
+            if "gather" in configs:
+                detectors["gather"] = processor._get_gather_detector()
+                if "leave" in detectors:
+                    detectors["gather"].model = detectors["leave"].model
+            if "banner" in configs:
+                detectors["banner"] = processor._get_banner_detector(
+                    conf_threshold=configs["banner"].config["conf_threshold"],
+                    iou_threshold=configs["banner"].config["iou_threshold"]
+                )
+                # 横幅为静态目标，由调度器决定哪些帧需要执行模型推理
+                scheduler = processor._get_banner_scheduler()
+            shared = processor._get_shared_inference(
+                detectors.get("leave"), detectors.get("gather"), detectors.get("banner"))
+
+            # 状态变量
+            absence_start_time = None
+            results = {}
+            banners = None
+            frame_count = 0
+
+            for frame, stale in connection.frames():
+                if stale:
+                    # 画面中断期间只推送标记帧，不执行检测
+                    yield self._mjpeg_part(frame)
+                    continue
+
+                # 帧边界：应用各场景的配置变更，本帧内始终使用同一份配置
+                frame_count += 1
+                requests = {}
+                for scenario, config in configs.items():
+                    changed = config.poll()
+                    settings = config.config
+                    if changed:
+                        results.pop(scenario, None)
+                    if scenario == "leave" and changed & {"enabled", "roi"}:
+                        # 重新启用或ROI变更后重新开始离岗计时
+                        absence_start_time = None
+                    if scenario == "banner" and changed & {"conf_threshold", "iou_threshold"}:
+                        detectors["banner"].conf_threshold = settings["conf_threshold"]
+                        detectors["banner"].iou_threshold = settings["iou_threshold"]
+                        shared = processor._get_shared_inference(
+                            detectors.get("leave"), detectors.get("gather"), detectors.get("banner"))
+                    if not settings["enabled"]:
+                        if "enabled" in changed:
+                            # 场景已停用：关闭该场景进行中的告警事件
+                            processor.close_incidents(scenario)
+                        if scenario == "banner":
+                            banners = None
+                        continue
+
+                    # 按检测间隔跳过的帧沿用上次的结果；横幅检测还需由调度器决定是否采样
+                    if scenario != "banner" and scenario in results and frame_count % settings["stride"] != 0:
+                        continue
+                    if scenario == "banner":
+                        if banners is not None and frame_count % settings["stride"] != 0:
+                            continue
+                        if not scheduler.should_run(frame):
+                            banners = scheduler.confirmed_banners
+                            continue
+                        requests["banner"] = {}
+                    elif scenario == "leave":
+                        requests["leave"] = {
+                            "roi": settings["roi"] or DEFAULT_PERSON_ROI,
+                            "absence_start_time": absence_start_time,
+                            "threshold": settings["threshold"]
+                        }
+                    else:
+                        requests["gather"] = {
+                            "roi": settings["roi"] or DEFAULT_PERSON_ROI,
+                            "threshold": settings["threshold"]
+                        }
+
+                # 本帧需要检测的场景共用一次预处理
+                if requests:
+                    detected = processor.detect_shared(frame, shared, detectors, requests)
+                    if "leave" in detected:
+                        absence_start_time = detected["leave"]["absence_start_time"]
+                    if "banner" in detected:
+                        scheduler.update(frame, detected.pop("banner"))
+                        banners = scheduler.confirmed_banners
+                    results.update({scenario: (requests[scenario], result) for scenario, result in detected.items()})
+
+                # 在同一帧上绘制各场景的检测结果
+                annotated_frame = frame
+                if "leave" in results and configs["leave"].config["enabled"]:
+                    params, result = results["leave"]
+                    annotated_frame = processor._draw_leave_detections(
+                        annotated_frame, params["roi"], result['status'], result['roi_person_count'],
+                        absence_start_time, params["threshold"], result['alert_triggered']
+                    )
+                    for box in result['person_boxes']:
+                        x1, y1, x2, y2 = box.astype(int)
+                        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                if "gather" in results and configs["gather"].config["enabled"]:
+                    params, result = results["gather"]
+                    annotated_frame = processor._draw_gather_detections(
+                        annotated_frame, params["roi"], result['roi_person_count'], params["threshold"],
+                        result['alert_triggered']
+                    )
+                    for box in result['roi_person_boxes']:
+                        x1, y1, x2, y2 = box.astype(int)
+                        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                if banners is not None:
+                    annotated_frame = processor._draw_banner_detections(annotated_frame, banners)
+
+                # 编码帧
+                _, buffer = cv2.imencode('.jpg', annotated_frame)
+                frame_bytes = buffer.tobytes()
+
+                # 帧已绘制完成，把本帧产生的告警连同帧交给后台抓拍后发布
+                processor.dispatch_alarms(annotated_frame)
+
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+        finally:
+            capture_supervisor.release(connection)
+            # 视频流结束，关闭本视频流各场景进行中的告警事件（同一摄像头其他视频流的事件不受影响）
+            for scenario in configs:
+                processor.close_incidents(scenario)
+
+
+# 创建全局摄像头服务实例，所有路由与服务共享同一份注册表；进程退出时写入剩余的修改
+camera_service = CameraService()
+atexit.register(camera_service.stop)
@@ -0,0 +1,321 @@
+"""
+摄像头采集监管服务
+每路摄像头的连接由监管器统一持有：独立的采集线程负责打开、读取和断线重连，
+视频流处理循环只从连接中取最新的帧。打开和读取都有超时，断线后按带抖动的指数退避重连，
+重连期间向处理循环发布“画面中断”标记帧，一路摄像头的故障不会影响其他摄像头
+"""
+
+import os
+import random
+import threading
+import time
+import logging
+from typing import Dict, Any, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import cv2
+import numpy as np
+
+from ..config.settings import (
+    CAPTURE_OPEN_TIMEOUT,
+    CAPTURE_READ_TIMEOUT,
+    CAPTURE_BACKOFF_MIN,
+    CAPTURE_BACKOFF_MAX,
+    CAPTURE_STALE_AFTER,
+    CAPTURE_STALE_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+# 连接状态
+STATE_CONNECTING = "connecting"
+STATE_ONLINE = "online"
+STATE_STALE = "stale"
+STATE_ENDED = "ended"
+
+# 支持设置打开/读取超时的网络流协议
+NETWORK_SCHEMES = {"rtsp", "rtsps", "rtmp", "http", "https", "tcp", "udp"}
+
+
+class CameraConnection:
+    """单路摄像头连接，由独立的采集线程维护"""
+
+    def __init__(self, camera_id: str, source: Any,
+                 open_timeout: float = CAPTURE_OPEN_TIMEOUT,
+                 read_timeout: float = CAPTURE_READ_TIMEOUT,
+                 backoff_min: float = CAPTURE_BACKOFF_MIN,
+                 backoff_max: float = CAPTURE_BACKOFF_MAX,
+                 stale_after: float = CAPTURE_STALE_AFTER):
+        """
+        初始化摄像头连接
+
+        Args:
+            camera_id: 摄像头ID
+            source: 视频源（设备编号、流地址或本地视频文件）
+            open_timeout: 打开视频源的超时（秒）
+            read_timeout: 读取一帧的超时（秒）
+            backoff_min: 重连退避初始间隔（秒）
+            backoff_max: 重连退避最大间隔（秒）
+            stale_after: 超过该时间没有新帧即视为画面中断（秒）
+        """
+        self.camera_id = camera_id
+        self.source = source
+        self.open_timeout = open_timeout
+        self.read_timeout = read_timeout
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.stale_after = stale_after
+        # 本地视频文件：读到结尾即结束，且逐帧交付（不丢帧）
+        self.is_file = isinstance(source, str) and os.path.isfile(source)
+
+        self.state = STATE_CONNECTING
+        self.frame: Optional[np.ndarray] = None
+        self.seq = 0
+        # 每个处理循环已取走的帧序号（键为消费者编号），视频文件按最慢的消费者逐帧交付
+        self.taken: Dict[int, int] = {}
+        self._next_consumer = 0
+        self.frame_time = 0.0
+        self.fps = 0.0
+        self.source_fps = 0.0
+        self.refs = 0
+
+        # 健康信息
+        self.connected_since: Optional[float] = None
+        self.reconnects = 0
+        self.failures = 0
+        self.next_retry: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"capture-{camera_id}", daemon=True)
+
+    def start(self):
+        """启动采集线程"""
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """停止采集线程（线程阻塞在读取中时最多等待timeout秒）"""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _open(self) -> cv2.VideoCapture:
+        """打开视频源，网络流设置打开和读取超时"""
+        source = self.source
+        if isinstance(source, str) and source.isnumeric():
+            source = int(source)
+        if isinstance(source, str) and urlparse(source).scheme in NETWORK_SCHEMES \
+                and hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+            return cv2.VideoCapture(source, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(self.open_timeout * 1000),
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(self.read_timeout * 1000)
+            ])
+        return cv2.VideoCapture(source)
+
+    def _run(self):
+        """采集主循环：打开、读取，断线后退避重连"""
+        while not self._stop_event.is_set():
+            cap = None
+            try:
+                cap = self._open()
+                if not cap.isOpened():
+                    raise ConnectionError(f"无法打开视频源 {self.source}")
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                self.source_fps = fps if fps and fps == fps and 0 < fps < 1000 else 30.0
+                self.connected_since = time.time()
+                self.next_retry = None
+
+                while not self._stop_event.is_set():
+                    ok, frame = cap.read()
+                    if not ok or frame is None:
+                        break
+                    self._publish(frame)
+
+                if self._stop_event.is_set():
+                    break
+                if self.is_file:
+                    # 视频文件读到结尾，正常结束
+                    self._set_state(STATE_ENDED)
+                    break
+                raise ConnectionError("视频流读取失败")
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                self._set_state(STATE_STALE if self.seq else STATE_CONNECTING)
+                if self.is_file and self.failures > 1:
+                    self._set_state(STATE_ENDED)
+                    break
+                # 带抖动的指数退避：在 [最小间隔, 当前上限] 内随机取值，避免大量摄像头同时重连
+                delay = random.uniform(self.backoff_min,
+                                       min(self.backoff_max, self.backoff_min * (2 ** (self.failures - 1))))
+                self.next_retry = time.time() + delay
+                logger.warning(f"摄像头 {self.camera_id} 连接中断: {self.last_error}，{delay:.1f} 秒后重连")
+                self._stop_event.wait(delay)
+                self.reconnects += 1
+            finally:
+                if cap is not None:
+                    cap.release()
+
+    def _publish(self, frame: np.ndarray):
+        """发布新的一帧并唤醒等待的处理循环"""
+        with self._cond:
+            if self.is_file:
+                # 视频文件逐帧交付：等待所有处理循环都取走上一帧
+                self._cond.wait_for(lambda: (self.taken and min(self.taken.values()) >= self.seq)
+                                    or self._stop_event.is_set())
+            now = time.time()
+            if self.frame_time:
+                self.fps = 0.9 * self.fps + 0.1 / max(now - self.frame_time, 1e-3) if self.fps else 1.0 / max(now - self.frame_time, 1e-3)
+            self.frame = frame
+            self.seq += 1
+            self.frame_time = now
+            self.failures = 0
+            self.state = STATE_ONLINE
+            self._cond.notify_all()
+
+    def _set_state(self, state: str):
+        """更新连接状态并唤醒等待的处理循环"""
+        with self._cond:
+            self.state = state
+            self._cond.notify_all()
+
+    def frames(self, stale_interval: float = CAPTURE_STALE_INTERVAL) -> Iterator[Tuple[np.ndarray, bool]]:
+        """
+        按顺序获取新帧，供视频流处理循环使用
+
+        同一连接的多个处理循环各自调用本方法，每个处理循环得到帧的独立副本，可以在帧上直接绘制；
+        没有新帧超过stale_after秒时，每隔stale_interval秒产出一次画面中断标记帧；
+        视频文件读完或连接停止后结束
+
+        Yields:
+            tuple: (帧, 是否为画面中断标记帧)
+        """
+        last_seq = 0
+        last_marker = 0.0
+        with self._cond:
+            consumer = self._next_consumer
+            self._next_consumer += 1
+            self.taken[consumer] = 0
+            self._cond.notify_all()
+        try:
+            while not self._stop_event.is_set():
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self.seq != last_seq or self.state == STATE_ENDED or self._stop_event.is_set(),
+                        timeout=stale_interval)
+                    frame, seq, state, frame_time = self.frame, self.seq, self.state, self.frame_time
+                    if seq != last_seq:
+                        # 在释放锁之前复制，采集线程发布下一帧时不会影响本处理循环
+                        frame = frame.copy()
+                        self.taken[consumer] = seq
+                        self._cond.notify_all()
+
+                if seq != last_seq:
+                    last_seq = seq
+                    yield frame, False
+                    continue
+                if state == STATE_ENDED or self._stop_event.is_set():
+                    break
+                now = time.time()
+                if now - (frame_time or 0) >= self.stale_after and now - last_marker >= stale_interval:
+                    if self.state == STATE_ONLINE:
+                        # 采集线程阻塞在读取中，画面已中断
+                        self._set_state(STATE_STALE)
+                    last_marker = now
+                    yield self.stale_marker(frame), True
+        finally:
+            # 处理循环退出后不再阻塞视频文件的逐帧交付
+            with self._cond:
+                self.taken.pop(consumer, None)
+                self._cond.notify_all()
+
+    def stale_marker(self, frame: Optional[np.ndarray]) -> np.ndarray:
+        """生成画面中断标记帧：最后一帧画面变暗并叠加提示"""
+        marker = (frame // 3) if frame is not None else np.zeros((360, 640, 3), dtype=np.uint8)
+        elapsed = time.time() - self.frame_time if self.frame_time else 0
+        text = f"SIGNAL LOST - RECONNECTING ({elapsed:.0f}s)" if self.frame_time else "CONNECTING..."
+        cv2.putText(marker, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        return marker
+
+    def health(self) -> Dict[str, Any]:
+        """连接健康信息"""
+        now = time.time()
+        return {
+            "camera_id": self.camera_id,
+            "source": str(self.source),
+            "state": self.state,
+            "consumers": self.refs,
+            "fps": round(self.fps, 2),
+            "frames": self.seq,
+            "last_frame_age": round(now - self.frame_time, 3) if self.frame_time else None,
+            "connected_since": self.connected_since,
+            "reconnects": self.reconnects,
+            "consecutive_failures": self.failures,
+            "next_retry_in": round(max(0.0, self.next_retry - now), 3) if self.next_retry else None,
+            "last_error": self.last_error
+        }
+
+
+class CaptureSupervisor:
+    """摄像头采集监管器，同一摄像头的多个处理循环共享一个连接"""
+
+    def __init__(self):
+        """初始化采集监管器"""
+        self.connections: Dict[str, CameraConnection] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, camera_id: str, source: Any) -> CameraConnection:
+        """
+        获取摄像头连接（不存在时创建并在后台打开，不阻塞调用方）
+
+        Args:
+            camera_id: 摄像头ID
+            source: 视频源
+
+        Returns:
+            CameraConnection: 摄像头连接，使用完毕后需调用release
+        """
+        with self._lock:
+            connection = self.connections.get(camera_id)
+            if connection is None or connection.source != source or connection.state == STATE_ENDED:
+                # 新摄像头、视频源已变更或视频文件已读完，建立新连接；旧连接在其使用者释放后停止
+                connection = CameraConnection(camera_id, source)
+                self.connections[camera_id] = connection
+                connection.start()
+            connection.refs += 1
+            return connection
+
+    def release(self, connection: CameraConnection):
+        """释放摄像头连接，最后一个使用者释放后关闭连接"""
+        with self._lock:
+            connection.refs -= 1
+            if connection.refs > 0:
+                return
+            if self.connections.get(connection.camera_id) is connection:
+                del self.connections[connection.camera_id]
+        connection.stop(timeout=0)
+
+    def health(self, camera_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        获取连接健康信息
+
+        Args:
+            camera_id: 摄像头ID，None表示全部
+
+        Returns:
+            Dict[str, Any]: 各摄像头的连接健康信息与状态汇总
+        """
+        with self._lock:
+            connections = [c for c in self.connections.values() if camera_id is None or c.camera_id == camera_id]
+        cameras = [c.health() for c in connections]
+        summary: Dict[str, int] = {}
+        for camera in cameras:
+            summary[camera["state"]] = summary.get(camera["state"], 0) + 1
+        return {"cameras": cameras, "summary": summary}
+
+
+# 创建全局采集监管器实例
+capture_supervisor = CaptureSupervisor()
@@ -0,0 +1,297 @@
+"""
+设备心跳服务
+GA/T 1400 设备保活只在心跳表中记录最近一次保活时间（O(1)），由分层时间轮统一处理超时：
+每个在线设备在时间轮上只挂一个定时器，到期时若期间收到过保活则按最新保活时间重新挂上，
+否则判定离线，因此保活处理与设备总数无关，也不需要周期性地扫描全部设备
+"""
+
+import atexit
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Callable, Hashable, Tuple
+
+from .alarm_bus import alarm_bus
+from ..config.settings import (
+    DEVICE_KEEPALIVE_INTERVAL,
+    DEVICE_KEEPALIVE_MISSES,
+    DEVICE_HEARTBEAT_TICK
+)
+
+logger = logging.getLogger(__name__)
+
+# 设备状态
+DEVICE_ONLINE = "online"
+DEVICE_OFFLINE = "offline"
+
+
+class TimerWheel:
+    """
+    分层时间轮
+
+    第0层每个槽对应一个刻度，第L层每个槽对应 slots^L 个刻度；定时器放在与当前刻度
+    高位相同的最低一层，高层的槽在低层转满一圈时下放到低层，插入、取消均为O(1)
+    """
+
+    def __init__(self, tick: float = 1.0, slot_bits: int = 6, levels: int = 4, now: Optional[float] = None):
+        """
+        初始化时间轮
+
+        Args:
+            tick: 刻度长度（秒）
+            slot_bits: 每层槽数的二进制位数（每层 2^slot_bits 个槽）
+            levels: 层数，可表示的最长定时为 tick * 2^(slot_bits*levels)
+            now: 当前时间（秒），默认使用系统时间
+        """
+        self.tick = tick
+        self.bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        self.levels = levels
+        self.max_ticks = (1 << (slot_bits * levels)) - 1
+        # 每个槽保存 {键: 到期刻度}
+        self.wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        # 定时器所在位置 {键: (层, 槽)}，用于取消
+        self.timers: Dict[Hashable, Tuple[int, int]] = {}
+        self.current = int((time.time() if now is None else now) // tick)
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        设置（或重设）定时器
+
+        Args:
+            key: 定时器标识，同一键只保留最后一次设置
+            deadline: 到期时间（秒），早于当前刻度的在下一个刻度到期
+        """
+        self.cancel(key)
+        expires = min(max(int(-(-deadline // self.tick)), self.current + 1), self.current + self.max_ticks)
+        self._place(key, expires)
+
+    def cancel(self, key: Hashable) -> bool:
+        """取消定时器，返回定时器是否存在"""
+        position = self.timers.pop(key, None)
+        if position is None:
+            return False
+        level, index = position
+        del self.wheels[level][index][key]
+        return True
+
+    def _place(self, key: Hashable, expires: int):
+        """把定时器放入与当前刻度高位相同的最低一层"""
+        level = 0
+        while level < self.levels - 1 and (expires >> (self.bits * (level + 1))) != (self.current >> (self.bits * (level + 1))):
+            level += 1
+        index = (expires >> (self.bits * level)) & self.mask
+        self.wheels[level][index][key] = expires
+        self.timers[key] = (level, index)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        推进时间轮到当前时间
+
+        Args:
+            now: 当前时间（秒）
+
+        Returns:
+            List[Hashable]: 已到期的定时器键
+        """
+        target = int((time.time() if now is None else now) // self.tick)
+        expired = []
+        while self.current < target:
+            self.current += 1
+            # 低层转满一圈时，把高层当前槽中的定时器下放
+            if self.current & self.mask == 0:
+                for level in range(1, self.levels):
+                    index = (self.current >> (self.bits * level)) & self.mask
+                    slot, self.wheels[level][index] = self.wheels[level][index], {}
+                    for key, expires in slot.items():
+                        self._place(key, expires)
+                    if index != 0:
+                        break
+            index = self.current & self.mask
+            slot = self.wheels[0][index]
+            if slot:
+                self.wheels[0][index] = {}
+                for key in slot:
+                    del self.timers[key]
+                expired.extend(slot)
+        return expired
+
+
+def publish_device_event(event: Dict[str, Any]):
+    """设备上下线事件的默认发布方式：记录日志并推送给 /alerts/stream 的订阅者"""
+    logger.info(f"设备 {event['deviceCode']} {'上线' if event['status'] == DEVICE_ONLINE else '离线'}")
+    alarm_bus.publish(event, event_type="device")
+
+
+class DeviceHeartbeatMonitor:
+    """设备心跳表与在线状态监测"""
+
+    def __init__(self,
+                 interval: float = DEVICE_KEEPALIVE_INTERVAL,
+                 misses: int = DEVICE_KEEPALIVE_MISSES,
+                 tick: float = DEVICE_HEARTBEAT_TICK,
+                 publish: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        初始化设备心跳监测
+
+        Args:
+            interval: 设备保活间隔（秒）
+            misses: 连续错过多少次保活判定为离线
+            tick: 超时检查精度（秒）
+            publish: 上下线事件发布函数，默认记录日志并推送给实时订阅者
+        """
+        self.timeout = interval * misses
+        self.tick = tick
+        self.publish = publish or publish_device_event
+
+        # 心跳表 {设备ID: 最近保活时间}
+        self.last_seen: Dict[str, float] = {}
+        # 在线设备 {设备ID: 上线时间}
+        self.online: Dict[str, float] = {}
+        self.wheel = TimerWheel(tick=tick)
+        self._lock = threading.Lock()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        # 统计信息
+        self.stats = {"keepalives": 0, "online_events": 0, "offline_events": 0}
+
+    def start(self):
+        """启动超时检查线程（首次保活时自动调用）"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="device-heartbeat", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """停止超时检查线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """超时检查主循环"""
+        while not self._stop_event.wait(self.tick):
+            try:
+                self.expire()
+            except Exception as e:
+                logger.error(f"设备心跳超时检查失败: {str(e)}")
+
+    def keepalive(self, device_id: str, now: Optional[float] = None) -> bool:
+        """
+        记录一次设备保活
+
+        Args:
+            device_id: 设备ID
+            now: 保活时间（秒），默认使用系统时间
+
+        Returns:
+            bool: 设备是否由离线变为在线
+        """
+        return bool(self.keepalive_many([device_id], now))
+
+    def keepalive_many(self, device_ids: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """
+        批量记录设备保活（整批只加一次锁）
+
+        Args:
+            device_ids: 设备ID列表
+            now: 保活时间（秒），默认使用系统时间
+
+        Returns:
+            List[str]: 由离线变为在线的设备ID
+        """
+        if self._thread is None:
+            self.start()
+        now = time.time() if now is None else now
+        came_online = []
+        with self._lock:
+            for device_id in device_ids:
+                self.last_seen[device_id] = now
+                self.stats["keepalives"] += 1
+                if device_id not in self.online:
+                    # 新上线的设备挂一个定时器；在线设备的保活只更新心跳表，定时器到期时再顺延
+                    self.online[device_id] = now
+                    self.wheel.schedule(device_id, now + self.timeout)
+                    came_online.append(device_id)
+        for device_id in came_online:
+            self._emit(device_id, DEVICE_ONLINE, now)
+        return came_online
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """
+        推进时间轮，把超时未保活的设备判定为离线
+
+        Args:
+            now: 当前时间（秒），默认使用系统时间
+
+        Returns:
+            List[str]: 本次判定离线的设备ID
+        """
+        now = time.time() if now is None else now
+        went_offline = []
+        with self._lock:
+            for device_id in self.wheel.advance(now):
+                if device_id not in self.online:
+                    continue
+                deadline = self.last_seen[device_id] + self.timeout
+                if deadline > now:
+                    # 期间收到过保活，按最新保活时间顺延
+                    self.wheel.schedule(device_id, deadline)
+                else:
+                    del self.online[device_id]
+                    went_offline.append(device_id)
+        for device_id in went_offline:
+            self._emit(device_id, DEVICE_OFFLINE, now)
+        return went_offline
+
+    def remove(self, device_id: str):
+        """设备注销时移除其心跳记录（不产生离线事件）"""
+        with self._lock:
+            self.last_seen.pop(device_id, None)
+            self.online.pop(device_id, None)
+            self.wheel.cancel(device_id)
+
+    def status(self, device_id: str) -> Dict[str, Any]:
+        """
+        获取设备在线状态
+
+        Returns:
+            Dict[str, Any]: status（online/offline）与最近保活时间
+        """
+        last_seen = self.last_seen.get(device_id)
+        return {
+            "status": DEVICE_ONLINE if device_id in self.online else DEVICE_OFFLINE,
+            "last_keepalive": datetime.fromtimestamp(last_seen).isoformat() if last_seen is not None else None
+        }
+
+    def summary(self) -> Dict[str, int]:
+        """在线/离线设备数"""
+        online = len(self.online)
+        return {"online": online, "offline": len(self.last_seen) - online}
+
+    def _emit(self, device_id: str, status: str, now: float):
+        """发布设备上下线事件"""
+        self.stats["online_events" if status == DEVICE_ONLINE else "offline_events"] += 1
+        event = {
+            "deviceCode": device_id,
+            "status": status,
+            "lastKeepalive": datetime.fromtimestamp(self.last_seen.get(device_id, now)).isoformat(),
+            "timestamp": datetime.fromtimestamp(now).isoformat()
+        }
+        try:
+            self.publish(event)
+        except Exception as e:
+            logger.error(f"发布设备上下线事件失败: {str(e)}")
+
+
+# 创建全局设备心跳监测实例
+device_heartbeat = DeviceHeartbeatMonitor()
+atexit.register(device_heartbeat.stop)
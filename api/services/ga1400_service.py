@@ -6,8 +6,12 @@ from typing import List, Dict, Any, Optional
 import json
 import uuid
 from datetime import datetime
-from .camera_service import CameraService
+from .camera_service import camera_service
 from .video_service import VideoService
+from .alarm_bus import alarm_bus
+from .alarm_store import alarm_store, normalize_time
+from .device_heartbeat import device_heartbeat
+from .subscription_service import subscription_service
 
 
 class GA1400Service:
@@ -18,8 +22,10 @@ class GA1400Service:
 
     def __init__(self):
         """初始化GA1400服务"""
-        self.camera_service = CameraService()
+        self.camera_service = camera_service
         self.video_service = VideoService()
+        self.device_heartbeat = device_heartbeat
+        self.subscription_service = subscription_service
 
     def register_device(self, device_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -65,8 +71,9 @@ class GA1400Service:
             Dict[str, Any]: 注销结果
         """
         try:
-            # 从系统中删除摄像头
+            # 从系统中删除摄像头，并移除其心跳记录
             result = self.camera_service.remove_camera(device_id)
+            self.device_heartbeat.remove(device_id)
 
             return {
                 "status": "success",
@@ -94,12 +101,12 @@ class GA1400Service:
         """
         try:
             # 检查设备是否存在
-            cameras = self.camera_service.get_all_cameras()
-            device_exists = any(cam["id"] == device_id for cam in cameras)
-
-            if not device_exists:
+            if not self.camera_service.has_camera(device_id):
                 raise ValueError("设备不存在")
 
+            # 记录到心跳表
+            self.device_heartbeat.keepalive(device_id)
+
             return {
                 "status": "success",
                 "device_id": device_id,
@@ -114,6 +121,38 @@ class GA1400Service:
                 "timestamp": datetime.now().isoformat()
             }
 
+    def keepalive_devices(self, device_ids: List[str]) -> Dict[str, Any]:
+        """
+        批量设备保活接口 (GA/T 1400 扩展接口)
+
+        Args:
+            device_ids: 设备ID列表
+
+        Returns:
+            Dict[str, Any]: 保活结果，未注册的设备ID在unknown_devices中返回
+        """
+        try:
+            known, unknown = [], []
+            for device_id in device_ids:
+                (known if self.camera_service.has_camera(device_id) else unknown).append(device_id)
+
+            # 整批记录到心跳表
+            self.device_heartbeat.keepalive_many(known)
+
+            return {
+                "status": "success",
+                "accepted_count": len(known),
+                "unknown_devices": unknown,
+                "message": "设备批量保活成功",
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"设备批量保活失败: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+
     def sync_device_time(self, device_id: str, time_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         时间同步接口 (GA/T 1400 标准接口)
@@ -127,10 +166,7 @@ class GA1400Service:
         """
         try:
             # 检查设备是否存在
-            cameras = self.camera_service.get_all_cameras()
-            device_exists = any(cam["id"] == device_id for cam in cameras)
-
-            if not device_exists:
+            if not self.camera_service.has_camera(device_id):
                 raise ValueError("设备不存在")
 
             # 获取系统当前时间
@@ -162,24 +198,12 @@ class GA1400Service:
             Dict[str, Any]: 设备列表
         """
         try:
-            # 获取所有摄像头
-            cameras = self.camera_service.get_all_cameras()
-
-            # 根据查询参数过滤
-            if query_params:
-                # 可以根据场景类型、位置等条件过滤
-                scene_type = query_params.get("scene_type")
-                if scene_type:
-                    filtered_cameras = []
-                    for camera in cameras:
-                        try:
-                            camera_scene = self.camera_service.get_camera_scene(camera["id"])
-                            if camera_scene.get("scene_type") == scene_type:
-                                filtered_cameras.append(camera)
-                        except:
-                            # 如果摄像头未分配场景，则跳过
-                            pass
-                    cameras = filtered_cameras
+            # 根据场景类型、位置等条件过滤（走注册表的二级索引）
+            query_params = query_params or {}
+            cameras = self.camera_service.find_cameras(
+                scene_type=query_params.get("scene_type") or None,
+                location=query_params.get("location") or None
+            )
 
             return {
                 "status": "success",
@@ -199,18 +223,22 @@ class GA1400Service:
         订阅通知接口 (GA/T 1400 标准接口)
 
         Args:
-            subscription_info: 订阅信息
+            subscription_info: 订阅信息，应包含:
+                - receive_addr: 通知接收地址（HTTP URL）
+                - device_ids: 订阅的设备ID列表（可选）
+                - scene_types: 订阅的场景类型列表（可选）
+                - begin_time / end_time: 订阅有效期（可选）
 
         Returns:
             Dict[str, Any]: 订阅结果
         """
         try:
-            subscription_id = str(uuid.uuid4())
-            # 在实际应用中，这里应该保存订阅信息到数据库
+            # 保存订阅，之后匹配的告警将推送到接收地址
+            subscription = self.subscription_service.subscribe(subscription_info)
 
             return {
                 "status": "success",
-                "subscription_id": subscription_id,
+                "subscription_id": subscription["subscription_id"],
                 "message": "订阅成功",
                 "timestamp": datetime.now().isoformat()
             }
@@ -221,6 +249,56 @@ class GA1400Service:
                 "timestamp": datetime.now().isoformat()
             }
 
+    def unsubscribe_notifications(self, subscription_id: str) -> Dict[str, Any]:
+        """
+        取消订阅接口 (GA/T 1400 标准接口)
+
+        Args:
+            subscription_id: 订阅ID
+
+        Returns:
+            Dict[str, Any]: 取消结果
+        """
+        try:
+            self.subscription_service.unsubscribe(subscription_id)
+
+            return {
+                "status": "success",
+                "subscription_id": subscription_id,
+                "message": "取消订阅成功",
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "subscription_id": subscription_id,
+                "message": f"取消订阅失败: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def get_subscriptions(self) -> Dict[str, Any]:
+        """
+        查询订阅列表及推送状态 (GA/T 1400 扩展接口)
+
+        Returns:
+            Dict[str, Any]: 订阅列表
+        """
+        try:
+            subscriptions = self.subscription_service.get_subscriptions()
+
+            return {
+                "status": "success",
+                "subscriptions": subscriptions,
+                "total_count": len(subscriptions),
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"查询订阅失败: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+
     def report_alarm(self, alarm_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         报警上报接口 (GA/T 1400 标准接口)
@@ -239,9 +317,28 @@ class GA1400Service:
                     raise ValueError(f"缺少必要字段: {field}")
 
             # 生成报警ID
-            alarm_id = str(uuid.uuid4())
+            alarm_id = alarm_info.get("alarm_id") or str(uuid.uuid4())
+
+            # 保存到告警库（同步写入，上报成功后即可查询到）
+            extra = {k: v for k, v in alarm_info.items()
+                     if k not in required_fields and k not in ("alarm_id", "level", "memo", "image", "position")}
+            message = {
+                "code": alarm_id,
+                "alarmTime": normalize_time(alarm_info["timestamp"]),
+                "deviceCode": alarm_info["device_id"],
+                "sceneType": alarm_info["scene_type"],
+                "subType": "GA/T 1400报警上报",
+                "level": alarm_info.get("level"),
+                "memo": alarm_info.get("memo"),
+                "image": alarm_info.get("image"),
+                "position": alarm_info.get("position"),
+                "ext1": json.dumps(extra, ensure_ascii=False) if extra else None
+            }
+            alarm_store.insert_many([message])
 
-            # 在实际应用中，这里应该保存报警信息到数据库
+            # 推送给实时订阅者和匹配的GA/T 1400订阅者
+            alarm_bus.publish(message)
+            self.subscription_service.dispatch(message)
 
             return {
                 "status": "success",
@@ -266,6 +363,8 @@ class GA1400Service:
                 - scene_type: 场景类型
                 - start_time: 开始时间
                 - end_time: 结束时间
+                - limit: 每页条数（默认100）
+                - cursor: 下一页游标，取自上一页结果的next_cursor
 
         Returns:
             Dict[str, Any]: 查询结果
@@ -277,22 +376,18 @@ class GA1400Service:
             start_time = query_params.get("start_time")
             end_time = query_params.get("end_time")
 
-            # 构造查询条件
-            query_conditions = {
-                "camera_ids": device_ids,
-                "scene_type": scene_type,
-                "start_time": start_time,
-                "end_time": end_time
-            }
+            limit = int(query_params.get("limit", 100))
+            cursor = query_params.get("cursor")
 
-            # 在实际应用中，这里应该从数据库查询报警数据
-            # 模拟返回数据
-            alarms = []
+            # 从告警库分页查询，总数由索引上的计数查询得到
+            alarms, next_cursor = alarm_store.query(device_ids, scene_type, start_time, end_time, limit, cursor)
+            total_count = alarm_store.count(device_ids, scene_type, start_time, end_time)["total"]
 
             return {
                 "status": "success",
                 "alarms": alarms,
-                "total_count": len(alarms),
+                "total_count": total_count,
+                "next_cursor": next_cursor,
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
@@ -314,8 +409,7 @@ class GA1400Service:
         """
         try:
             # 获取摄像头信息
-            cameras = self.camera_service.get_all_cameras()
-            camera = next((cam for cam in cameras if cam["id"] == device_id), None)
+            camera = self.camera_service.get_camera(device_id)
 
             if not camera:
                 raise ValueError("设备不存在")
@@ -338,6 +432,7 @@ class GA1400Service:
                 "device_info": camera,
                 "scene_info": scene_info,
                 "device_binding": device_info,
+                "online_status": self.device_heartbeat.status(device_id),
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
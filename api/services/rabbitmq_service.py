@@ -6,8 +6,10 @@ RabbitMQ消息生产者服务
 import pika
 import json
 import time
+import asyncio
+import threading
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pika.exceptions import AMQPConnectionError, AMQPChannelError
 from ..config.settings import (
     RABBITMQ_HOST,
@@ -31,41 +33,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 等待发布确认时处理网络事件的轮询间隔（秒）：底层通道的确认回调不会提前结束 process_data_events 的等待
+CONFIRM_POLL_INTERVAL = 0.005
+
+
+def serialize_message(message: Dict[str, Any]) -> str:
+    """
+    将告警消息序列化为JSON字符串
+
+    Args:
+        message: 告警消息字典
+
+    Returns:
+        str: JSON字符串
+    """
+    return json.dumps(message, ensure_ascii=False, default=str)
+
+
+def connection_parameters() -> pika.ConnectionParameters:
+    """
+    构建RabbitMQ连接参数
+
+    Returns:
+        pika.ConnectionParameters: 连接参数
+    """
+    credentials = pika.PlainCredentials(
+        username=RABBITMQ_USERNAME,
+        password=RABBITMQ_PASSWORD
+    )
+
+    return pika.ConnectionParameters(
+        host=RABBITMQ_HOST,
+        port=RABBITMQ_PORT,
+        virtual_host=RABBITMQ_VIRTUAL_HOST,
+        credentials=credentials,
+        heartbeat=600,
+        blocked_connection_timeout=300
+    )
+
+
+def message_properties() -> pika.BasicProperties:
+    """告警消息的AMQP属性"""
+    return pika.BasicProperties(
+        delivery_mode=2,  # 消息持久化
+        content_type='application/json',
+        content_encoding='utf-8'
+    )
+
 
 class RabbitMQProducer:
     """RabbitMQ消息生产者类"""
 
-    def __init__(self):
-        """初始化RabbitMQ生产者"""
+    def __init__(self, confirm: bool = False):
+        """
+        初始化RabbitMQ生产者
+
+        Args:
+            confirm: 是否启用发布确认（publisher confirms），启用后 publish_batch 整批写出后统一等待服务器确认
+        """
         self.connection = None
         self.channel = None
         self.connected = False
+        self.confirm = confirm
+        # 发布确认状态：下一条消息的 delivery_tag 与 {delivery_tag: 确认结果（None表示尚未确认）}
+        self._next_tag = 1
+        self._confirms: Dict[int, Optional[bool]] = {}
+        # BlockingConnection 不是线程安全的，同一生产者在多个线程（如线程池）中使用时串行访问连接
+        self._lock = threading.RLock()
         # 延迟连接，在实际使用时才创建连接
         # self._connect()
 
-    def _connect(self):
-        """建立与RabbitMQ服务器的连接"""
+    def _connect(self, retries: Optional[int] = None):
+        """
+        建立与RabbitMQ服务器的连接
+
+        Args:
+            retries: 最大尝试次数，默认使用 RABBITMQ_CONNECTION_RETRIES；
+                后台发布线程传入1，由调用方自行做退避，避免在此处阻塞等待
+        """
+        retries = RABBITMQ_CONNECTION_RETRIES if retries is None else retries
         retry_count = 0
 
-        while retry_count < RABBITMQ_CONNECTION_RETRIES:
+        while retry_count < retries:
             try:
-                # 创建连接参数
-                credentials = pika.PlainCredentials(
-                    username=RABBITMQ_USERNAME,
-                    password=RABBITMQ_PASSWORD
-                )
-
-                parameters = pika.ConnectionParameters(
-                    host=RABBITMQ_HOST,
-                    port=RABBITMQ_PORT,
-                    virtual_host=RABBITMQ_VIRTUAL_HOST,
-                    credentials=credentials,
-                    heartbeat=600,
-                    blocked_connection_timeout=300
-                )
-
                 # 建立连接
-                self.connection = pika.BlockingConnection(parameters)
+                self.connection = pika.BlockingConnection(connection_parameters())
                 self.channel = self.connection.channel()
 
                 # 声明交换机
@@ -88,15 +140,19 @@ class RabbitMQProducer:
                     routing_key=RABBITMQ_ROUTING_KEY
                 )
 
+                # 启用发布确认
+                if self.confirm:
+                    self._enable_confirms()
+
                 self.connected = True
                 logger.info("成功连接到RabbitMQ服务器")
                 return
 
             except (AMQPConnectionError, AMQPChannelError) as e:
                 retry_count += 1
-                logger.error(f"连接RabbitMQ失败 (尝试 {retry_count}/{RABBITMQ_CONNECTION_RETRIES}): {str(e)}")
+                logger.error(f"连接RabbitMQ失败 (尝试 {retry_count}/{retries}): {str(e)}")
 
-                if retry_count < RABBITMQ_CONNECTION_RETRIES:
+                if retry_count < retries:
                     logger.info(f"将在 {RABBITMQ_CONNECTION_RETRY_DELAY} 秒后重试...")
                     time.sleep(RABBITMQ_CONNECTION_RETRY_DELAY)
                 else:
@@ -104,6 +160,40 @@ class RabbitMQProducer:
                     self.connected = False
                     raise
 
+    def _enable_confirms(self, timeout: float = 30.0):
+        """
+        在通道上开启发布确认，确认帧由 _on_delivery_confirmation 按 delivery_tag 记录
+
+        BlockingChannel.confirm_delivery 会让每次 basic_publish 都阻塞等待该消息的确认（每条消息一次往返），
+        这里直接在底层通道上开启确认模式，发布时不等待，由 publish_batch 整批写出后统一等待
+
+        Args:
+            timeout: 等待服务器 Confirm.SelectOk 的最长时间（秒）
+        """
+        selected = []
+        self.channel._impl.confirm_delivery(
+            ack_nack_callback=self._on_delivery_confirmation,
+            callback=lambda _frame: selected.append(True)
+        )
+        deadline = time.monotonic() + timeout
+        while not selected:
+            if time.monotonic() >= deadline:
+                raise AMQPChannelError("等待发布确认模式开启超时")
+            self.connection.process_data_events(time_limit=CONFIRM_POLL_INTERVAL)
+        self._next_tag = 1
+        self._confirms = {}
+
+    def _on_delivery_confirmation(self, method_frame):
+        """记录服务器的 Basic.Ack / Basic.Nack（multiple 为批量确认所有不大于该tag的消息）"""
+        method = method_frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        if method.multiple:
+            tags = [tag for tag, result in self._confirms.items() if tag <= method.delivery_tag and result is None]
+        else:
+            tags = [method.delivery_tag] if method.delivery_tag in self._confirms else []
+        for tag in tags:
+            self._confirms[tag] = acked
+
     def _ensure_connection(self):
         """确保连接有效，无效则重新连接"""
         if not self.connected or not self.connection or self.connection.is_closed or not self.channel or self.channel.is_closed:
@@ -112,7 +202,7 @@ class RabbitMQProducer:
 
     def send_message(self, message: Dict[str, Any]) -> bool:
         """
-        发送消息到RabbitMQ队列
+        发送消息到RabbitMQ队列（阻塞调用线程，在异步接口中请使用 send_message_async）
 
         Args:
             message: 要发送的消息字典
@@ -120,23 +210,44 @@ class RabbitMQProducer:
         Returns:
             bool: 消息发送是否成功
         """
+        with self._lock:
+            return self._send_message(message)
+
+    async def send_message_async(self, message: Dict[str, Any]) -> bool:
+        """
+        send_message 的异步版本，在线程池中执行，不阻塞事件循环
+
+        Args:
+            message: 要发送的消息字典
+
+        Returns:
+            bool: 消息发送是否成功
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send_message, message)
+
+    def _send_message(self, message: Dict[str, Any]) -> bool:
+        """发送消息到RabbitMQ队列（调用方持有连接锁）"""
         try:
+            # 将消息序列化为JSON
+            message_body = serialize_message(message)
+
+            if self.confirm:
+                # 启用发布确认时以服务器确认为准
+                if self.publish_batch([message_body]) != 1:
+                    raise AMQPChannelError("消息未被服务器确认")
+                logger.info(f"消息发送成功: {message_body[:100]}...")
+                return True
+
             # 确保连接有效
             self._ensure_connection()
 
-            # 将消息序列化为JSON
-            message_body = json.dumps(message, ensure_ascii=False, default=str)
-
             # 发送消息
             self.channel.basic_publish(
                 exchange=RABBITMQ_EXCHANGE,
                 routing_key=RABBITMQ_ROUTING_KEY,
                 body=message_body,
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # 消息持久化
-                    content_type='application/json',
-                    content_encoding='utf-8'
-                )
+                properties=message_properties()
             )
 
             logger.info(f"消息发送成功: {message_body[:100]}...")
@@ -148,8 +259,197 @@ class RabbitMQProducer:
             self.connected = False
             return False
 
+    def publish_batch(self, bodies: List[str], timeout: float = 30.0) -> int:
+        """
+        在同一通道上连续发布一批已序列化的消息
+
+        启用发布确认时，整批消息连续写出后统一等待服务器确认（一批一次往返），每条消息在服务器确认后才计为成功。
+        返回值按顺序计数：从第一条未确认（被拒绝、连接异常或超时）的消息开始，
+        之后的消息（从 bodies[返回值] 开始）均视为未发布，由调用方决定重发或落盘。
+
+        Args:
+            bodies: JSON序列化后的消息体列表
+            timeout: 等待整批确认的最长时间（秒）
+
+        Returns:
+            int: 按顺序已成功发布（已确认）的消息数量
+        """
+        with self._lock:
+            return self._publish_batch(bodies, timeout)
+
+    def _publish_batch(self, bodies: List[str], timeout: float) -> int:
+        """连续发布一批消息并统一等待确认（调用方持有连接锁）"""
+        self._ensure_connection()
+
+        properties = message_properties()
+
+        tags = []
+        written = 0
+        try:
+            for body in bodies:
+                if self.confirm:
+                    # 确认模式下 delivery_tag 从1开始按发布顺序递增；先登记再发布，
+                    # 发布时写出数据的同时会处理已到达的确认帧
+                    self._confirms[self._next_tag] = None
+                    tags.append(self._next_tag)
+                    self._next_tag += 1
+                self.channel.basic_publish(
+                    exchange=RABBITMQ_EXCHANGE,
+                    routing_key=RABBITMQ_ROUTING_KEY,
+                    body=body,
+                    properties=properties
+                )
+                written += 1
+
+            # 整批写出后统一等待确认
+            deadline = time.monotonic() + timeout
+            while any(self._confirms[tag] is None for tag in tags):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"等待发布确认超时，{sum(self._confirms[t] is None for t in tags)} 条消息未确认")
+                self.connection.process_data_events(time_limit=min(remaining, CONFIRM_POLL_INTERVAL))
+        except Exception as e:
+            logger.error(f"批量发布失败（已写出 {written}/{len(bodies)} 条）: {str(e)}")
+            # 重置连接状态，下次发布时会重新连接
+            self.connected = False
+
+        if not self.confirm:
+            return written
+
+        results = [self._confirms.pop(tag, None) for tag in tags]
+        published = 0
+        for acked in results:
+            if acked is not True:
+                break
+            published += 1
+        if published < len(results):
+            logger.error(f"批量发布第 {published + 1}/{len(bodies)} 条消息未被服务器确认")
+        return published
+
+    def publish_pipelined(self, bodies: List[str], timeout: float = 60.0) -> List[bool]:
+        """
+        在一个独立连接的单个通道上流水线式发布一批消息，并根据发布确认返回每条消息的结果
+
+        所有消息连续写出，不等待逐条往返；服务器的 Basic.Ack / Basic.Nack（含 multiple 批量确认）
+        按 delivery_tag 回填到对应消息。该方法阻塞调用线程直到全部确认、连接失败或超时，
+        在异步接口中请使用 publish_pipelined_async。
+
+        Args:
+            bodies: JSON序列化后的消息体列表
+            timeout: 等待全部确认的最长时间（秒），超时未确认的消息视为失败
+
+        Returns:
+            List[bool]: 与 bodies 一一对应的确认结果
+        """
+        results = [False] * len(bodies)
+        if not bodies:
+            return results
+
+        pending = {}  # {delivery_tag: 消息下标}
+        state = {"channel": None, "lowest_tag": 1}
+
+        def on_connection_open(connection):
+            connection.channel(on_open_callback=on_channel_open)
+
+        def on_channel_open(channel):
+            state["channel"] = channel
+            channel.add_on_close_callback(lambda ch, reason: connection.is_open and connection.close())
+            channel.confirm_delivery(ack_nack_callback=on_delivery_confirmation, callback=on_confirm_selected)
+
+        def on_confirm_selected(_frame):
+            state["channel"].exchange_declare(
+                exchange=RABBITMQ_EXCHANGE,
+                exchange_type=RABBITMQ_EXCHANGE_TYPE,
+                durable=True,
+                callback=on_exchange_declared
+            )
+
+        def on_exchange_declared(_frame):
+            state["channel"].queue_declare(
+                queue=RABBITMQ_QUEUE,
+                durable=RABBITMQ_MESSAGE_DURABLE,
+                callback=on_queue_declared
+            )
+
+        def on_queue_declared(_frame):
+            state["channel"].queue_bind(
+                queue=RABBITMQ_QUEUE,
+                exchange=RABBITMQ_EXCHANGE,
+                routing_key=RABBITMQ_ROUTING_KEY,
+                callback=publish_all
+            )
+
+        def publish_all(_frame):
+            # 确认模式下 delivery_tag 从1开始按发布顺序递增
+            channel = state["channel"]
+            properties = message_properties()
+            for index, body in enumerate(bodies):
+                channel.basic_publish(
+                    exchange=RABBITMQ_EXCHANGE,
+                    routing_key=RABBITMQ_ROUTING_KEY,
+                    body=body,
+                    properties=properties
+                )
+                pending[index + 1] = index
+
+        def on_delivery_confirmation(method_frame):
+            method = method_frame.method
+            acked = isinstance(method, pika.spec.Basic.Ack)
+            tag = method.delivery_tag
+            if method.multiple:
+                # 批量确认：所有不大于tag的未确认消息
+                for t in range(state["lowest_tag"], tag + 1):
+                    index = pending.pop(t, None)
+                    if index is not None:
+                        results[index] = acked
+                state["lowest_tag"] = max(state["lowest_tag"], tag + 1)
+            else:
+                index = pending.pop(tag, None)
+                if index is not None:
+                    results[index] = acked
+            if not pending and connection.is_open:
+                connection.close()
+
+        def on_timeout():
+            logger.error(f"流水线发布超时，{len(pending)} 条消息未收到确认")
+            if connection.is_open:
+                connection.close()
+
+        def on_open_error(_connection, error):
+            logger.error(f"流水线发布连接RabbitMQ失败: {str(error)}")
+            connection.ioloop.stop()
+
+        connection = pika.SelectConnection(
+            connection_parameters(),
+            on_open_callback=on_connection_open,
+            on_open_error_callback=on_open_error,
+            on_close_callback=lambda _connection, _reason: connection.ioloop.stop()
+        )
+        connection.ioloop.call_later(timeout, on_timeout)
+        connection.ioloop.start()
+        return results
+
+    async def publish_pipelined_async(self, bodies: List[str], timeout: float = 60.0) -> List[bool]:
+        """
+        publish_pipelined 的异步版本，在线程池中执行，不阻塞事件循环
+
+        Args:
+            bodies: JSON序列化后的消息体列表
+            timeout: 等待全部确认的最长时间（秒）
+
+        Returns:
+            List[bool]: 与 bodies 一一对应的确认结果
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.publish_pipelined, bodies, timeout)
+
     def close(self):
         """关闭RabbitMQ连接"""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        """关闭RabbitMQ连接（调用方持有连接锁）"""
         if self.connected and self.connection and not self.connection.is_closed:
             try:
                 self.connection.close()
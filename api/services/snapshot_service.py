@@ -0,0 +1,237 @@
+"""
+告警抓拍服务
+视频帧循环只把帧的引用连同告警消息交给后台线程，由后台线程裁剪告警区域、
+编码缩略图和整帧JPEG并写入按内容寻址的本地存储，填好图片URL后再发布告警消息
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import logging
+from typing import Dict, Any, Optional, Sequence, Callable, Tuple
+
+import cv2
+import numpy as np
+
+from .alarm_publisher import alarm_publisher
+from .alarm_store import alarm_store
+from .alarm_bus import alarm_bus
+from .subscription_service import subscription_service
+from ..config.settings import (
+    SNAPSHOT_DIR,
+    SNAPSHOT_URL_PREFIX,
+    SNAPSHOT_QUEUE_SIZE,
+    SNAPSHOT_THUMB_SIZE,
+    SNAPSHOT_JPEG_QUALITY,
+    SNAPSHOT_CROP_MARGIN
+)
+
+logger = logging.getLogger(__name__)
+
+
+def deliver_alarm(message: Dict[str, Any]) -> bool:
+    """
+    告警消息的最终投递：写入告警库，推送给实时订阅者和GA/T 1400订阅者，并提交到后台告警发布队列
+
+    Args:
+        message: 已填好图片URL的告警消息
+
+    Returns:
+        bool: 是否成功提交到后台告警发布队列
+    """
+    alarm_store.add(message)
+    alarm_bus.publish(message)
+    subscription_service.dispatch(message)
+    return alarm_publisher.publish(message)
+
+
+class SnapshotService:
+    """后台告警抓拍器"""
+
+    def __init__(self,
+                 store_dir: str = SNAPSHOT_DIR,
+                 url_prefix: str = SNAPSHOT_URL_PREFIX,
+                 queue_size: int = SNAPSHOT_QUEUE_SIZE,
+                 thumb_size: int = SNAPSHOT_THUMB_SIZE,
+                 jpeg_quality: int = SNAPSHOT_JPEG_QUALITY,
+                 crop_margin: float = SNAPSHOT_CROP_MARGIN,
+                 publish: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        """
+        初始化后台告警抓拍器
+
+        Args:
+            store_dir: 图片存储目录，文件名为图片内容的SHA-256
+            url_prefix: 图片URL前缀
+            queue_size: 待抓拍队列容量，队列满时告警消息不带图片直接发布
+            thumb_size: 缩略图长边像素
+            jpeg_quality: JPEG编码质量
+            crop_margin: 裁剪告警区域时四周外扩的比例
+            publish: 告警消息发布函数，默认写入告警库、推送给实时订阅者并提交到后台告警发布队列
+        """
+        self.store_dir = store_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thumb_size = thumb_size
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+        self.crop_margin = crop_margin
+        self.publish = publish or deliver_alarm
+
+        # 进行中事件的抓拍结果 {事件ID: (整帧URL, 缩略图URL)}，update/close告警无新画面时沿用
+        self.incident_images: Dict[str, Tuple[str, str]] = {}
+
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # 统计信息
+        self.stats = {"submitted": 0, "captured": 0, "stored": 0, "skipped": 0, "failed": 0}
+
+    def start(self):
+        """启动后台抓拍线程（首次提交时自动调用）"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="alarm-snapshot", daemon=True)
+                self._thread.start()
+
+    def submit(self, message: Dict[str, Any], frame: Optional[np.ndarray] = None,
+               region: Optional[Sequence[float]] = None, incident_id: Optional[str] = None,
+               final: bool = False) -> bool:
+        """
+        非阻塞地提交一条待抓拍的告警消息
+
+        单个后台线程按提交顺序处理，同一事件的open/update/close告警保持先后顺序
+
+        Args:
+            message: 告警消息字典，抓拍完成后填入image字段
+            frame: 视频帧的引用（调用方在提交后不得再修改该帧），None表示无需抓拍
+            region: 告警区域 [x1, y1, x2, y2]，用于裁剪缩略图，None表示整帧
+            incident_id: 告警事件ID，无新画面时沿用该事件已有的抓拍
+            final: 事件是否已结束（close告警），处理后释放该事件的抓拍记录
+
+        Returns:
+            bool: 是否成功入队（队列已满时消息不带图片直接发布，返回False）
+        """
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait((message, frame, region, incident_id, final))
+            self.stats["submitted"] += 1
+            return True
+        except queue.Full:
+            self.stats["skipped"] += 1
+            self.publish(message)
+            return False
+
+    def stop(self, timeout: float = 5.0):
+        """
+        处理完已提交的消息后停止后台线程
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """后台抓拍主循环"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            message, frame, region, incident_id, final = item
+            try:
+                self._attach_images(message, frame, region, incident_id, final)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"告警抓拍失败，消息不带图片发布: {str(e)}")
+            self.publish(message)
+
+    def _attach_images(self, message: Dict[str, Any], frame: Optional[np.ndarray],
+                       region: Optional[Sequence[float]], incident_id: Optional[str], final: bool):
+        """抓拍并把图片URL填入告警消息"""
+        if frame is not None:
+            images = self.capture(frame, region)
+            if incident_id:
+                self.incident_images[incident_id] = images
+        else:
+            images = self.incident_images.get(incident_id)
+        if final:
+            self.incident_images.pop(incident_id, None)
+        if images is None:
+            return
+
+        image_url, thumb_url = images
+        message["image"] = image_url
+        ext = json.loads(message.get("ext1") or "{}")
+        ext["thumbnail"] = thumb_url
+        message["ext1"] = json.dumps(ext, ensure_ascii=False)
+
+    def capture(self, frame: np.ndarray, region: Optional[Sequence[float]] = None) -> Tuple[str, str]:
+        """
+        编码整帧和告警区域缩略图并写入存储
+
+        Args:
+            frame: 视频帧
+            region: 告警区域 [x1, y1, x2, y2]
+
+        Returns:
+            tuple: (整帧图片URL, 缩略图URL)
+        """
+        h, w = frame.shape[:2]
+        crop = frame
+        if region is not None:
+            x1, y1, x2, y2 = map(float, region)
+            mx, my = (x2 - x1) * self.crop_margin, (y2 - y1) * self.crop_margin
+            x1, y1 = max(0, int(x1 - mx)), max(0, int(y1 - my))
+            x2, y2 = min(w, int(x2 + mx)), min(h, int(y2 + my))
+            if x2 > x1 and y2 > y1:
+                crop = frame[y1:y2, x1:x2]
+
+        scale = self.thumb_size / max(crop.shape[:2])
+        if scale < 1:
+            crop = cv2.resize(crop, (max(1, int(crop.shape[1] * scale)), max(1, int(crop.shape[0] * scale))),
+                              interpolation=cv2.INTER_AREA)
+
+        image_name = self._store(self._encode(frame))
+        thumb_name = self._store(self._encode(crop))
+        self.stats["captured"] += 1
+        return f"{self.url_prefix}/{image_name}", f"{self.url_prefix}/{thumb_name}"
+
+    def _encode(self, image: np.ndarray) -> bytes:
+        """JPEG编码"""
+        ok, buffer = cv2.imencode(".jpg", image, self.encode_params)
+        if not ok:
+            raise ValueError("JPEG编码失败")
+        return buffer.tobytes()
+
+    def _store(self, data: bytes) -> str:
+        """
+        按内容寻址写入图片，内容相同的图片只存储一份
+
+        Returns:
+            str: 图片文件名（SHA-256 + .jpg）
+        """
+        name = hashlib.sha256(data).hexdigest() + ".jpg"
+        path = self.path_for(name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先写临时文件再原子替换，读取方不会看到写了一半的图片
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.stats["stored"] += 1
+        return name
+
+    def path_for(self, name: str) -> str:
+        """图片文件名对应的存储路径（按哈希前两位分目录）"""
+        return os.path.join(self.store_dir, name[:2], name)
+
+
+# 创建全局后台告警抓拍器实例，进程退出时处理完已提交的消息
+snapshot_service = SnapshotService()
+atexit.register(snapshot_service.stop)
@@ -0,0 +1,486 @@
+"""
+GA/T 1400 订阅通知服务
+订阅持久化保存，并按 (设备, 场景) 建立过滤索引：每条告警只需查找与其设备、场景对应的
+索引项即可得到匹配的订阅，与订阅总数无关。匹配到的告警进入各订阅者的待发送队列，
+由发送线程池通过长连接池按批次推送到订阅者的接收地址，同一订阅者同一时刻只有一个批次在途，
+保证推送顺序；推送失败按指数退避重试，连续失败达到阈值后熔断一段时间
+"""
+
+import atexit
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .alarm_store import scene_type_of, normalize_time
+from ..config.settings import (
+    SUBSCRIPTION_FILE,
+    SUBSCRIPTION_SAVE_INTERVAL,
+    SUBSCRIPTION_QUEUE_SIZE,
+    SUBSCRIPTION_WORKERS,
+    SUBSCRIPTION_BATCH_SIZE,
+    SUBSCRIPTION_MAX_PENDING,
+    SUBSCRIPTION_HTTP_TIMEOUT,
+    SUBSCRIPTION_POOL_HOSTS,
+    SUBSCRIPTION_RETRY_BASE,
+    SUBSCRIPTION_RETRY_MAX,
+    SUBSCRIPTION_BREAKER_THRESHOLD,
+    SUBSCRIPTION_BREAKER_COOLDOWN
+)
+
+logger = logging.getLogger(__name__)
+
+# 过滤索引中表示“不限”的通配项
+ANY = "*"
+
+# 放入待匹配队列、唤醒匹配线程调度新加入的重试的标记
+_WAKEUP = object()
+
+
+class Subscriber:
+    """订阅者的推送状态"""
+
+    def __init__(self, subscription: Dict[str, Any]):
+        self.subscription = subscription
+        # 待推送的 (序号, 通知)
+        self.pending: deque = deque()
+        self.next_seq = 0
+        # 已在就绪队列、在途或等待重试中
+        self.scheduled = False
+        # 连续失败次数与熔断截止时间
+        self.failures = 0
+        self.open_until = 0.0
+        self.stats = {"delivered": 0, "dropped": 0, "failed_attempts": 0}
+
+
+class SubscriptionService:
+    """订阅管理与通知推送"""
+
+    def __init__(self,
+                 subscription_file: str = SUBSCRIPTION_FILE,
+                 save_interval: float = SUBSCRIPTION_SAVE_INTERVAL,
+                 queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+                 workers: int = SUBSCRIPTION_WORKERS,
+                 batch_size: int = SUBSCRIPTION_BATCH_SIZE,
+                 max_pending: int = SUBSCRIPTION_MAX_PENDING,
+                 http_timeout: float = SUBSCRIPTION_HTTP_TIMEOUT,
+                 pool_hosts: int = SUBSCRIPTION_POOL_HOSTS,
+                 retry_base: float = SUBSCRIPTION_RETRY_BASE,
+                 retry_max: float = SUBSCRIPTION_RETRY_MAX,
+                 breaker_threshold: int = SUBSCRIPTION_BREAKER_THRESHOLD,
+                 breaker_cooldown: float = SUBSCRIPTION_BREAKER_COOLDOWN):
+        """
+        初始化订阅通知服务
+
+        Args:
+            subscription_file: 订阅持久化文件
+            save_interval: 订阅变更的写回合并间隔（秒）
+            queue_size: 待匹配告警队列容量，队列满时丢弃告警通知
+            workers: 推送线程数（也是连接池中每个主机的最大连接数）
+            batch_size: 单次推送的最大通知数
+            max_pending: 每个订阅者最多积压的通知数，超出时丢弃最旧的通知
+            http_timeout: 推送请求超时（秒）
+            pool_hosts: 连接池缓存的主机数
+            retry_base: 重试退避初始间隔（秒）
+            retry_max: 重试退避最大间隔（秒）
+            breaker_threshold: 连续失败多少次后熔断
+            breaker_cooldown: 熔断持续时间（秒），之后放行一次试探推送
+        """
+        self.subscription_file = subscription_file
+        self.save_interval = save_interval
+        self.intake = queue.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.http_timeout = http_timeout
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        # 订阅 {订阅ID: 订阅信息} 与推送状态 {订阅ID: Subscriber}
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.subscribers: Dict[str, Subscriber] = {}
+        # 过滤索引 {设备ID或*: {场景类型或*: {订阅ID}}}
+        self.index: Dict[str, Dict[str, Set[str]]] = {}
+
+        # 长连接池，按主机复用连接
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=workers, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # 就绪的订阅者ID，由推送线程消费
+        self.ready: queue.Queue = queue.Queue()
+        # 等待重试的订阅者 [(重试时间, 订阅ID)]
+        self.retry_heap: List[Tuple[float, str]] = []
+        self._version = 0
+        self._saved_version = 0
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+
+        # 统计信息
+        self.stats = {"dispatched": 0, "matched": 0, "delivered": 0, "dropped": 0, "failed_attempts": 0}
+
+        self.load()
+
+    def load(self):
+        """从持久化文件加载订阅并建立过滤索引"""
+        if not os.path.exists(self.subscription_file):
+            return
+        try:
+            with open(self.subscription_file, 'r', encoding='utf-8') as f:
+                subscriptions = json.load(f).get("subscriptions", [])
+        except Exception as e:
+            logger.error(f"加载订阅文件失败: {str(e)}")
+            return
+        with self._lock:
+            for subscription in subscriptions:
+                self._add(subscription)
+            self._saved_version = self._version
+
+    def save(self) -> bool:
+        """
+        把订阅原子地写回持久化文件
+
+        Returns:
+            bool: 是否写入了文件（没有待保存的变更时返回False）
+        """
+        # 匹配线程的定期写回与stop时的写回可能同时进行，串行写入同一个临时文件
+        with self._save_lock:
+            with self._lock:
+                if self._version == self._saved_version:
+                    return False
+                version = self._version
+                subscriptions = list(self.subscriptions.values())
+            os.makedirs(os.path.dirname(os.path.abspath(self.subscription_file)), exist_ok=True)
+            tmp_file = f"{self.subscription_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"subscriptions": subscriptions}, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.subscription_file)
+            with self._lock:
+                self._saved_version = version
+        return True
+
+    def subscribe(self, subscription_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        新建订阅
+
+        Args:
+            subscription_info: 订阅信息，应包含:
+                - receive_addr: 通知接收地址（HTTP URL）
+                - device_ids: 订阅的设备ID列表，不传表示全部设备
+                - scene_types: 订阅的场景类型列表，不传表示全部场景
+                - begin_time / end_time: 订阅有效期，不传表示不限
+                - title: 订阅标题
+
+        Returns:
+            Dict[str, Any]: 保存的订阅
+        """
+        receive_addr = subscription_info.get("receive_addr") or subscription_info.get("ReceiveAddr")
+        if not receive_addr or not str(receive_addr).startswith(("http://", "https://")):
+            raise ValueError("缺少有效的通知接收地址 receive_addr")
+
+        subscription = {
+            "subscription_id": subscription_info.get("subscription_id") or str(uuid.uuid4()),
+            "title": subscription_info.get("title", ""),
+            "receive_addr": receive_addr,
+            "device_ids": list(subscription_info.get("device_ids") or []),
+            "scene_types": list(subscription_info.get("scene_types") or []),
+            "begin_time": normalize_time(subscription_info["begin_time"]) if subscription_info.get("begin_time") else None,
+            "end_time": normalize_time(subscription_info["end_time"]) if subscription_info.get("end_time") else None,
+            "created_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            if subscription["subscription_id"] in self.subscriptions:
+                raise ValueError("订阅ID已存在")
+            self._add(subscription)
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription_id: str) -> Dict[str, Any]:
+        """
+        取消订阅，未推送的通知一并丢弃
+
+        Args:
+            subscription_id: 订阅ID
+
+        Returns:
+            Dict[str, Any]: 被取消的订阅
+        """
+        with self._lock:
+            subscription = self.subscriptions.pop(subscription_id, None)
+            if subscription is None:
+                raise ValueError("订阅不存在")
+            self.subscribers.pop(subscription_id, None)
+            for device_id, scene_type in self._index_keys(subscription):
+                scenes = self.index[device_id]
+                scenes[scene_type].discard(subscription_id)
+                if not scenes[scene_type]:
+                    del scenes[scene_type]
+                if not scenes:
+                    del self.index[device_id]
+            self._version += 1
+        return subscription
+
+    def get_subscriptions(self) -> List[Dict[str, Any]]:
+        """获取全部订阅及其推送状态"""
+        with self._lock:
+            return [dict(subscription,
+                         pending=len(self.subscribers[sid].pending),
+                         circuit_open=self.subscribers[sid].open_until > time.time(),
+                         **self.subscribers[sid].stats)
+                    for sid, subscription in self.subscriptions.items()]
+
+    def _add(self, subscription: Dict[str, Any]):
+        """登记订阅并加入过滤索引（调用方需持有锁）"""
+        subscription_id = subscription["subscription_id"]
+        self.subscriptions[subscription_id] = subscription
+        self.subscribers[subscription_id] = Subscriber(subscription)
+        for device_id, scene_type in self._index_keys(subscription):
+            self.index.setdefault(device_id, {}).setdefault(scene_type, set()).add(subscription_id)
+        self._version += 1
+
+    @staticmethod
+    def _index_keys(subscription: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """订阅在过滤索引中的全部 (设备, 场景) 项"""
+        return [(device_id, scene_type)
+                for device_id in subscription["device_ids"] or [ANY]
+                for scene_type in subscription["scene_types"] or [ANY]]
+
+    def match(self, device_id: str, scene_type: str, alarm_time: Optional[str] = None) -> Set[str]:
+        """
+        查找与告警匹配的订阅
+
+        Args:
+            device_id: 告警设备ID
+            scene_type: 告警场景类型
+            alarm_time: 告警时间，用于检查订阅有效期
+
+        Returns:
+            Set[str]: 匹配的订阅ID
+        """
+        matched = set()
+        for device_key in (device_id, ANY):
+            scenes = self.index.get(device_key)
+            if scenes:
+                matched.update(scenes.get(scene_type, ()))
+                matched.update(scenes.get(ANY, ()))
+        if alarm_time and matched:
+            matched = {sid for sid in matched
+                       if (self.subscriptions[sid]["begin_time"] or "") <= alarm_time
+                       and alarm_time <= (self.subscriptions[sid]["end_time"] or "9999")}
+        return matched
+
+    def dispatch(self, message: Dict[str, Any]) -> bool:
+        """
+        非阻塞地提交一条告警，由后台线程匹配订阅并推送
+
+        Args:
+            message: 告警消息字典
+
+        Returns:
+            bool: 是否已提交（没有订阅或队列已满时返回False）
+        """
+        if not self.subscriptions:
+            return False
+        if not self._threads:
+            self.start()
+        try:
+            self.intake.put_nowait(message)
+            self.stats["dispatched"] += 1
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            logger.warning("订阅通知队列已满，告警通知被丢弃")
+            return False
+
+    def start(self):
+        """启动匹配线程和推送线程（新建订阅时自动调用）"""
+        with self._lock:
+            if self._threads and all(t.is_alive() for t in self._threads):
+                return
+            self._stop_event.clear()
+            self._threads = [threading.Thread(target=self._match_loop, name="subscription-matcher", daemon=True)]
+            self._threads += [threading.Thread(target=self._deliver_loop, name=f"subscription-sender-{i}", daemon=True)
+                              for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        停止后台线程并保存订阅（未推送的通知不再推送）
+
+        Args:
+            timeout: 等待每个线程退出的最长时间（秒）
+        """
+        self._stop_event.set()
+        try:
+            self.intake.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        for _ in range(self.workers):
+            self.ready.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self.save()
+
+    def _match_loop(self):
+        """匹配线程：把告警放入匹配订阅者的待发送队列，并调度到期的重试、写回订阅变更"""
+        last_save = 0.0
+        while not self._stop_event.is_set():
+            now = time.time()
+            with self._lock:
+                while self.retry_heap and self.retry_heap[0][0] <= now:
+                    _, subscription_id = heapq.heappop(self.retry_heap)
+                    self.ready.put(subscription_id)
+                wait = self.retry_heap[0][0] - now if self.retry_heap else self.save_interval
+                dirty = self._version != self._saved_version
+
+            if dirty and now - last_save >= self.save_interval:
+                try:
+                    self.save()
+                except Exception as e:
+                    logger.error(f"保存订阅失败: {str(e)}")
+                last_save = now
+
+            try:
+                message = self.intake.get(timeout=max(0.01, min(wait, self.save_interval)))
+            except queue.Empty:
+                continue
+            # 顺带处理已积压的告警
+            messages = [message]
+            for _ in range(self.intake.qsize()):
+                try:
+                    messages.append(self.intake.get_nowait())
+                except queue.Empty:
+                    break
+            for message in messages:
+                if message is None:
+                    return
+                if message is _WAKEUP:
+                    continue
+                try:
+                    self._enqueue(message)
+                except Exception as e:
+                    logger.error(f"匹配订阅失败: {str(e)}")
+
+    def _enqueue(self, message: Dict[str, Any]):
+        """把一条告警放入匹配订阅者的待发送队列"""
+        device_id = message.get("deviceCode") or ""
+        try:
+            alarm_time = normalize_time(message.get("alarmTime"))
+        except (TypeError, ValueError):
+            alarm_time = None
+        with self._lock:
+            matched = self.match(device_id, scene_type_of(message), alarm_time)
+            self.stats["matched"] += len(matched)
+            for subscription_id in matched:
+                subscriber = self.subscribers[subscription_id]
+                subscriber.pending.append((subscriber.next_seq, message))
+                subscriber.next_seq += 1
+                if len(subscriber.pending) > self.max_pending:
+                    subscriber.pending.popleft()
+                    subscriber.stats["dropped"] += 1
+                    self.stats["dropped"] += 1
+                if not subscriber.scheduled:
+                    subscriber.scheduled = True
+                    self.ready.put(subscription_id)
+
+    def _deliver_loop(self):
+        """推送线程：每次取一个就绪的订阅者，推送一个批次"""
+        while True:
+            subscription_id = self.ready.get()
+            if subscription_id is None or self._stop_event.is_set():
+                break
+            with self._lock:
+                subscriber = self.subscribers.get(subscription_id)
+                if subscriber is None:
+                    continue
+                batch = [subscriber.pending[i] for i in range(min(self.batch_size, len(subscriber.pending)))]
+            if not batch:
+                with self._lock:
+                    subscriber.scheduled = False
+                continue
+
+            ok = self._post(subscriber.subscription, [message for _, message in batch])
+
+            with self._lock:
+                if ok:
+                    # 积压溢出时队首可能已被丢弃，按序号移除已推送的通知
+                    last_seq = batch[-1][0]
+                    while subscriber.pending and subscriber.pending[0][0] <= last_seq:
+                        subscriber.pending.popleft()
+                    subscriber.failures = 0
+                    subscriber.open_until = 0.0
+                    subscriber.stats["delivered"] += len(batch)
+                    self.stats["delivered"] += len(batch)
+                    if subscriber.pending:
+                        self.ready.put(subscription_id)
+                    else:
+                        subscriber.scheduled = False
+                else:
+                    subscriber.failures += 1
+                    subscriber.stats["failed_attempts"] += 1
+                    self.stats["failed_attempts"] += 1
+                    if subscriber.failures >= self.breaker_threshold:
+                        # 熔断：冷却期内不再推送，之后放行一次试探推送
+                        delay = self.breaker_cooldown
+                        subscriber.open_until = time.time() + delay
+                        if subscriber.failures == self.breaker_threshold:
+                            logger.warning(f"订阅 {subscription_id} 推送连续失败，熔断 {delay:.0f} 秒")
+                    else:
+                        delay = min(self.retry_max, self.retry_base * (2 ** (subscriber.failures - 1)))
+                    heapq.heappush(self.retry_heap, (time.time() + delay, subscription_id))
+                    if self.retry_heap[0][1] == subscription_id:
+                        # 新的重试比匹配线程当前等待的截止时间更早，唤醒匹配线程重新计算等待时间
+                        try:
+                            self.intake.put_nowait(_WAKEUP)
+                        except queue.Full:
+                            pass  # 队列中已有告警，匹配线程处理完即会调度重试
+
+    def _post(self, subscription: Dict[str, Any], messages: List[Dict[str, Any]]) -> bool:
+        """把一批通知推送到订阅者的接收地址"""
+        now = datetime.now().strftime("%Y%m%d%H%M%S")
+        body = {
+            "SubscribeNotificationListObject": {
+                "SubscribeNotificationObject": [{
+                    "NotificationID": message.get("code") or str(uuid.uuid4()),
+                    "SubscribeID": subscription["subscription_id"],
+                    "Title": subscription["title"],
+                    "TriggerTime": now,
+                    "AlarmObject": message
+                } for message in messages]
+            }
+        }
+        try:
+            response = self.session.post(
+                subscription["receive_addr"],
+                data=json.dumps(body, ensure_ascii=False).encode("utf-8"),
+                headers={"Content-Type": "application/json;charset=UTF-8"},
+                timeout=self.http_timeout
+            )
+            return 200 <= response.status_code < 300
+        except requests.RequestException as e:
+            logger.debug(f"订阅 {subscription['subscription_id']} 推送失败: {str(e)}")
+            return False
+
+
+# 创建全局订阅通知服务实例，进程退出时保存订阅
+subscription_service = SubscriptionService()
+atexit.register(subscription_service.stop)
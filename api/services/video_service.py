@@ -7,7 +7,6 @@ import os
 import uuid
 from typing import List, Dict, Any, Optional
 from ..config.settings import UPLOAD_DIR, PROCESSED_DIR
-from ..algorithms import VideoProcessingCoordinator
 
 
 class VideoService:
@@ -136,6 +135,8 @@ class VideoService:
                             loitering_time_threshold: int = 20,
                             camera_id: str = "default"):
         """后台处理视频任务"""
+        from ..algorithms import VideoProcessingCoordinator
+
         try:
             # 初始化视频处理器
             processor = VideoProcessingCoordinator(camera_id=camera_id)
@@ -170,6 +171,8 @@ class VideoService:
                                       threshold: Optional[int] = None,
                                       camera_id: str = "default"):
         """离岗检测处理任务"""
+        from ..algorithms import VideoProcessingCoordinator
+
         try:
             # 初始化视频处理器
             processor = VideoProcessingCoordinator(camera_id=camera_id)
@@ -202,6 +205,8 @@ class VideoService:
                                        threshold: Optional[int] = None,
                                        camera_id: str = "default"):
         """聚集检测处理任务"""
+        from ..algorithms import VideoProcessingCoordinator
+
         try:
             # 初始化视频处理器
             processor = VideoProcessingCoordinator(camera_id=camera_id)
@@ -235,6 +240,8 @@ class VideoService:
                                        iou_threshold: Optional[float] = None,
                                        camera_id: str = "default"):
         """横幅检测处理任务"""
+        from ..algorithms import VideoProcessingCoordinator
+
         try:
             # 初始化视频处理器
             processor = VideoProcessingCoordinator()
@@ -0,0 +1,4 @@
+"""
+API测试模块
+在仓库根目录运行: python -m pytest api/tests
+"""
@@ -0,0 +1,233 @@
+"""
+API测试公共配置
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pika import frame, spec
+
+# API通过 ultralytics 包使用仓库内的YOLOv12
+YOLOV12_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "yolov12")
+if YOLOV12_DIR not in sys.path:
+    sys.path.insert(0, YOLOV12_DIR)
+
+
+@pytest.fixture(scope="session")
+def weights(tmp_path_factory):
+    """
+    生成测试用的yolov12n权重文件
+
+    未训练的模型没有任何检测结果，把检测头类别0（人员）的偏置调高，使人员场景和横幅场景都有检测框可比较
+    """
+    from ultralytics import YOLO
+
+    model = YOLO("yolov12n.yaml")
+    for branch in model.model.model[-1].cv3:
+        branch[-1].bias.data[0] = 1.0
+    path = tmp_path_factory.mktemp("weights") / "yolov12n.pt"
+    model.save(path)
+    return str(path)
+
+
+class AMQPBroker:
+    """
+    进程内的最小AMQP 0-9-1服务端，基于pika的帧编解码实现
+
+    支持连接握手、通道、交换机/队列声明与绑定、发布确认；每次读到的数据处理完后
+    用一个 multiple=True 的 Basic.Ack 批量确认（与真实服务器合并确认的行为一致），
+    nack_every 大于0时每隔nack_every条消息拒绝一条，confirm_delay 模拟发出确认前的网络往返延迟（秒）
+    """
+
+    def __init__(self, nack_every: int = 0, confirm_delay: float = 0.0):
+        self.nack_every = nack_every
+        self.confirm_delay = confirm_delay
+        # 收到的消息体（按接收顺序）
+        self.received = []
+        # 发出确认帧的次数，用于统计发布方等待确认的往返次数
+        self.confirm_rounds = 0
+        self.sock = socket.socket()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        """接受连接，每个连接一个服务线程"""
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        """处理一个客户端连接"""
+        send = lambda channel, method: conn.sendall(frame.Method(channel, method).marshal())
+        buffer = b""
+        confirm, tags, body, size = set(), {}, b"", 0
+        while True:
+            try:
+                data = conn.recv(1 << 16)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            confirms = {}  # {通道: (最大tag, [被拒绝的tag])}
+            while True:
+                n, received = frame.decode_frame(buffer)
+                if not received:
+                    break
+                buffer = buffer[n:]
+                if isinstance(received, frame.ProtocolHeader):
+                    send(0, spec.Connection.Start(
+                        server_properties={"capabilities": {"publisher_confirms": True, "basic.nack": True}},
+                        mechanisms=b"PLAIN", locales=b"en_US"))
+                    continue
+                channel = received.channel_number
+                if isinstance(received, frame.Method):
+                    method = received.method
+                    if isinstance(method, spec.Connection.StartOk):
+                        send(0, spec.Connection.Tune(0, 131072, 0))
+                    elif isinstance(method, spec.Connection.Open):
+                        send(0, spec.Connection.OpenOk())
+                    elif isinstance(method, spec.Connection.Close):
+                        send(0, spec.Connection.CloseOk())
+                        conn.close()
+                        return
+                    elif isinstance(method, spec.Channel.Open):
+                        send(channel, spec.Channel.OpenOk())
+                        tags[channel] = 0
+                    elif isinstance(method, spec.Channel.Close):
+                        send(channel, spec.Channel.CloseOk())
+                    elif isinstance(method, spec.Confirm.Select):
+                        confirm.add(channel)
+                        send(channel, spec.Confirm.SelectOk())
+                    elif isinstance(method, spec.Exchange.Declare):
+                        send(channel, spec.Exchange.DeclareOk())
+                    elif isinstance(method, spec.Queue.Declare):
+                        send(channel, spec.Queue.DeclareOk(method.queue, 0, 0))
+                    elif isinstance(method, spec.Queue.Bind):
+                        send(channel, spec.Queue.BindOk())
+                    elif isinstance(method, spec.Basic.Publish):
+                        body = b""
+                elif isinstance(received, (frame.Header, frame.Body)):
+                    if isinstance(received, frame.Header):
+                        size = received.body_size
+                    else:
+                        body += received.fragment
+                    if len(body) < size:
+                        continue
+                    # 一条消息接收完毕
+                    self.received.append(body)
+                    tags[channel] += 1
+                    if channel in confirm:
+                        last, nacks = confirms.get(channel, (0, []))
+                        if self.nack_every and tags[channel] % self.nack_every == 0:
+                            nacks.append(tags[channel])
+                        confirms[channel] = (tags[channel], nacks)
+            if confirms and self.confirm_delay:
+                time.sleep(self.confirm_delay)
+            for channel, (last, nacks) in confirms.items():
+                self.confirm_rounds += 1
+                for tag in nacks:
+                    send(channel, spec.Basic.Nack(tag, False, False))
+                send(channel, spec.Basic.Ack(last, True))
+
+    def close(self):
+        """停止接受新连接"""
+        self.sock.close()
+
+
+@pytest.fixture
+def amqp_broker(monkeypatch):
+    """启动进程内AMQP服务端，并让RabbitMQ生产者连接到它"""
+    from api.services import rabbitmq_service
+
+    def start(nack_every: int = 0, confirm_delay: float = 0.0) -> AMQPBroker:
+        broker = AMQPBroker(nack_every, confirm_delay)
+        brokers.append(broker)
+        monkeypatch.setattr(rabbitmq_service, "RABBITMQ_HOST", "127.0.0.1")
+        monkeypatch.setattr(rabbitmq_service, "RABBITMQ_PORT", broker.port)
+        return broker
+
+    brokers = []
+    yield start
+    for broker in brokers:
+        broker.close()
+
+
+class HTTPReceiver:
+    """
+    进程内的订阅通知接收端（GA/T 1400 订阅者的接收地址）
+
+    记录每次推送请求；前 fail 次请求返回500，hold 被清除时请求在记录后阻塞，直到 hold 被设置
+    """
+
+    def __init__(self, fail: int = 0):
+        self.fail = fail
+        # 收到的请求 [(接收时间, 路径, 状态码, 告警编号列表)]
+        self.requests = []
+        self.hold = threading.Event()
+        self.hold.set()
+        self._lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                notifications = body["SubscribeNotificationListObject"]["SubscribeNotificationObject"]
+                with receiver._lock:
+                    status = 500 if len(receiver.requests) < receiver.fail else 200
+                    receiver.requests.append((time.monotonic(), self.path, status,
+                                              [n["AlarmObject"]["code"] for n in notifications]))
+                receiver.hold.wait()
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        """接收地址"""
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def delivered(self, path: str) -> list:
+        """按接收顺序返回推送成功的告警编号"""
+        with self._lock:
+            return [code for _, p, status, codes in self.requests if p == path and status == 200 for code in codes]
+
+    def close(self):
+        """停止服务"""
+        self.hold.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def http_receiver():
+    """启动进程内订阅通知接收端"""
+    def start(fail: int = 0) -> HTTPReceiver:
+        receiver = HTTPReceiver(fail)
+        receivers.append(receiver)
+        return receiver
+
+    receivers = []
+    yield start
+    for receiver in receivers:
+        receiver.close()
@@ -0,0 +1,94 @@
+"""
+告警发布/订阅总线测试（断线重连后从回放环补发）
+"""
+
+import asyncio
+import threading
+
+from api.services.alarm_bus import AlarmBus
+
+
+def alarm(i, device="cam-1", scene="leave"):
+    """构造一条告警消息"""
+    return {"code": str(i), "deviceCode": device, "sceneType": scene}
+
+
+def drain(subscriber):
+    """取出订阅者队列中已有的全部事件ID"""
+    ids = []
+    while not subscriber.queue.empty():
+        frame = subscriber.queue.get_nowait()
+        ids.append(None if frame is None else int(frame.split(b"\n", 1)[0][len(b"id: "):]))
+    return ids
+
+
+def test_resume_from_mid_ring():
+    """从回放环中间的事件ID重连，恰好补发之后的事件，与随后的实时分发之间不重复"""
+    bus = AlarmBus(queue_size=100, replay_size=50)
+    ids = [bus.publish(alarm(i)) for i in range(20)]
+    assert ids == list(range(ids[0], ids[0] + 20))
+
+    async def reconnect():
+        subscriber, gap = bus.subscribe(last_event_id=ids[9])
+        assert not gap
+        replayed = drain(subscriber)
+
+        # 其他线程继续发布，分发在事件循环中执行
+        live = []
+        thread = threading.Thread(target=lambda: live.extend(bus.publish(alarm(i)) for i in range(20, 30)))
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await asyncio.sleep(0.05)
+        return replayed, drain(subscriber), live
+
+    replayed, received, live = asyncio.run(reconnect())
+    assert replayed == ids[10:]
+    assert received == live
+
+
+def test_resume_with_pending_fanout():
+    """重连时已调度但尚未执行的分发不会与回放的事件重复"""
+    bus = AlarmBus(queue_size=100, replay_size=50)
+
+    async def reconnect():
+        online, _ = bus.subscribe()
+        # 在事件循环线程中连续发布，分发回调已调度但尚未执行
+        ids = [bus.publish(alarm(i)) for i in range(10)]
+        subscriber, gap = bus.subscribe(last_event_id=ids[4])
+        await asyncio.sleep(0.05)
+        return ids, gap, drain(online), drain(subscriber)
+
+    ids, gap, online, received = asyncio.run(reconnect())
+    assert not gap
+    assert online == ids
+    assert received == ids[5:]
+
+
+def test_resume_gap_and_filter():
+    """断开期间的告警超出回放环时提示缺口，补发只包含符合订阅条件的事件"""
+    bus = AlarmBus(queue_size=100, replay_size=10)
+    ids = [bus.publish(alarm(i, f"cam-{i % 2}")) for i in range(30)]
+
+    async def reconnect(last_event_id, camera_ids=None):
+        subscriber, gap = bus.subscribe(camera_ids, last_event_id=last_event_id)
+        bus.unsubscribe(subscriber)
+        return gap, drain(subscriber)
+
+    assert asyncio.run(reconnect(ids[5])) == (True, ids[20:])
+    assert asyncio.run(reconnect(ids[19])) == (False, ids[20:])
+    assert asyncio.run(reconnect(ids[23], ["cam-1"])) == (False, [i for i in ids[24:] if (i - ids[0]) % 2])
+    # 已收到最新事件时无需补发
+    assert asyncio.run(reconnect(ids[-1])) == (False, [])
+
+
+def test_resume_beyond_queue_size():
+    """补发量超过订阅者队列容量时只补发最近的部分并提示缺口"""
+    bus = AlarmBus(queue_size=5, replay_size=50)
+    ids = [bus.publish(alarm(i)) for i in range(20)]
+
+    async def reconnect():
+        return bus.subscribe(last_event_id=ids[2])
+
+    subscriber, gap = asyncio.run(reconnect())
+    assert gap
+    assert drain(subscriber) == ids[-4:]
@@ -0,0 +1,104 @@
+"""
+告警合并引擎测试（使用显式时间）
+"""
+
+from api.services.alarm_engine import AlarmEngine, EVENT_CLOSE, EVENT_OPEN, EVENT_UPDATE
+
+
+def kinds(events):
+    """事件列表中各事件的生命周期类型"""
+    return [e["event"] for e in events]
+
+
+def test_coalesce_and_update():
+    """连续成立的条件合并为一个事件，按更新间隔发送update，条件消失超过合并窗口才关闭"""
+    engine = AlarmEngine(coalesce_window=5.0, update_interval=10.0, rate_limit=0)
+    events = []
+    for t in range(0, 25):
+        events += engine.observe("cam-1", "leave", "roi", True, {"t": t}, now=float(t))
+    assert kinds(events) == [EVENT_OPEN, EVENT_UPDATE, EVENT_UPDATE]
+    assert [e["duration"] for e in events] == [0.0, 10.0, 20.0]
+    assert len({e["incident_id"] for e in events}) == 1
+    assert events[-1]["payload"] == {"t": 20}
+
+    # 合并窗口内条件短暂消失后再次成立，仍是同一事件
+    assert engine.observe("cam-1", "leave", "roi", False, now=27.0) == []
+    assert engine.observe("cam-1", "leave", "roi", True, now=28.0) == []
+    assert engine.observe("cam-1", "leave", "roi", False, now=32.0) == []
+
+    close = engine.observe("cam-1", "leave", "roi", False, now=33.0)
+    assert kinds(close) == [EVENT_CLOSE]
+    assert close[0]["incident_id"] == events[0]["incident_id"]
+    assert close[0]["duration"] == 28.0 and close[0]["observations"] == 26
+    assert not engine.is_open("cam-1", "leave", "roi")
+
+    # 关闭后再次成立是新事件
+    reopened = engine.observe("cam-1", "leave", "roi", True, now=34.0)
+    assert kinds(reopened) == [EVENT_OPEN] and reopened[0]["incident_id"] != events[0]["incident_id"]
+    assert engine.stats == {"observations": 30, "opened": 2, "updated": 2, "closed": 1, "suppressed": 0}
+
+
+def test_update_interval_disabled():
+    """更新间隔为0时持续期间不发送update"""
+    engine = AlarmEngine(coalesce_window=1.0, update_interval=0, rate_limit=0)
+    events = []
+    for t in range(100):
+        events += engine.observe("cam-1", "gather", "roi", True, now=float(t))
+    assert kinds(events) == [EVENT_OPEN]
+
+
+def test_sweep_closes_missing_keys():
+    """本帧未上报的目标超出合并窗口后关闭，只影响指定摄像头和场景"""
+    engine = AlarmEngine(coalesce_window=2.0, update_interval=0, rate_limit=0)
+    for key in 1, 2:
+        engine.observe("cam-1", "loitering", key, True, now=0.0)
+    engine.observe("cam-2", "loitering", 1, True, now=0.0)
+
+    assert engine.sweep("cam-1", "loitering", [1], now=1.0) == []
+    closed = engine.sweep("cam-1", "loitering", [1], now=2.0)
+    assert [(e["event"], e["key"]) for e in closed] == [(EVENT_CLOSE, 2)]
+    assert engine.is_open("cam-1", "loitering", 1) and engine.is_open("cam-2", "loitering", 1)
+
+
+def test_rate_limit_token_bucket():
+    """每个摄像头的open/update告警受令牌桶限制，被抑制的事件在令牌补充后补发open，不同摄像头互不影响"""
+    engine = AlarmEngine(coalesce_window=1.0, update_interval=0, rate_limit=3, rate_period=6.0)
+    opened = [engine.observe("cam-1", "loitering", key, True, now=0.0) for key in range(5)]
+    assert [kinds(events) for events in opened] == [[EVENT_OPEN]] * 3 + [[]] * 2
+    assert engine.stats["suppressed"] == 2
+    assert kinds(engine.observe("cam-2", "loitering", 0, True, now=0.0)) == [EVENT_OPEN]
+
+    # 每2秒补充一个令牌，被抑制的事件依次补发open
+    assert engine.observe("cam-1", "loitering", 3, True, now=1.0) == []
+    retried = engine.observe("cam-1", "loitering", 3, True, now=2.0)
+    assert kinds(retried) == [EVENT_OPEN] and retried[0]["start_time"] == 0.0
+    assert engine.observe("cam-1", "loitering", 4, True, now=3.0) == []
+    assert kinds(engine.observe("cam-1", "loitering", 4, True, now=4.0)) == [EVENT_OPEN]
+
+    # 令牌最多积累 rate_limit 个
+    engine.observe("cam-1", "loitering", "late", True, now=100.0)
+    burst = [engine.observe("cam-1", "gather", key, True, now=100.0) for key in range(4)]
+    assert [kinds(events) for events in burst] == [[EVENT_OPEN]] * 2 + [[]] * 2
+
+    # 未发出open的事件关闭时不发送close
+    closed = engine.close_all("cam-1", "gather", now=101.0)
+    assert sorted(e["key"] for e in closed) == [0, 1]
+    assert engine.stats["closed"] == 2 and not engine.is_open("cam-1", "gather", 3)
+
+
+def test_close_all_by_scenario():
+    """close_all 指定场景时只关闭该场景的事件，不指定时关闭摄像头下的全部事件"""
+    engine = AlarmEngine(coalesce_window=30.0, update_interval=0, rate_limit=0)
+    for camera_id in "cam-1", "cam-2":
+        for scenario in "leave", "gather", "banner":
+            engine.observe(camera_id, scenario, "roi", True, now=0.0)
+
+    closed = engine.close_all("cam-1", "gather", now=1.0)
+    assert [(e["event"], e["camera_id"], e["scenario"]) for e in closed] == [(EVENT_CLOSE, "cam-1", "gather")]
+    assert engine.is_open("cam-1", "leave", "roi") and engine.is_open("cam-1", "banner", "roi")
+
+    closed = engine.close_all("cam-1", now=2.0)
+    assert sorted(e["scenario"] for e in closed) == ["banner", "leave"]
+    assert not any(engine.is_open("cam-1", s, "roi") for s in ("leave", "gather", "banner"))
+    assert all(engine.is_open("cam-2", s, "roi") for s in ("leave", "gather", "banner"))
+    assert engine.close_all("cam-1", now=3.0) == []
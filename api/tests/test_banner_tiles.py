@@ -0,0 +1,69 @@
+"""
+横幅切片推理缓存测试
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+from api.algorithms.banner.detector import BannerDetector
+
+
+class BrightSpotModel:
+    """以画面中的高亮像素作为检测目标的模型替身，记录每次推理的切片数"""
+
+    names = {0: "banner"}
+
+    def __init__(self):
+        self.calls = []
+
+    def infer_frames(self, frames, **kwargs):
+        frames = frames if isinstance(frames, list) else [frames]
+        self.calls.append(len(frames))
+        results = []
+        for frame in frames:
+            ys, xs = np.nonzero(frame.max(axis=2) > 200)
+            boxes = [[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1, 0.9, 0]] if len(xs) else np.zeros((0, 6))
+            results.append(SimpleNamespace(boxes=SimpleNamespace(data=torch.tensor(boxes, dtype=torch.float32))))
+        return results
+
+
+def static_frame(rng):
+    """带传感器噪声的静态1080p画面"""
+    return np.clip(100 + rng.normal(0, 3, (1080, 1920, 3)), 0, 255).astype(np.uint8)
+
+
+def tiled_detector(weights, **kwargs):
+    """使用模型替身的切片推理横幅检测器（1080p画面切为 4x2 个切片）"""
+    detector = BannerDetector(model_path=weights, device="cpu", tiled=True, tile_size=640, global_pass=False,
+                              **kwargs)
+    detector.model = BrightSpotModel()
+    return detector
+
+
+def test_small_object_in_static_tile(weights):
+    """静态切片中出现的小目标会触发该切片重新推理并被检测到，噪声不会触发重新推理"""
+    rng = np.random.default_rng(0)
+    detector = tiled_detector(weights, tile_max_age=100)
+    assert detector.detect_banner(static_frame(rng))[1] == []
+    assert detector.model.calls == [8]
+
+    for _ in range(3):
+        assert detector.detect_banner(static_frame(rng))[1] == []
+    assert detector.model.calls == [8]  # 传感器噪声不触发重新推理
+
+    frame = static_frame(rng)
+    frame[300:308, 900:912] = 255  # 12x8像素的小横幅，只落在第一行第二个切片内
+    banners = detector.detect_banner(frame)[1]
+    assert detector.model.calls == [8, 1]
+    assert [b["box"] for b in banners] == [(900, 300, 912, 308)]
+
+
+def test_tile_max_age(weights):
+    """画面不变时，切片缓存结果复用 tile_max_age 次后强制重新推理"""
+    rng = np.random.default_rng(0)
+    detector = tiled_detector(weights, tile_max_age=3)
+    for _ in range(7):
+        detector.detect_banner(static_frame(rng))
+    assert detector.model.calls == [8, 8, 8]
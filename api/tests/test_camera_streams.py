@@ -0,0 +1,102 @@
+"""
+摄像头视频流测试（使用视频文件作为摄像头源）
+"""
+
+import json
+
+import cv2
+import pytest
+
+from ultralytics.utils import ASSETS
+
+from api.algorithms.coordinator import VideoProcessingCoordinator
+from api.services import alarm_engine as alarm_engine_module
+from api.services import snapshot_service as snapshot_service_module
+from api.services.alarm_engine import AlarmEngine
+from api.services.camera_service import CameraService
+
+CAMERA_ID = "stream-test"
+
+# 各场景告警事件的详情，用于生成告警内容
+PAYLOADS = {
+    "leave": {"absence_duration": 30.0},
+    "gather": {"person_count": 5, "threshold": 3},
+    "banner": {"banners": [{"box": [0, 0, 10, 10], "confidence": 0.9}]}
+}
+
+
+def open_incident(engine, scenario):
+    """在指定场景下打开一个告警事件"""
+    assert engine.observe(CAMERA_ID, scenario, "test", True, PAYLOADS[scenario])
+
+
+@pytest.fixture
+def streams(tmp_path, weights, monkeypatch):
+    """
+    以视频文件为源的摄像头服务
+
+    视频流使用测试权重，告警事件记录在独立的告警合并引擎中，产生的告警只记录不抓拍发布
+
+    Returns:
+        tuple: (摄像头服务, 告警合并引擎, 已提交的告警消息列表)
+    """
+    video = str(tmp_path / "camera.avi")
+    image = cv2.resize(cv2.imread(str(ASSETS / "bus.jpg")), (640, 480))
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 30, (640, 480))
+    for _ in range(30):
+        writer.write(image)
+    writer.release()
+
+    config_file = tmp_path / "camera_config.json"
+    config_file.write_text(json.dumps({
+        "cameras": [{"id": CAMERA_ID, "name": "测试摄像头", "location": "测试"}],
+        "camera_devices": {CAMERA_ID: video}
+    }), encoding="utf-8")
+
+    engine = AlarmEngine()
+    submitted = []
+    monkeypatch.setattr(alarm_engine_module, "alarm_engine", engine)
+    monkeypatch.setattr(snapshot_service_module.snapshot_service, "submit",
+                        lambda message, *args: submitted.append(message) or True)
+    monkeypatch.setattr(VideoProcessingCoordinator.__init__, "__defaults__", (weights,))
+    service = CameraService(config_file=str(config_file))
+    yield service, engine, submitted
+    service.stop()
+
+
+def test_disable_scenario_closes_only_its_incidents(streams):
+    """停用一个场景只关闭该场景的告警事件，同一摄像头其他场景的事件保持进行中"""
+    service, engine, submitted = streams
+    stream = service.process_leave_stream(CAMERA_ID)
+    next(stream)
+    for scenario in "leave", "banner":
+        open_incident(engine, scenario)
+
+    service.update_scenario_config(CAMERA_ID, "leave", {"enabled": False})
+    next(stream)
+    assert not engine.is_open(CAMERA_ID, "leave", "test")
+    assert engine.is_open(CAMERA_ID, "banner", "test")
+    assert [json.loads(m["ext1"])["scene_type"] for m in submitted] == ["leave"]
+    stream.close()
+
+
+def test_stream_end_keeps_other_streams_incidents(streams):
+    """同一摄像头的两路视频流中一路结束时，只关闭该视频流场景的告警事件"""
+    service, engine, submitted = streams
+    leave = service.process_leave_stream(CAMERA_ID)
+    banner = service.process_banner_stream(CAMERA_ID)
+    next(leave)
+    next(banner)
+    for scenario in "leave", "banner":
+        open_incident(engine, scenario)
+
+    banner.close()
+    assert not engine.is_open(CAMERA_ID, "banner", "test")
+    assert engine.is_open(CAMERA_ID, "leave", "test")
+    assert [json.loads(m["ext1"])["scene_type"] for m in submitted] == ["banner"]
+
+    # 另一路视频流继续运行，结束时关闭自己的事件
+    next(leave)
+    assert engine.is_open(CAMERA_ID, "leave", "test")
+    leave.close()
+    assert not engine.is_open(CAMERA_ID, "leave", "test")
@@ -0,0 +1,102 @@
+"""
+设备心跳与分层时间轮测试
+"""
+
+import json
+import math
+import random
+import time
+
+import pytest
+
+from api.services.camera_service import CameraService
+from api.services.device_heartbeat import DEVICE_OFFLINE, DEVICE_ONLINE, DeviceHeartbeatMonitor, TimerWheel
+from api.services.ga1400_service import GA1400Service
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timer_wheel_matches_naive_model(seed):
+    """随机设置、取消定时器并推进，到期结果与逐个检查到期刻度的朴素模型一致（覆盖各层下放）"""
+    rng = random.Random(seed)
+    tick, start = 0.5, 1000.0
+    wheel = TimerWheel(tick=tick, slot_bits=3, levels=3, now=start)
+    model = {}  # {键: 到期刻度}
+    current = int(start // tick)
+    now = start
+    for _ in range(3000):
+        op = rng.random()
+        key = rng.randrange(200)
+        if op < 0.5:
+            # 截止时间覆盖已过期、各层范围以及超过最长定时的情况
+            deadline = now + rng.choice([-5.0, 0.0, 1.0, 10.0, 100.0, 400.0]) * rng.random()
+            wheel.schedule(key, deadline)
+            model[key] = min(max(math.ceil(deadline / tick), current + 1), current + wheel.max_ticks)
+        elif op < 0.6:
+            assert wheel.cancel(key) == (model.pop(key, None) is not None)
+        else:
+            now += rng.choice([0.0, 0.3, tick, 3.0, 40.0, 300.0]) * rng.random()
+            current = int(now // tick)
+            expired = wheel.advance(now)
+            due = {k for k, expires in model.items() if expires <= current}
+            assert sorted(expired) == sorted(due)
+            # 按到期刻度的先后返回
+            assert [model[k] for k in expired] == sorted(model[k] for k in expired)
+            for k in due:
+                del model[k]
+        assert len(wheel) == len(model)
+
+
+@pytest.fixture
+def monitor():
+    """保活间隔10秒、错过3次判定离线的心跳监测，上下线事件记录在 monitor.events 中"""
+    events = []
+    heartbeat = DeviceHeartbeatMonitor(interval=10, misses=3, tick=1.0, publish=events.append)
+    heartbeat.events = events
+    yield heartbeat
+    heartbeat.stop()
+
+
+def test_keepalive_offline_online(monitor):
+    """保活使设备上线，超时未保活判定离线，再次保活重新上线"""
+    base = time.time()
+    assert monitor.keepalive("cam-1", base)
+    assert not monitor.keepalive("cam-1", base + 5)
+    assert monitor.status("cam-1")["status"] == DEVICE_ONLINE
+
+    # 定时器按首次保活在 base+30 到期，期间收到过保活，顺延到 base+35
+    assert monitor.expire(base + 31) == []
+    assert monitor.expire(base + 34) == []
+    assert monitor.expire(base + 36) == ["cam-1"]
+    assert monitor.status("cam-1")["status"] == DEVICE_OFFLINE
+    assert monitor.summary() == {"online": 0, "offline": 1}
+
+    assert monitor.keepalive("cam-1", base + 40)
+    assert monitor.expire(base + 60) == []
+    assert [(e["deviceCode"], e["status"]) for e in monitor.events] == [
+        ("cam-1", DEVICE_ONLINE), ("cam-1", DEVICE_OFFLINE), ("cam-1", DEVICE_ONLINE)]
+    assert monitor.stats == {"keepalives": 3, "online_events": 2, "offline_events": 1}
+
+    # 注销的设备不产生离线事件
+    monitor.remove("cam-1")
+    assert monitor.expire(base + 100) == []
+    assert len(monitor.events) == 3
+
+
+def test_keepalive_many_unknown_devices(monitor, tmp_path):
+    """批量保活只记录已注册的设备，未注册的设备ID原样返回且不进入心跳表"""
+    config_file = tmp_path / "camera_config.json"
+    config_file.write_text(json.dumps({
+        "cameras": [{"id": f"cam-{i}", "name": f"摄像头{i}", "location": "测试"} for i in range(3)]
+    }), encoding="utf-8")
+    service = GA1400Service()
+    service.camera_service = CameraService(config_file=str(config_file))
+    service.device_heartbeat = monitor
+
+    result = service.keepalive_devices(["cam-0", "ghost", "cam-1", "cam-0", "other"])
+    assert result["status"] == "success"
+    assert result["accepted_count"] == 3 and result["unknown_devices"] == ["ghost", "other"]
+    assert sorted(monitor.online) == ["cam-0", "cam-1"]
+    assert monitor.status("ghost") == {"status": DEVICE_OFFLINE, "last_keepalive": None}
+    # 同一批中重复的设备只产生一次上线事件
+    assert [e["deviceCode"] for e in monitor.events] == ["cam-0", "cam-1"]
+    assert monitor.summary() == {"online": 2, "offline": 0}
@@ -0,0 +1,30 @@
+"""
+GA/T 1400 报警上报测试
+"""
+
+import json
+
+from api.services import ga1400_service as ga1400
+from api.services.alarm_bus import AlarmBus
+from api.services.alarm_store import AlarmStore
+
+
+def test_report_alarm_publishes_to_alarm_bus(monkeypatch, tmp_path):
+    """GA/T 1400 上报的报警与视频流告警一样推送给实时订阅者"""
+    bus = AlarmBus()
+    store = AlarmStore(db_file=str(tmp_path / "alarms.db"))
+    monkeypatch.setattr(ga1400, "alarm_bus", bus)
+    monkeypatch.setattr(ga1400, "alarm_store", store)
+
+    result = ga1400.GA1400Service().report_alarm({
+        "device_id": "cam-1",
+        "scene_type": "leave",
+        "timestamp": "2024-01-01 08:00:00"
+    })
+    assert result["status"] == "success"
+    assert bus.stats["published"] == 1
+
+    frame = bus.replay[-1][3].decode("utf-8")
+    message = json.loads(frame.split("data: ", 1)[1])
+    assert message["code"] == result["alarm_id"]
+    assert message["deviceCode"] == "cam-1"
@@ -0,0 +1,95 @@
+"""
+多模型共享预处理推理测试
+"""
+
+import cv2
+import numpy as np
+
+from ultralytics.utils import ASSETS
+
+from api.algorithms.coordinator import VideoProcessingCoordinator
+
+
+def test_detect_shared_matches_separate_detectors(weights, monkeypatch):
+    """组合场景共用一次预处理，人员模型只前向一次，结果与各检测器单独推理一致"""
+    coordinator = VideoProcessingCoordinator(camera_id="test", model_name=weights)
+    leave = coordinator._get_leave_detector()
+    gather = coordinator._get_gather_detector()
+    gather.model = leave.model  # 与组合检测视频流相同，离岗与聚集共用人员模型
+    banner = coordinator._get_banner_detector(conf_threshold=0.3)
+    detectors = {"leave": leave, "gather": gather, "banner": banner}
+
+    frame = cv2.imread(str(ASSETS / "bus.jpg"))
+    roi = [(0, 0), (400, 0), (400, 1080), (0, 1080)]
+
+    # 各检测器单独推理
+    expected_leave = leave.detect_leave(frame, roi, None, 5)
+    expected_gather = gather.detect_gather(frame, roi, 5)
+    expected_banners = banner.detect_banner(frame)[1]
+    assert expected_leave["person_boxes"] and expected_banners
+
+    shared = coordinator._get_shared_inference(leave, gather, banner)
+    assert set(shared.entries) == {"leave", "gather", "banner"}
+
+    # 统计预处理与各模型前向次数，共享路径不得再调用检测器各自的推理
+    calls = {"preprocess": 0, "person": 0, "banner": 0}
+    preprocess = shared.preprocess
+
+    def counted_preprocess(*args, **kwargs):
+        calls["preprocess"] += 1
+        return preprocess(*args, **kwargs)
+
+    monkeypatch.setattr(shared, "preprocess", counted_preprocess)
+    for name, model in ("person", leave.model), ("banner", banner.model):
+        backend = shared._backend(model)
+        forward = backend.forward
+        monkeypatch.setattr(backend, "forward",
+                            lambda *args, _name=name, _forward=forward, **kwargs:
+                            calls.__setitem__(_name, calls[_name] + 1) or _forward(*args, **kwargs))
+        monkeypatch.setattr(model, "infer_frames", None)
+
+    results = coordinator.detect_shared(frame, shared, detectors, {
+        "leave": {"roi": roi, "absence_start_time": None, "threshold": 5},
+        "gather": {"roi": roi, "threshold": 5},
+        "banner": {}
+    })
+    assert calls == {"preprocess": 1, "person": 1, "banner": 1}
+
+    for key in "status", "roi_person_count", "alert_triggered":
+        assert results["leave"][key] == expected_leave[key]
+    assert np.allclose(results["leave"]["person_boxes"], expected_leave["person_boxes"], atol=1e-3)
+    assert results["gather"]["roi_person_count"] == expected_gather["roi_person_count"]
+    assert np.allclose(results["gather"]["person_boxes"], expected_gather["person_boxes"], atol=1e-3)
+    assert [b["box"] for b in results["banner"]] == [b["box"] for b in expected_banners]
+    assert np.allclose([b["confidence"] for b in results["banner"]],
+                       [b["confidence"] for b in expected_banners], atol=1e-4)
+
+    # 只请求部分场景时只推理对应的模型，仍只预处理一次
+    calls.update(preprocess=0, person=0, banner=0)
+    results = coordinator.detect_shared(frame, shared, detectors, {"banner": {}})
+    assert set(results) == {"banner"} and calls == {"preprocess": 1, "person": 0, "banner": 1}
+
+
+def test_shared_inference_uses_detector_infer_args(weights):
+    """共享推理使用人员检测器自身的推理参数，调整 infer_args 后与单独推理仍然一致"""
+    coordinator = VideoProcessingCoordinator(camera_id="test", model_name=weights)
+    leave = coordinator._get_leave_detector()
+    gather = coordinator._get_gather_detector()
+    gather.model = leave.model
+    gather.infer_args = {**gather.infer_args, "max_det": 20}
+
+    shared = coordinator._get_shared_inference(leave, gather)
+    for name, detector in ("leave", leave), ("gather", gather):
+        assert {k: shared.entries[name][1][k] for k in detector.infer_args} == detector.infer_args
+
+    frame = cv2.imread(str(ASSETS / "bus.jpg"))
+    roi = [(0, 0), (frame.shape[1], 0), (frame.shape[1], frame.shape[0]), (0, frame.shape[0])]
+    expected = {"leave": leave.detect_leave(frame, roi, None, 5), "gather": gather.detect_gather(frame, roi, 5)}
+    assert len(expected["gather"]["person_boxes"]) == 20 < len(expected["leave"]["person_boxes"])
+
+    results = coordinator.detect_shared(frame, shared, {"leave": leave, "gather": gather}, {
+        "leave": {"roi": roi, "absence_start_time": None, "threshold": 5},
+        "gather": {"roi": roi, "threshold": 5}
+    })
+    for name in "leave", "gather":
+        assert np.allclose(results[name]["person_boxes"], expected[name]["person_boxes"], atol=1e-3)
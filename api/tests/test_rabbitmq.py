@@ -0,0 +1,74 @@
+"""
+RabbitMQ发布测试（使用进程内AMQP服务端）
+"""
+
+import asyncio
+import json
+
+from api.services.alarm_publisher import AlarmPublisher
+from api.services.rabbitmq_service import RabbitMQProducer, serialize_message
+
+
+def alarm_bodies(n):
+    """生成n条序列化后的告警消息"""
+    return [serialize_message({"code": str(i), "memo": "x" * 200}) for i in range(n)]
+
+
+def test_publish_pipelined_load(amqp_broker):
+    """5000条告警流水线发布：事件循环不被阻塞，顺序不变，被拒绝的消息逐条对应"""
+    broker = amqp_broker(nack_every=1000)
+    bodies = alarm_bodies(5000)
+
+    async def publish():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        results = await RabbitMQProducer().publish_pipelined_async(bodies)
+        task.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(publish())
+    assert ticks > 0
+    assert [i for i, acked in enumerate(results) if not acked] == [999, 1999, 2999, 3999, 4999]
+    assert [json.loads(body)["code"] for body in broker.received] == [str(i) for i in range(5000)]
+
+
+def test_publish_batch_confirms_once_per_batch(amqp_broker):
+    """启用发布确认的批量发布整批写出后统一等待确认，而不是每条消息一次往返"""
+    broker = amqp_broker(confirm_delay=0.01)
+    producer = RabbitMQProducer(confirm=True)
+    bodies = alarm_bodies(500)
+    assert producer.publish_batch(bodies) == 500
+    assert broker.received == [body.encode() for body in bodies]
+    assert broker.confirm_rounds < len(bodies) // 10
+    assert producer.send_message({"code": "single"})
+    producer.close()
+
+
+def test_publish_batch_nack(amqp_broker):
+    """被拒绝的消息及其之后的消息不计为已发布"""
+    amqp_broker(nack_every=5)
+    producer = RabbitMQProducer(confirm=True)
+    assert producer.publish_batch(alarm_bodies(12)) == 4
+    producer.close()
+
+
+def test_alarm_publisher(amqp_broker, tmp_path):
+    """后台发布器按顺序发布全部告警，统计信息与发布结果一致"""
+    broker = amqp_broker()
+    publisher = AlarmPublisher(batch_size=64, spool_file=str(tmp_path / "spool.jsonl"))
+    for i in range(300):
+        assert publisher.publish({"code": str(i)})
+    for _ in range(500):
+        if publisher.stats["published"] == 300:
+            break
+        asyncio.run(asyncio.sleep(0.01))
+    publisher.stop()
+    assert publisher.stats["enqueued"] == publisher.stats["published"] == 300
+    assert [json.loads(body)["code"] for body in broker.received] == [str(i) for i in range(300)]
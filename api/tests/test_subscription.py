@@ -0,0 +1,178 @@
+"""
+GA/T 1400 订阅通知服务测试（使用进程内HTTP接收端）
+"""
+
+import time
+
+import pytest
+
+from api.services.subscription_service import SubscriptionService
+
+
+def wait_until(predicate, timeout=5.0):
+    """等待条件成立，超时返回False"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def alarm(code, device="cam-1", scene="leave"):
+    """构造一条告警消息"""
+    return {"code": str(code), "deviceCode": device, "sceneType": scene, "alarmTime": "2024-01-01 08:00:00"}
+
+
+@pytest.fixture
+def service(tmp_path):
+    """订阅通知服务，测试结束时停止后台线程"""
+    services = []
+
+    def create(**kwargs):
+        kwargs = {"subscription_file": str(tmp_path / "subscriptions.json"), "retry_base": 0.05, **kwargs}
+        services.append(SubscriptionService(**kwargs))
+        return services[-1]
+
+    yield create
+    for s in services:
+        s.stop(timeout=1.0)
+
+
+def test_match_index(service, http_receiver):
+    """过滤索引按设备与场景匹配，未指定的条件视为不限，并检查订阅有效期"""
+    subscriptions = service()
+    url = http_receiver().url("/")
+    ids = {name: subscriptions.subscribe({"receive_addr": url, **info})["subscription_id"] for name, info in {
+        "all": {},
+        "device": {"device_ids": ["cam-1"]},
+        "scene": {"scene_types": ["gather"]},
+        "both": {"device_ids": ["cam-1", "cam-2"], "scene_types": ["leave"]},
+        "expired": {"end_time": "2023-12-31 23:59:59"}
+    }.items()}
+    names = {sid: name for name, sid in ids.items()}
+
+    def match(device, scene, alarm_time="2024-01-01 08:00:00"):
+        return {names[sid] for sid in subscriptions.match(device, scene, alarm_time)}
+
+    assert match("cam-1", "leave") == {"all", "device", "both"}
+    assert match("cam-2", "gather") == {"all", "scene"}
+    assert match("cam-2", "leave") == {"all", "both"}
+    assert match("cam-3", "banner", None) == {"all", "expired"}
+
+    subscriptions.unsubscribe(ids["device"])
+    assert match("cam-1", "leave") == {"all", "both"}
+    with pytest.raises(ValueError):
+        subscriptions.unsubscribe(ids["device"])
+
+
+def test_ordered_delivery(service, http_receiver):
+    """每个订阅者按告警顺序收到匹配的通知，批量推送且不超过批次大小"""
+    receiver = http_receiver()
+    subscriptions = service(workers=4, batch_size=8)
+    subscriptions.subscribe({"receive_addr": receiver.url("/cam-1"), "device_ids": ["cam-1"]})
+    subscriptions.subscribe({"receive_addr": receiver.url("/gather"), "scene_types": ["gather"]})
+
+    alarms = [alarm(i, f"cam-{i % 2}", ("leave", "gather")[i % 3 == 0]) for i in range(300)]
+    for message in alarms:
+        assert subscriptions.dispatch(message)
+
+    expected = {
+        "/cam-1": [m["code"] for m in alarms if m["deviceCode"] == "cam-1"],
+        "/gather": [m["code"] for m in alarms if m["sceneType"] == "gather"]
+    }
+    assert wait_until(lambda: all(len(receiver.delivered(p)) == len(codes) for p, codes in expected.items()))
+    for path, codes in expected.items():
+        assert receiver.delivered(path) == codes
+    batches = [len(codes) for _, _, _, codes in receiver.requests]
+    assert max(batches) <= 8 and len(batches) < sum(len(codes) for codes in expected.values())
+    assert subscriptions.stats["delivered"] == sum(len(codes) for codes in expected.values())
+
+
+def test_retry_backoff(service, http_receiver):
+    """推送失败后按指数退避重试，重试成功后顺序不变"""
+    receiver = http_receiver(fail=3)
+    subscriptions = service(retry_base=0.05, breaker_threshold=10)
+    subscriptions.subscribe({"receive_addr": receiver.url("/")})
+    for i in range(5):
+        subscriptions.dispatch(alarm(i))
+
+    assert wait_until(lambda: len(receiver.delivered("/")) == 5)
+    assert receiver.delivered("/") == [str(i) for i in range(5)]
+    times = [t for t, *_ in receiver.requests]
+    gaps = [b - a for a, b in zip(times, times[1:4])]
+    for gap, delay in zip(gaps, (0.05, 0.1, 0.2)):
+        assert delay * 0.9 <= gap < delay + 0.3
+    assert subscriptions.get_subscriptions()[0]["failed_attempts"] == 3
+
+
+def test_circuit_breaker(service, http_receiver):
+    """连续失败达到阈值后熔断，冷却期后放行一次试探推送，试探成功后恢复"""
+    receiver = http_receiver(fail=3)
+    subscriptions = service(retry_base=0.01, breaker_threshold=2, breaker_cooldown=0.5)
+    subscriptions.subscribe({"receive_addr": receiver.url("/")})
+    subscriptions.dispatch(alarm(0))
+
+    assert wait_until(lambda: len(receiver.requests) == 2)
+    assert wait_until(lambda: subscriptions.get_subscriptions()[0]["circuit_open"], timeout=0.4)
+    assert wait_until(lambda: len(receiver.delivered("/")) == 1)
+    times = [t for t, *_ in receiver.requests]
+    assert len(times) == 4
+    # 熔断后的两次试探推送都等待了完整的冷却期
+    assert 0.45 <= times[2] - times[1] < 0.8 and 0.45 <= times[3] - times[2] < 0.8
+    state = subscriptions.get_subscriptions()[0]
+    assert not state["circuit_open"] and state["failed_attempts"] == 3
+
+
+def test_max_pending(service, http_receiver):
+    """订阅者积压超过上限时丢弃最旧的通知"""
+    receiver = http_receiver()
+    subscriptions = service(batch_size=1, max_pending=5)
+    subscriptions.subscribe({"receive_addr": receiver.url("/")})
+    receiver.hold.clear()
+    subscriptions.dispatch(alarm(0))
+    assert wait_until(lambda: len(receiver.requests) == 1)
+
+    for i in range(1, 20):
+        subscriptions.dispatch(alarm(i))
+    assert wait_until(lambda: subscriptions.stats["matched"] == 20)
+    receiver.hold.set()
+
+    assert wait_until(lambda: len(receiver.delivered("/")) == 6)
+    assert receiver.delivered("/") == ["0", "15", "16", "17", "18", "19"]
+    assert subscriptions.get_subscriptions()[0]["dropped"] == 15
+
+
+def test_unsubscribe_discards_pending(service, http_receiver):
+    """取消订阅后未推送的通知被丢弃，在途的批次之后不再推送"""
+    receiver = http_receiver()
+    subscriptions = service(batch_size=1)
+    subscription_id = subscriptions.subscribe({"receive_addr": receiver.url("/")})["subscription_id"]
+    receiver.hold.clear()
+    for i in range(10):
+        subscriptions.dispatch(alarm(i))
+    assert wait_until(lambda: len(receiver.requests) == 1 and subscriptions.stats["matched"] == 10)
+
+    subscriptions.unsubscribe(subscription_id)
+    receiver.hold.set()
+    time.sleep(0.3)
+    assert [codes for *_, codes in receiver.requests] == [["0"]]
+    assert not subscriptions.dispatch(alarm(10))
+
+
+def test_persistence(service, http_receiver):
+    """订阅保存后重新加载，过滤索引与推送均恢复"""
+    receiver = http_receiver()
+    subscriptions = service()
+    saved = subscriptions.subscribe({"receive_addr": receiver.url("/"), "device_ids": ["cam-1"],
+                                     "scene_types": ["leave"], "title": "离岗"})
+    removed = subscriptions.subscribe({"receive_addr": receiver.url("/removed")})
+    subscriptions.unsubscribe(removed["subscription_id"])
+    subscriptions.save()
+    assert not subscriptions.save()  # 没有待保存的变更
+
+    reloaded = service()
+    assert reloaded.subscriptions == {saved["subscription_id"]: saved}
+    assert reloaded.match("cam-1", "leave") == {saved["subscription_id"]} and not reloaded.match("cam-2", "leave")
+    assert reloaded.dispatch(alarm(0))
+    assert wait_until(lambda: receiver.delivered("/") == ["0"])
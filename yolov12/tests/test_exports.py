@@ -4,10 +4,11 @@ import shutil
 import uuid
 from itertools import product
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
-from tests import MODEL, SOURCE
+from tests import MODEL, SOURCE, TMP
 from ultralytics import YOLO
 from ultralytics.cfg import TASK2DATA, TASK2MODEL, TASKS
 from ultralytics.utils import (
@@ -32,6 +33,46 @@ def test_export_onnx():
     YOLO(file)(SOURCE, imgsz=32)  # exported model inference
 
 
+def test_export_onnx_threads():
+    """Test the 'threads' predict argument sets the ONNX Runtime intra-op thread count."""
+    file = YOLO(MODEL).export(format="onnx", dynamic=True, imgsz=32)
+    model = YOLO(file)
+    model(SOURCE, imgsz=32, threads=1)  # exported model inference on a single ONNX Runtime thread
+    assert model.predictor.model.session.get_session_options().intra_op_num_threads == 1
+
+
+def test_export_int8_calibration_footage():
+    """Test INT8 calibration frames sampled from video footage and the held-out FP32 vs INT8 report."""
+    import cv2
+    import numpy as np
+    import torch
+
+    from ultralytics.engine.exporter import Exporter
+
+    video = TMP / "int8_calibration.mp4"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"mp4v"), 25, (96, 72))
+    for i in range(20):
+        writer.write(np.full((72, 96, 3), i * 10, dtype=np.uint8))
+    writer.release()
+
+    exporter = Exporter(overrides={"format": "onnx", "data": str(video), "batch": 2})
+    exporter.model, exporter.imgsz = SimpleNamespace(stride=torch.tensor([32.0]), task="detect"), [64, 64]
+    batches = exporter.get_int8_calibration_dataloader()
+    assert len(batches) == 10 and batches[0]["img"].shape == (2, 3, 64, 64) and batches[0]["img"].dtype == torch.uint8
+    calibration, holdout = exporter.split_int8_holdout(batches)
+    assert len(calibration) == 8 and len(holdout) == 2
+
+    # Two classes of boxes in (1, 4 + nc, anchors) model output layout, the INT8 output shifts one of them
+    fp32 = torch.zeros(1, 6, 3)
+    fp32[0, :4] = torch.tensor([[10.0, 40.0, 30.0], [10.0, 40.0, 50.0], [8.0, 12.0, 10.0], [8.0, 12.0, 10.0]])
+    fp32[0, 4:] = torch.tensor([[0.9, 0.0, 0.8], [0.0, 0.7, 0.0]])
+    int8 = fp32.clone()
+    int8[0, 0, 2] += 6.0
+    report = exporter.int8_report(lambda x: fp32.numpy(), lambda x: int8.numpy(), holdout)
+    assert report["images"] == 4 and report["map_fp32"] > 0.9 and report["map_delta"] < 0
+    assert report["latency_fp32_ms"] > 0 and report["latency_int8_ms"] > 0
+
+
 @pytest.mark.skipif(not TORCH_1_13, reason="OpenVINO requires torch>=1.13")
 def test_export_openvino():
     """Test YOLO exports to OpenVINO format for model inference compatibility."""
@@ -26,6 +26,7 @@ from ultralytics.utils import (
     ROOT,
     WEIGHTS_DIR,
     WINDOWS,
+    IterableSimpleNamespace,
     checks,
     is_dir_writeable,
     is_github_action_running,
@@ -160,6 +161,170 @@ def test_predict_grey_and_4ch():
         f.unlink()  # cleanup
 
 
+def test_predict_fused_preprocess():
+    """Test that fused letterbox preprocessing matches the default path for same- and mixed-shape batches."""
+    model = YOLO(CFG)
+    im = cv2.imread(str(SOURCE))
+    for batch in [im], [im, im], [im, np.ascontiguousarray(im[:, ::2])]:
+        results = model(batch, imgsz=160)
+        predictor = model.predictor
+        reference = predictor.preprocess(batch).clone()
+        predictor.args.fused_preprocess = True
+        for _ in range(2):  # second call reuses the input buffer
+            assert torch.equal(predictor.preprocess(batch), reference)
+        fused = model(batch, imgsz=160, fused_preprocess=True)
+        for r, f in zip(results, fused):
+            assert torch.equal(r.boxes.data, f.boxes.data)
+
+
+def test_letterbox_labels():
+    """Test LetterBox on a labels dict: rect_shape target, resized_shape metadata and letterboxed box coordinates."""
+    from ultralytics.data.augment import LetterBox
+    from ultralytics.utils.instance import Instances
+
+    bboxes = np.array([[0.5, 0.5, 0.5, 0.5]], dtype=np.float32)
+    labels = {
+        "img": np.zeros((100, 200, 3), dtype=np.uint8),
+        "instances": Instances(bboxes, np.zeros((1, 0, 2), dtype=np.float32), bbox_format="xywh", normalized=True),
+        "rect_shape": (96, 160),
+    }
+    labels = LetterBox(new_shape=(160, 160), auto=False, scaleup=True)(labels=labels)
+    assert "rect_shape" not in labels and labels["resized_shape"] == (96, 160)
+    assert labels["img"].shape == (96, 160, 3)
+    labels["instances"].convert_bbox("xyxy")
+    assert np.allclose(labels["instances"].bboxes, [[40, 28, 120, 68]])  # 160x80 resize, 8 px top/bottom pad
+
+
+def test_infer_frames():
+    """Test that Model.infer_frames matches predict and keeps one prepared argument set per distinct kwargs."""
+    model = YOLO(CFG)
+    im = cv2.imread(str(SOURCE))
+    for kwargs in {"imgsz": 160}, {"imgsz": 160, "conf": 0.01, "classes": [0]}, {"imgsz": 160}:
+        results = model.infer_frames(im, **kwargs)
+        assert len(results) == 1 and results[0].orig_shape == im.shape[:2]
+        expected = model.predict(im, **kwargs)[0].boxes.data
+        assert torch.equal(model.infer_frames([im], **kwargs)[0].boxes.data, expected)
+    assert len(model._frames_setup[1]) == 2  # repeated kwargs reuse their parsed arguments
+    assert len(model.infer_frames([im, im[:, ::2]], imgsz=160)) == 2
+
+
+def test_infer_frames_threads():
+    """Test that concurrent Model.infer_frames calls share one predictor and one prepared argument set per kwargs."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    model = YOLO(CFG)
+    im = cv2.imread(str(SOURCE))
+    kwargs = [{"imgsz": 160}, {"imgsz": 160, "conf": 0.01}] * 8
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda k: (model.predictor, model.infer_frames(im, **k)[0]), kwargs))
+    predictor = model.predictor
+    assert all(r[0] in {None, predictor} for r in results)
+    assert model._frames_setup[0] is predictor and len(model._frames_setup[1]) == 2
+    for k, (_, r) in zip(kwargs, results):
+        assert torch.equal(r.boxes.data, model.infer_frames(im, **k)[0].boxes.data)
+
+
+def test_predict_compiled():
+    """Test that compiled inference letterboxes to fixed shape buckets, builds their graphs up front and matches eager."""
+    from ultralytics.data.augment import letterbox_buckets, select_bucket
+
+    buckets = letterbox_buckets(160)
+    assert buckets == [(96, 160), (128, 160), (160, 160)]
+    assert select_bucket((1080, 1920), buckets, 160) == (96, 160)
+    assert select_bucket((1920, 1080), buckets, 160) == (160, 160)
+
+    im = cv2.imread(str(SOURCE))
+    frames = [im[:456], im[:608], im]  # 16:9, 4:3 and portrait
+    model, compiled = YOLO(CFG), YOLO(CFG)
+    compiled.model.load_state_dict(model.model.state_dict())
+    results = [compiled.infer_frames(x, imgsz=160, conf=0.01, compile="trace")[0] for x in frames]
+    assert set(compiled.predictor.model.graphs) == {(1, 3, *b, torch.float32) for b in buckets}
+    for x, r in zip(frames[:2], results):  # landscape buckets match the eager minimum-rectangle letterbox
+        assert torch.allclose(r.boxes.data, model.infer_frames(x, imgsz=160, conf=0.01)[0].boxes.data, atol=1e-4)
+    assert results[2].orig_shape == im.shape[:2]
+
+
+def test_predict_buckets():
+    """Test configurable letterbox buckets: resolution to bucket mapping and one forward pass per bucket in a batch."""
+    from ultralytics.data.augment import letterbox_buckets, select_bucket
+
+    buckets = letterbox_buckets(160, canvases=[[160, 96], [90, 160], [128, 160]])
+    assert buckets == [(96, 160), (160, 96), (128, 160)]  # rounded up to stride, smallest area first
+    assert select_bucket((1080, 1920), buckets, 160) == (96, 160)  # 16:9 keeps full scale in the smallest canvas
+    assert select_bucket((1920, 1080), buckets, 160) == (160, 96)
+    assert select_bucket((1080, 1080), buckets, 160) == (128, 160)  # no full-scale canvas, largest scale wins
+
+    model = YOLO(CFG)
+    im = cv2.imread(str(SOURCE))
+    frames = [im[:456], np.ascontiguousarray(im[:, :456]), im[:456], im[:608]]
+    single = [model.infer_frames(x, imgsz=160, conf=0.01, buckets=buckets)[0] for x in frames]
+    calls = []
+    model.predictor.model.register_forward_hook(lambda m, x, y: calls.append(x[0].shape[2:]))
+    batched = model.infer_frames(frames, imgsz=160, conf=0.01, buckets=buckets)
+    assert model.predictor.bucket_batches(frames) == [[0, 2], [1], [3]]
+    assert calls == [(96, 160), (160, 96), (128, 160)]  # one forward pass per bucket
+    for r, s in zip(batched, single):
+        assert r.orig_shape == s.orig_shape and torch.allclose(r.boxes.data, s.boxes.data, atol=1e-4)
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_ready_checkpoint():
+    """Test that ready-to-serve checkpoints are cached per weights hash, load fused and match the original weights."""
+    from ultralytics.nn.tasks import ready_checkpoint
+
+    weights, cache = TMP / "ready.pt", TMP / "ready"
+    YOLO(CFG).save(weights)
+    f = ready_checkpoint(weights, cache_dir=cache)
+    assert ready_checkpoint(weights, cache_dir=cache) == f  # reused
+    model, ready = YOLO(weights), YOLO(f)
+    assert ready.model.is_fused() and ready.task == model.task
+    im = cv2.imread(str(SOURCE))
+    expected = model(im, imgsz=160, conf=0.01)[0].boxes.data
+    assert torch.allclose(ready(im, imgsz=160, conf=0.01)[0].boxes.data, expected, atol=1e-4)
+    YOLO(CFG).save(weights)  # changed weights get a new checkpoint
+    assert ready_checkpoint(weights, cache_dir=cache) != f
+
+
+def test_lean_results():
+    """Test that lean array-native results match Results from predict and receive track IDs from the tracker."""
+    from ultralytics.engine.results import DETECTION_DTYPE, LeanResults, Results
+    from ultralytics.trackers.track import on_predict_postprocess_end, on_predict_start
+
+    model = YOLO(CFG)
+    im = cv2.imread(str(SOURCE))
+    results = model.predict([im, im[:, ::2]], imgsz=160, conf=0.01, lean_results=False)
+    lean = model.predict([im, im[:, ::2]], imgsz=160, conf=0.01, lean_results=True)
+    for r, lr in zip(results, lean):
+        assert isinstance(lr, LeanResults) and lr.boxes.dtype == DETECTION_DTYPE and lr.orig_shape == r.orig_shape
+        assert np.allclose(lr.boxes["xyxy"], r.boxes.xyxy.numpy(), atol=1e-3)
+        assert np.array_equal(lr.boxes["cls"], r.boxes.cls.numpy()) and (lr.boxes["id"] == -1).all()
+        assert lr.verbose() == r.verbose() and lr.names == r.names
+    assert isinstance(model.infer_frames(im, imgsz=160, lean_results=True)[0], LeanResults)
+
+    # Both result types go through the tracker callback and come out with the same track IDs
+    det = np.array([[10, 10, 50, 60, 0.9, 0], [100, 120, 180, 200, 0.8, 2]], dtype=np.float32)
+    predictors = [
+        IterableSimpleNamespace(
+            args=IterableSimpleNamespace(tracker="bytetrack.yaml", task="detect"),
+            dataset=IterableSimpleNamespace(bs=1, mode="stream"),
+            save_dir=TMP,
+            batch=(["image0.jpg"], [im]),
+        )
+        for _ in range(2)
+    ]
+    for predictor in predictors:
+        on_predict_start(predictor)
+    for shift in range(3):
+        frame = det + np.array([shift, shift, shift, shift, 0, 0], dtype=np.float32)
+        predictors[0].results = [Results(im, path="image0.jpg", names=model.names, boxes=torch.from_numpy(frame))]
+        predictors[1].results = [LeanResults.from_detections(frame, model.names, im.shape[:2], "image0.jpg")]
+        for predictor in predictors:
+            on_predict_postprocess_end(predictor)
+    tracked, lean_tracked = predictors[0].results[0], predictors[1].results[0]
+    assert np.array_equal(lean_tracked.boxes["id"], tracked.boxes.id.numpy())
+    assert np.allclose(lean_tracked.boxes["xyxy"], tracked.boxes.xyxy.numpy(), atol=1e-3)
+
+
 @pytest.mark.slow
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 @pytest.mark.skipif(is_github_action_running(), reason="No auth https://github.com/JuanBindez/pytubefix/issues/166")
@@ -302,6 +467,56 @@ def test_labels_and_crops():
         assert len([f for f in crop_files if im_name in f.name]) == len(r.boxes.data)
 
 
+def test_load_streams_reconnect(monkeypatch):
+    """Test LoadStreams reopens a lost stream in the background and keeps serving batches meanwhile."""
+    import time
+
+    from ultralytics.data.loaders import LoadStreams
+
+    class FlakyCapture:
+        """Stream that loses signal every 20 frames and fails its first reopen attempt."""
+
+        opened = 0
+
+        def __init__(self):
+            FlakyCapture.opened += 1
+            self.n, self.ok = 0, FlakyCapture.opened != 2
+
+        def isOpened(self):
+            return self.ok
+
+        def get(self, prop):
+            return 0  # unknown FPS and frame count, i.e. a live stream
+
+        def read(self):
+            return True, np.zeros((32, 32, 3), dtype=np.uint8)
+
+        def grab(self):
+            self.n += 1
+            time.sleep(0.002)
+            return self.n % 20 != 0
+
+        def retrieve(self):
+            return True, np.full((32, 32, 3), FlakyCapture.opened, dtype=np.uint8)
+
+        def release(self):
+            pass
+
+    monkeypatch.setattr(LoadStreams, "open", classmethod(lambda cls, s: FlakyCapture()))
+    monkeypatch.setattr(LoadStreams, "backoff", (0.01, 0.02))
+    monkeypatch.setattr(cv2, "waitKey", lambda delay: -1)  # headless OpenCV builds have no GUI
+    monkeypatch.setattr(cv2, "destroyAllWindows", lambda: None)
+    dataset = LoadStreams("rtsp://example.com/stream")
+    seen, t = set(), time.time()
+    for _, images, _ in dataset:
+        seen.add(int(images[0][0, 0, 0]))
+        if len(seen) >= 4 or time.time() - t > 10:
+            break
+    dataset.close()
+    assert FlakyCapture.opened >= 4  # reconnected more than once, surviving a failed reopen
+    assert {0, 1, 3} <= seen  # blank frames while stale, then frames from the first and reopened captures
+
+
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 def test_data_utils():
     """Test utility functions in ultralytics/data/utils.py, including dataset stats and auto-splitting."""
@@ -377,6 +592,21 @@ def test_utils_init():
     get_git_branch()
 
 
+def test_import_time():
+    """Test 'import ultralytics' stays lazy, leaving plotting libraries and model families unimported."""
+    import subprocess
+    import sys
+
+    lazy = ["matplotlib", "pandas", "seaborn", "scipy", "ultralytics.models", "ultralytics.nn.tasks"]
+    code = f"import sys, ultralytics; print([m for m in {lazy} if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert out == "[]", f"'import ultralytics' eagerly imported {out}"
+
+    import ultralytics
+
+    assert "YOLO" in dir(ultralytics) and ultralytics.YOLO is YOLO
+
+
 def test_utils_checks():
     """Test various utility checks for filenames, git status, requirements, image sizes, and versions."""
     checks.check_yolov5u_filename("yolov5n.pt")
@@ -438,6 +668,27 @@ def test_utils_ops():
     torch.allclose(boxes, xyxyxyxy2xywhr(xywhr2xyxyxyxy(boxes)), rtol=1e-3)
 
 
+@pytest.mark.parametrize("bs", [1, 4])
+def test_utils_ops_nms_batched(bs):
+    """Test that batched NMS matches per-image NMS (selected by passing empty apriori labels) across options."""
+    from ultralytics.utils.ops import non_max_suppression
+
+    torch.manual_seed(0)
+    nc, n, nm = 80, 2100, 4
+    cls = torch.rand(bs, nc, n) * 0.2  # background scores
+    b, a = (torch.rand(bs, n) < 0.1).nonzero(as_tuple=True)  # anchors that see an object
+    cls[b, torch.randint(0, nc, (len(b),)), a] = torch.rand(len(b)) * 0.7 + 0.3
+    prediction = torch.cat((torch.rand(bs, 2, n) * 320, torch.rand(bs, 2, n) * 60 + 4, cls, torch.randn(bs, nm, n)), 1)
+    prediction[-1, 4:] = 0  # an image without detections
+
+    labels = [torch.zeros((0, 5))] * bs
+    for kwargs in {}, {"multi_label": True}, {"agnostic": True}, {"classes": [0, 3]}, {"max_nms": 20}, {"max_det": 5}:
+        batched = non_max_suppression(prediction.clone(), nc=nc, **kwargs)
+        reference = non_max_suppression(prediction.clone(), nc=nc, labels=labels, **kwargs)
+        assert len(batched) == bs
+        assert all(torch.equal(x, y) for x, y in zip(batched, reference)), kwargs
+
+
 def test_utils_files():
     """Test file handling utilities including file age, date, and paths with spaces."""
     from ultralytics.utils.files import file_age, file_date, get_latest_run, spaces_in_path
@@ -502,6 +753,23 @@ def test_nn_modules_block():
     BottleneckCSP(c1, c2)(x)
 
 
+@pytest.mark.parametrize("area", [1, 4])
+def test_nn_modules_attention_backends(area):
+    """Test that the SDPA attention backend matches the eager reference for AAttn (with area split) and Attention."""
+    from ultralytics.nn.modules.block import AAttn, Attention
+
+    torch.manual_seed(0)
+    x = torch.randn(2, 64, 16, 16)
+    for m in AAttn(64, 2, area).eval(), Attention(64, 2, 0.5).eval():
+        with torch.no_grad():
+            m.backend = "eager"
+            y = m(x)
+            m.backend = "sdpa"
+            assert torch.allclose(m(x), y, atol=1e-5)
+            m.backend = "auto"  # resolves to sdpa on CPU
+            assert torch.allclose(m(x), y, atol=1e-5)
+
+
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 def test_hub():
     """Test Ultralytics HUB functionalities (e.g. export formats, logout)."""
@@ -2,18 +2,19 @@
 
 __version__ = "8.3.63"
 
+import importlib
 import os
 
 # Set ENV variables (place before imports)
 if not os.environ.get("OMP_NUM_THREADS"):
     os.environ["OMP_NUM_THREADS"] = "1"  # default for reduced CPU utilization during training
 
-from ultralytics.models import NAS, RTDETR, SAM, YOLO, FastSAM, YOLOWorld
 from ultralytics.utils import ASSETS, SETTINGS
 from ultralytics.utils.checks import check_yolo as checks
 from ultralytics.utils.downloads import download
 
 settings = SETTINGS
+MODELS = ("YOLO", "YOLOWorld", "NAS", "SAM", "FastSAM", "RTDETR")
 __all__ = (
     "__version__",
     "ASSETS",
@@ -27,3 +28,15 @@ __all__ = (
     "download",
     "settings",
 )
+
+
+def __getattr__(name):
+    """Lazy-import model classes on first access, so 'import ultralytics' does not build every model family."""
+    if name in MODELS:
+        return getattr(importlib.import_module("ultralytics.models"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Extend dir() to include the lazily imported model classes for autocompletion."""
+    return sorted(set(globals()) | set(MODELS))
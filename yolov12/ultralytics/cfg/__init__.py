@@ -188,6 +188,7 @@ CFG_INT_KEYS = {  # integer-only arguments
     "mask_ratio",
     "max_det",
     "vid_stride",
+    "threads",
     "line_width",
     "nbs",
     "save_period",
@@ -216,8 +217,10 @@ CFG_BOOL_KEYS = {  # boolean-only arguments
     "show_conf",
     "visualize",
     "augment",
+    "fused_preprocess",
     "agnostic_nms",
     "retina_masks",
+    "lean_results",
     "show_boxes",
     "keras",
     "optimize",
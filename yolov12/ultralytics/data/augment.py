@@ -1559,6 +1559,43 @@ class LetterBox:
         img = labels.get("img") if image is None else image
         shape = img.shape[:2]  # current shape [height, width]
         new_shape = labels.pop("rect_shape", self.new_shape)
+        new_unpad, ratio, (top, bottom, left, right) = self.geometry(shape, new_shape)
+
+        if shape[::-1] != new_unpad:  # resize
+            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
+        img = cv2.copyMakeBorder(
+            img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+        )  # add border
+        if labels.get("ratio_pad"):
+            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+
+        if len(labels):
+            labels = self._update_labels(labels, ratio, left, top)
+            labels["img"] = img
+            labels["resized_shape"] = new_shape
+            return labels
+        else:
+            return img
+
+    def geometry(self, shape, new_shape=None):
+        """
+        Computes the resized size, scale ratios and border padding that letterboxing applies to an image.
+
+        Args:
+            shape (Tuple[int, int]): Current image shape (height, width).
+            new_shape (int | Tuple[int, int] | None): Target shape (height, width). Defaults to `self.new_shape`.
+
+        Returns:
+            new_unpad (Tuple[int, int]): Resized image size (width, height) before padding.
+            ratio (Tuple[float, float]): Scaling ratios (width, height).
+            pad (Tuple[int, int, int, int]): Border padding (top, bottom, left, right).
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> letterbox.geometry((480, 640))
+            ((640, 480), (1.0, 1.0), (80, 80, 0, 0))
+        """
+        new_shape = self.new_shape if new_shape is None else new_shape
         if isinstance(new_shape, int):
             new_shape = (new_shape, new_shape)
 
@@ -1582,23 +1619,9 @@ class LetterBox:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
 
-        if shape[::-1] != new_unpad:  # resize
-            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
         top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
         left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
-        img = cv2.copyMakeBorder(
-            img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
-        )  # add border
-        if labels.get("ratio_pad"):
-            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
-
-        if len(labels):
-            labels = self._update_labels(labels, ratio, left, top)
-            labels["img"] = img
-            labels["resized_shape"] = new_shape
-            return labels
-        else:
-            return img
+        return new_unpad, ratio, (top, bottom, left, right)
 
     @staticmethod
     def _update_labels(labels, ratio, padw, padh):
@@ -1631,6 +1654,158 @@ class LetterBox:
         return labels
 
 
+class LetterBoxBuffer:
+    """
+    Letterbox a batch of BGR images straight into a reusable, normalized RGB BCHW input buffer.
+
+    Each image is resized directly into its slot of a preallocated uint8 canvas whose borders already hold the padding
+    value. The canvas is then split into uint8 channel planes in RGB order, which is the BGR to RGB swap and HWC to CHW
+    transpose in one pass, and each plane is scaled to 0.0-1.0 straight into the float32 input buffer. All buffers are
+    reused while the batch layout stays the same, replacing the per-image padding copy, stack, channel flip, contiguous
+    copy, dtype conversion and in-place division of the default preprocessing path.
+
+    Attributes:
+        letterbox (LetterBox): Letterbox transform that defines the resize and padding geometry.
+        pin_memory (bool): Whether to allocate the input buffer in page-locked memory for asynchronous GPU copies.
+        canvas (np.ndarray | None): Letterboxed uint8 images (N, H, W, 3).
+        planes (List[np.ndarray] | None): uint8 channel planes (H, W) of one image, in BGR order.
+        buffer (torch.Tensor | None): Normalized float32 input (N, 3, H, W).
+
+    Methods:
+        __call__: Letterbox and normalize a list of images into the input buffer.
+
+    Examples:
+        >>> transform = LetterBoxBuffer(LetterBox(new_shape=(640, 640)))
+        >>> im = transform([np.zeros((480, 640, 3), dtype=np.uint8)])
+        >>> im.shape
+        torch.Size([1, 3, 640, 640])
+    """
+
+    def __init__(self, letterbox, pin_memory=False):
+        """
+        Initializes the LetterBoxBuffer.
+
+        Args:
+            letterbox (LetterBox): Letterbox transform that defines the resize and padding geometry.
+            pin_memory (bool): Allocate the input buffer in page-locked memory (only useful for CUDA inference).
+        """
+        self.letterbox = letterbox
+        self.pin_memory = pin_memory
+        self.canvas = None
+        self.planes = None
+        self.buffer = None
+        self.layout = None  # per-image (resized size, padding) the canvas borders were last filled for
+
+    def __call__(self, im):
+        """
+        Letterboxes and normalizes images into the input buffer.
+
+        Args:
+            im (List[np.ndarray]): BGR images [(h, w, 3) x N].
+
+        Returns:
+            (torch.Tensor): RGB input (N, 3, H, W) in 0.0-1.0. The tensor is reused by the next call.
+        """
+        layout = [self.letterbox.geometry(x.shape[:2]) for x in im]
+        layout = [(new_unpad, pad) for new_unpad, _, pad in layout]
+        (w, h), (top, bottom, left, right) = layout[0]
+        shape = (len(im), h + top + bottom, w + left + right, 3)
+        if self.canvas is None or self.canvas.shape != shape:
+            self.canvas = np.empty(shape, dtype=np.uint8)
+            self.planes = [np.empty(shape[1:3], dtype=np.uint8) for _ in range(3)]
+            self.buffer = torch.empty((shape[0], 3, *shape[1:3]), dtype=torch.float32, pin_memory=self.pin_memory)
+            self.layout = None
+        if layout != self.layout:
+            self.canvas.fill(114)  # padding only needs refilling when the image placement changes
+            self.layout = layout
+
+        buffer = self.buffer.numpy()
+        for i, (x, ((w, h), (top, _, left, _))) in enumerate(zip(im, layout)):
+            region = self.canvas[i, top : top + h, left : left + w]
+            if x.shape[1::-1] != (w, h):
+                cv2.resize(x, (w, h), dst=region, interpolation=cv2.INTER_LINEAR)
+            else:
+                region[...] = x
+            cv2.split(self.canvas[i], self.planes)  # HWC to CHW
+            for c, plane in enumerate(reversed(self.planes)):  # BGR to RGB
+                np.divide(plane, np.float32(255), out=buffer[i, c])  # 0 - 255 to 0.0 - 1.0
+        return self.buffer
+
+
+def letterbox_buckets(imgsz, stride=32, aspect_ratios=((16, 9), (4, 3)), canvases=None):
+    """
+    Returns a small fixed set of letterbox canvases for inference at a given image size.
+
+    By default the set holds the minimum-rectangle canvas of each landscape aspect ratio plus the full square canvas,
+    which every image fits, so inputs only ever come in these few shapes and compiled models reuse their graphs.
+
+    Args:
+        imgsz (int | Tuple[int, int]): Inference image size (height, width).
+        stride (int): Model stride the canvases are multiples of.
+        aspect_ratios (Tuple[Tuple[int, int], ...]): Aspect ratios (width, height) to add canvases for.
+        canvases (List[Tuple[int, int]], optional): Explicit canvases (height, width) to use instead, rounded up to
+            multiples of `stride`.
+
+    Returns:
+        (List[Tuple[int, int]]): Canvases (height, width), smallest area first.
+
+    Examples:
+        >>> letterbox_buckets(640)
+        [(384, 640), (480, 640), (640, 640)]
+        >>> letterbox_buckets(640, canvases=[(640, 384), (360, 640)])
+        [(384, 640), (640, 384)]
+    """
+    imgsz = (imgsz, imgsz) if isinstance(imgsz, int) else tuple(imgsz)
+    if canvases:
+        buckets = {tuple(math.ceil(x / stride) * stride for x in canvas) for canvas in canvases}
+    else:
+        buckets = {imgsz} | {letterbox_canvas((h, w), imgsz, stride) for w, h in aspect_ratios}
+    return sorted(buckets, key=lambda s: (s[0] * s[1], s))
+
+
+def letterbox_canvas(shape, imgsz, stride=32):
+    """
+    Returns the minimum-rectangle letterbox canvas (height, width) of an image shape at an inference size.
+
+    Args:
+        shape (Tuple[int, int]): Image shape (height, width).
+        imgsz (int | Tuple[int, int]): Inference image size (height, width).
+        stride (int): Model stride the canvas is a multiple of.
+
+    Returns:
+        (Tuple[int, int]): Letterboxed canvas (height, width).
+    """
+    (w, h), _, (top, bottom, left, right) = LetterBox(imgsz, auto=True, stride=stride).geometry(shape)
+    return h + top + bottom, w + left + right
+
+
+def select_bucket(shape, buckets, imgsz):
+    """
+    Maps an image shape to the bucket canvas it is letterboxed to.
+
+    The bucket that keeps the most resolution, up to the scale of a plain letterbox at `imgsz`, wins and ties go to the
+    smallest canvas, which wastes the least padding. The mapping only depends on the image resolution, so every frame of
+    a camera lands in the same bucket.
+
+    Args:
+        shape (Tuple[int, int]): Image shape (height, width).
+        buckets (List[Tuple[int, int]]): Canvases (height, width), smallest area first, e.g. from `letterbox_buckets`.
+        imgsz (int | Tuple[int, int]): Inference image size (height, width) that caps the useful scale.
+
+    Returns:
+        (Tuple[int, int]): Bucket canvas (height, width) to letterbox the image to.
+
+    Examples:
+        >>> select_bucket((1080, 1920), letterbox_buckets(640), 640)
+        (384, 640)
+        >>> select_bucket((1920, 1080), letterbox_buckets(640), 640)
+        (640, 640)
+    """
+    imgsz = (imgsz, imgsz) if isinstance(imgsz, int) else tuple(imgsz)
+    r = min(imgsz[0] / shape[0], imgsz[1] / shape[1])
+    return max(buckets, key=lambda b: (min(b[0] / shape[0], b[1] / shape[1], r), -b[0] * b[1]))
+
+
 class CopyPaste(BaseMixTransform):
     """
     CopyPaste class for applying Copy-Paste augmentation to image datasets.
@@ -3,6 +3,7 @@
 import glob
 import math
 import os
+import random
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -62,6 +63,7 @@ class LoadStreams:
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
         imgs (List[List[np.ndarray]]): List of image frames for each stream.
+        stale (List[bool]): Flags marking streams that lost signal and are reconnecting in the background.
         fps (List[float]): List of FPS for each stream.
         frames (List[int]): List of total frames for each stream.
         threads (List[Thread]): List of threads for each stream.
@@ -70,7 +72,8 @@ class LoadStreams:
         bs (int): Batch size for processing.
 
     Methods:
-        update: Read stream frames in daemon thread.
+        open: Open a video capture with connection and read timeouts for network streams.
+        update: Read stream frames in daemon thread, reconnecting lost streams with jittered exponential backoff.
         close: Close stream loader and release resources.
         __iter__: Returns an iterator object for the class.
         __next__: Returns source paths, transformed, and original images for processing.
@@ -87,8 +90,14 @@ class LoadStreams:
         - The class uses threading to efficiently load frames from multiple streams simultaneously.
         - It automatically handles YouTube links, converting them to the best available stream URL.
         - The class implements a buffer system to manage frame storage and retrieval.
+        - A lost stream is reopened in its own reader thread with jittered exponential backoff; while it is stale,
+          batches carry a blank frame for it instead of waiting, so other streams keep their frame rate.
     """
 
+    open_timeout = 5.0  # seconds to wait when opening a network stream
+    read_timeout = 5.0  # seconds to wait for a frame from a network stream
+    backoff = (0.5, 30.0)  # min and max reconnect delay in seconds
+
     def __init__(self, sources="file.streams", vid_stride=1, buffer=False):
         """Initialize stream loader for multiple video sources, supporting various stream types."""
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
@@ -105,6 +114,7 @@ class LoadStreams:
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
         self.imgs = [[] for _ in range(n)]  # images
+        self.stale = [False] * n  # streams waiting to reconnect
         self.shape = [[] for _ in range(n)]  # image shapes
         self.sources = [ops.clean_str(x) for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
@@ -119,7 +129,7 @@ class LoadStreams:
                     "'source=0' webcam not supported in Colab and Kaggle notebooks. "
                     "Try running 'source=0' in a local environment."
                 )
-            self.caps[i] = cv2.VideoCapture(s)  # store video capture object
+            self.caps[i] = self.open(s)  # store video capture object
             if not self.caps[i].isOpened():
                 raise ConnectionError(f"{st}Failed to open {s}")
             w = int(self.caps[i].get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -140,19 +150,47 @@ class LoadStreams:
             self.threads[i].start()
         LOGGER.info("")  # newline
 
+    @classmethod
+    def open(cls, s):
+        """Opens a video capture, bounding connection and read waits for network streams where OpenCV supports it."""
+        if (
+            isinstance(s, str)
+            and urlparse(s).scheme in {"rtsp", "rtsps", "rtmp", "http", "https", "tcp", "udp"}
+            and hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC")
+        ):
+            params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(cls.open_timeout * 1000)]
+            params += [cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(cls.read_timeout * 1000)]
+            return cv2.VideoCapture(s, cv2.CAP_FFMPEG, params)
+        return cv2.VideoCapture(s)
+
     def update(self, i, cap, stream):
-        """Read stream frames in daemon thread and update image buffer."""
+        """Read stream frames in daemon thread and update image buffer, reconnecting lost streams in the background."""
         n, f = 0, self.frames[i]  # frame number, frame array
-        while self.running and cap.isOpened() and n < (f - 1):
+        failures = 0  # consecutive reconnect failures
+        while self.running and n < (f - 1):
+            if self.stale[i]:
+                # Jittered exponential backoff, waiting in small steps so close() is not delayed
+                delay = random.uniform(self.backoff[0], min(self.backoff[1], self.backoff[0] * 2**failures))
+                deadline = time.time() + delay
+                while self.running and time.time() < deadline:
+                    time.sleep(0.05)
+                cap.release()
+                cap = self.caps[i] = self.open(stream)
+                if cap.isOpened():
+                    LOGGER.info(f"Video stream {i + 1} reconnected ✅")
+                    self.stale[i], failures = False, 0
+                else:
+                    failures += 1
+                continue
             if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
                 n += 1
-                cap.grab()  # .read() = .grab() followed by .retrieve()
-                if n % self.vid_stride == 0:
-                    success, im = cap.retrieve()
+                success = cap.grab()  # .read() = .grab() followed by .retrieve()
+                if n % self.vid_stride == 0 or not success:
+                    success, im = cap.retrieve() if success else (False, None)
                     if not success:
-                        im = np.zeros(self.shape[i], dtype=np.uint8)
                         LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
-                        cap.open(stream)  # re-open stream if signal was lost
+                        self.stale[i] = True  # reconnect on the next loop, consumers get blank frames meanwhile
+                        continue
                     if self.buffer:
                         self.imgs[i].append(im)
                     else:
@@ -184,8 +222,8 @@ class LoadStreams:
 
         images = []
         for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
+            # Wait until a frame is available in each buffer, unless the stream is reconnecting
+            while not x and not self.stale[i]:
                 if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
                     self.close()
                     raise StopIteration
@@ -196,7 +234,7 @@ class LoadStreams:
 
             # Get and remove the first frame from imgs buffer
             if self.buffer:
-                images.append(x.pop(0))
+                images.append(x.pop(0) if x else np.zeros(self.shape[i], dtype=np.uint8))
 
             # Get the last frame, and clear the rest from the imgs buffer
             else:
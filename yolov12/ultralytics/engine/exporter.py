@@ -65,13 +65,15 @@ from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
 
+import cv2
 import numpy as np
 import torch
 
 from ultralytics.cfg import TASK2DATA, get_cfg
 from ultralytics.data import build_dataloader
+from ultralytics.data.augment import LetterBox
 from ultralytics.data.dataset import YOLODataset
-from ultralytics.data.utils import check_cls_dataset, check_det_dataset
+from ultralytics.data.utils import VID_FORMATS, check_cls_dataset, check_det_dataset
 from ultralytics.nn.autobackend import check_class_names, default_class_names
 from ultralytics.nn.modules import C2f, Classify, Detect, RTDETRDecoder
 from ultralytics.nn.tasks import DetectionModel, SegmentationModel, WorldModel
@@ -100,8 +102,9 @@ from ultralytics.utils.checks import (
 )
 from ultralytics.utils.downloads import attempt_download_asset, get_github_assets, safe_download
 from ultralytics.utils.files import file_size, spaces_in_path
-from ultralytics.utils.ops import Profile
-from ultralytics.utils.torch_utils import TORCH_1_13, get_latest_opset, select_device
+from ultralytics.utils.metrics import ap_per_class, box_iou
+from ultralytics.utils.ops import Profile, non_max_suppression
+from ultralytics.utils.torch_utils import TORCH_1_13, TORCH_2_9, get_latest_opset, select_device
 
 
 def export_formats():
@@ -109,7 +112,7 @@ def export_formats():
     x = [
         ["PyTorch", "-", ".pt", True, True, []],
         ["TorchScript", "torchscript", ".torchscript", True, True, ["batch", "optimize"]],
-        ["ONNX", "onnx", ".onnx", True, True, ["batch", "dynamic", "half", "opset", "simplify"]],
+        ["ONNX", "onnx", ".onnx", True, True, ["batch", "dynamic", "half", "int8", "opset", "simplify"]],
         ["OpenVINO", "openvino", "_openvino_model", True, False, ["batch", "dynamic", "half", "int8"]],
         ["TensorRT", "engine", ".engine", False, True, ["batch", "dynamic", "half", "int8", "simplify"]],
         ["CoreML", "coreml", ".mlpackage", True, False, ["batch", "half", "int8", "nms"]],
@@ -446,6 +449,11 @@ class Exporter:
     def get_int8_calibration_dataloader(self, prefix=""):
         """Build and return a dataloader suitable for calibration of INT8 models."""
         LOGGER.info(f"{prefix} collecting INT8 calibration images from 'data={self.args.data}'")
+        source = Path(str(self.args.data))
+        if source.suffix[1:].lower() in VID_FORMATS:
+            return self.get_int8_calibration_frames([source], prefix)
+        if source.is_dir() and (videos := sorted(x for x in source.rglob("*") if x.suffix[1:].lower() in VID_FORMATS)):
+            return self.get_int8_calibration_frames(videos, prefix)
         data = (check_cls_dataset if self.model.task == "classify" else check_det_dataset)(self.args.data)
         # TensorRT INT8 calibration should use 2x batch size
         batch = self.args.batch * (2 if self.args.format == "engine" else 1)
@@ -466,6 +474,123 @@ class Exporter:
             LOGGER.warning(f"{prefix} WARNING ⚠️ >300 images recommended for INT8 calibration, found {n} images.")
         return build_dataloader(dataset, batch=batch, workers=0)  # required for batch loading
 
+    def get_int8_calibration_frames(self, videos, prefix="", n=300):
+        """
+        Sample INT8 calibration batches from video footage, e.g. recordings from the cameras the model will serve.
+
+        Up to `n` frames are taken at evenly spaced positions across all videos and letterboxed to the export image size
+        the way the predictor does it, so that calibration sees the same input distribution as deployment.
+
+        Args:
+            videos (List[Path]): Video files to sample from.
+            prefix (str): Log prefix.
+            n (int): Maximum number of frames to sample.
+
+        Returns:
+            (List[dict]): Batches as {"img": torch.Tensor} with uint8 BCHW RGB images, like the dataloader yields.
+        """
+        lengths = []
+        for video in videos:
+            cap = cv2.VideoCapture(str(video))
+            lengths.append(max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0))
+            cap.release()
+        total = sum(lengths)
+        if not total:
+            raise ValueError(f"No readable frames found in calibration videos {[str(x) for x in videos]}.")
+
+        letterbox = LetterBox(self.imgsz, auto=False, stride=int(max(self.model.stride)))
+        positions = np.linspace(0, total, min(n, total), endpoint=False).astype(int)
+        images, start = [], 0
+        for video, length in zip(videos, lengths):
+            indices = positions[(positions >= start) & (positions < start + length)] - start
+            start += length
+            if not len(indices):
+                continue
+            cap = cv2.VideoCapture(str(video))
+            for i in indices:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(i))
+                ok, frame = cap.read()
+                if ok:
+                    im = letterbox(image=frame)[..., ::-1].transpose(2, 0, 1)  # BGR to RGB, HWC to CHW
+                    images.append(torch.from_numpy(np.ascontiguousarray(im)))
+            cap.release()
+
+        batch = self.args.batch * (2 if self.args.format == "engine" else 1)  # TensorRT calibrates with 2x batch size
+        if len(images) < batch:
+            raise ValueError(
+                f"The calibration footage ({len(images)} frames) must have at least as many frames as the batch "
+                f"size ('batch={batch}')."
+            )
+        LOGGER.info(f"{prefix} sampled {len(images)} calibration frames from {len(videos)} video(s)")
+        return [{"img": torch.stack(images[i : i + batch])} for i in range(0, len(images) - batch + 1, batch)]
+
+    def split_int8_holdout(self, dataloader, k=5):
+        """Split INT8 calibration batches into calibration and held-out batches, holding out every k-th batch."""
+        batches = list(dataloader)
+        if len(batches) < 2:
+            return batches, []
+        holdout = [i % k == k - 1 for i in range(len(batches))]
+        return [b for b, h in zip(batches, holdout) if not h], [b for b, h in zip(batches, holdout) if h]
+
+    def int8_report(self, fp32, int8, batches, prefix=""):
+        """
+        Compare an INT8 model with its FP32 source on held-out images.
+
+        The FP32 detections above `conf` (default 0.25) serve as pseudo ground truth, so the mAP50-95 of the INT8 model
+        against them measures the accuracy lost to quantization without needing labels; the FP32 model's own score on
+        the same pseudo labels is reported alongside as the reference for the delta.
+
+        Args:
+            fp32 (Callable): Runs the FP32 model on a float32 BCHW batch and returns the raw output array.
+            int8 (Callable): Runs the INT8 model the same way.
+            batches (List[dict]): Held-out batches as {"img": torch.Tensor} with uint8 BCHW images.
+            prefix (str): Log prefix.
+
+        Returns:
+            (dict): mAP50-95 of both models against the pseudo labels, their delta, per-image latencies in ms and the
+                speedup, or an empty dict when there is nothing to compare on.
+        """
+        from types import SimpleNamespace
+
+        from ultralytics.engine.validator import BaseValidator
+
+        if not batches or self.model.task != "detect":
+            return {}
+        matcher = SimpleNamespace(iouv=torch.linspace(0.5, 0.95, 10))  # IoU thresholds for mAP@0.5:0.95
+        stats = {"fp32": [], "int8": []}
+        times = {"fp32": 0.0, "int8": 0.0}
+        images = 0
+        for batch in batches:
+            im = batch["img"].numpy().astype(np.float32) / 255.0
+            images += len(im)
+            outputs = {}
+            for name, run in ("fp32", fp32), ("int8", int8):
+                t = time.perf_counter()
+                outputs[name] = torch.from_numpy(run(im))
+                times[name] += time.perf_counter() - t
+            labels = non_max_suppression(outputs["fp32"], self.args.conf or 0.25, 0.7, max_det=300)
+            for name, output in outputs.items():
+                for pred, gt in zip(non_max_suppression(output, 0.001, 0.7, max_det=300), labels):
+                    iou = box_iou(gt[:, :4], pred[:, :4])
+                    correct = BaseValidator.match_predictions(matcher, pred[:, 5], gt[:, 5], iou)
+                    stats[name].append((correct, pred[:, 4], pred[:, 5], gt[:, 5]))
+
+        report = {"images": images}
+        for name, s in stats.items():
+            tp, conf, pred_cls, target_cls = (torch.cat(x).numpy() for x in zip(*s))
+            ap = ap_per_class(tp, conf, pred_cls, target_cls)[5] if len(target_cls) else np.zeros(0)
+            report[f"map_{name}"] = float(ap.mean()) if ap.size else 0.0
+        report["map_delta"] = report["map_int8"] - report["map_fp32"]
+        report["latency_fp32_ms"] = times["fp32"] * 1e3 / images
+        report["latency_int8_ms"] = times["int8"] * 1e3 / images
+        report["speedup"] = times["fp32"] / max(times["int8"], 1e-9)
+        LOGGER.info(
+            f"{prefix} INT8 on {images} held-out images: mAP50-95 vs FP32 pseudo-labels {report['map_int8']:.3f} "
+            f"(FP32 {report['map_fp32']:.3f}, delta {report['map_delta']:+.3f}), latency "
+            f"{report['latency_fp32_ms']:.1f} -> {report['latency_int8_ms']:.1f} ms/image ({report['speedup']:.2f}x)"
+        )
+        return report
+
     @try_export
     def export_torchscript(self, prefix=colorstr("TorchScript:")):
         """YOLO TorchScript model export."""
@@ -516,6 +641,7 @@ class Exporter:
             input_names=["images"],
             output_names=output_names,
             dynamic_axes=dynamic or None,
+            **({"dynamo": False} if TORCH_2_9 else {}),  # torch>=2.9 defaults to the dynamo exporter (needs onnxscript)
         )
 
         # Checks
@@ -538,8 +664,63 @@ class Exporter:
             meta.key, meta.value = k, str(v)
 
         onnx.save(model_onnx, f)
+        if self.args.int8:
+            return self.export_onnx_int8(f, prefix)
         return f, model_onnx
 
+    def export_onnx_int8(self, f, prefix=colorstr("ONNX:")):
+        """Statically quantize an exported FP32 ONNX model to INT8 in QDQ format for CPU inference."""
+        check_requirements("onnxruntime")
+        import onnx  # noqa
+        import onnxruntime
+        from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+        LOGGER.info(f"{prefix} starting INT8 quantization with onnxruntime {onnxruntime.__version__}...")
+        fq = str(self.file.with_name(f"{self.file.stem}_int8.onnx"))
+        calibration, holdout = self.split_int8_holdout(self.get_int8_calibration_dataloader(prefix))
+
+        class CalibrationReader(CalibrationDataReader):
+            """Feeds calibration batches to the quantizer as normalized float32 images."""
+
+            def __init__(self, batches):
+                self.batches = iter(batches)
+
+            def get_next(self):
+                batch = next(self.batches, None)
+                return None if batch is None else {"images": batch["img"].numpy().astype(np.float32) / 255.0}
+
+        # Keep box decoding (DFL and the Add/Sub/Mul/Div/Sigmoid ops of the head) in float, as the OpenVINO export does
+        exclude = []
+        if isinstance(self.model.model[-1], Detect):
+            head = ".".join(list(self.model.named_modules())[-1][0].split(".")[:2])
+            exclude = [
+                x.name
+                for x in onnx.load(f).graph.node
+                if x.name.startswith(f"/{head}/") and (x.op_type != "Conv" or "/dfl/" in x.name)
+            ]
+        quantize_static(
+            f,
+            fq,
+            CalibrationReader(calibration),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            nodes_to_exclude=exclude,
+        )
+
+        sessions = [onnxruntime.InferenceSession(x, providers=["CPUExecutionProvider"]) for x in (f, fq)]
+        report = self.int8_report(*(lambda x, s=s: s.run(None, {"images": x})[0] for s in sessions), holdout, prefix)
+
+        # Metadata, including the quantization report
+        model_onnx = onnx.load(fq)
+        del model_onnx.metadata_props[:]
+        for k, v in {**self.metadata, "int8": report}.items():
+            meta = model_onnx.metadata_props.add()
+            meta.key, meta.value = k, str(v)
+        onnx.save(model_onnx, fq)
+        return fq, model_onnx
+
     @try_export
     def export_openvino(self, prefix=colorstr("OpenVINO:")):
         """YOLO OpenVINO export."""
@@ -597,12 +778,16 @@ class Exporter:
                     types=["Sigmoid"],
                 )
 
+            calibration, holdout = self.split_int8_holdout(self.get_int8_calibration_dataloader(prefix))
             quantized_ov_model = nncf.quantize(
                 model=ov_model,
-                calibration_dataset=nncf.Dataset(self.get_int8_calibration_dataloader(prefix), transform_fn),
+                calibration_dataset=nncf.Dataset(calibration, transform_fn),
                 preset=nncf.QuantizationPreset.MIXED,
                 ignored_scope=ignored_scope,
             )
+            core = ov.Core()
+            compiled = [core.compile_model(x, "CPU") for x in (ov_model, quantized_ov_model)]
+            self.metadata["int8"] = self.int8_report(*(lambda x, c=c: c([x])[0] for c in compiled), holdout, prefix)
             serialize(quantized_ov_model, fq_ov)
             return fq, None
 
@@ -1,6 +1,7 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import inspect
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
@@ -27,6 +28,8 @@ from ultralytics.utils import (
     yaml_load,
 )
 
+_PREDICTOR_SETUP_LOCK = threading.Lock()  # serializes the first predictor setup in Model.infer_frames
+
 
 class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultralytics/ultralytics", pipeline_tag="object-detection", license="agpl-3.0"):
     """
@@ -115,6 +118,7 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
         super().__init__()
         self.callbacks = callbacks.get_default_callbacks()
         self.predictor = None  # reuse predictor
+        self._frames_setup = None  # (predictor, [(kwargs, args)]) prepared by infer_frames
         self.model = None  # model object
         self.trainer = None  # trainer object
         self.ckpt = {}  # if loaded from *.pt
@@ -544,7 +548,7 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
             x in ARGV for x in ("predict", "track", "mode=predict", "mode=track")
         )
 
-        custom = {"conf": 0.25, "batch": 1, "save": is_cli, "mode": "predict"}  # method defaults
+        custom = {"conf": 0.25, "batch": 1, "save": is_cli, "lean_results": False, "mode": "predict"}  # method defaults
         args = {**self.overrides, **custom, **kwargs}  # highest priority args on the right
         prompts = args.pop("prompts", None)  # for SAM-type models
 
@@ -559,6 +563,51 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
             self.predictor.set_prompts(prompts)
         return self.predictor.predict_cli(source=source) if is_cli else self.predictor(source=source, stream=stream)
 
+    def infer_frames(self, frames: Union[np.ndarray, List[np.ndarray]], **kwargs: Any) -> List[Results]:
+        """
+        Runs low-overhead inference on in-memory BGR frames, e.g. once per decoded video frame.
+
+        Unlike `predict`, this keeps a prepared predictor between calls: arguments are parsed once per distinct set of
+        `kwargs` and reused afterwards, and each call skips source discovery, dataset construction and the prediction
+        callbacks, going straight through preprocess, inference and postprocess. Callers sharing one model with
+        different arguments each keep their own parsed arguments. Nothing is saved, shown or logged, and trackers
+        registered by `track` are not updated.
+
+        Args:
+            frames (np.ndarray | List[np.ndarray]): A BGR frame (h, w, 3) or a list of frames to infer as one batch.
+            **kwargs: Prediction arguments as for `predict`, e.g. conf, iou, imgsz, classes.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): One Results object per frame.
+
+        Examples:
+            >>> model = YOLO("yolo11n.pt")
+            >>> for frame in frames:
+            ...     results = model.infer_frames(frame, conf=0.5, classes=[0])
+        """
+        if isinstance(frames, np.ndarray) and frames.ndim == 3:
+            frames = [frames]
+        custom = {"conf": 0.25, "batch": 1, "save": False, "verbose": False}  # method defaults
+        if not self.predictor:
+            with _PREDICTOR_SETUP_LOCK:
+                if not self.predictor:  # another thread may have set it up while waiting for the lock
+                    args = get_cfg(DEFAULT_CFG_DICT, {**self.overrides, **custom, **kwargs, "mode": "predict"})
+                    predictor = self._smart_load("predictor")(overrides=vars(args), _callbacks=self.callbacks)
+                    predictor.setup_model(model=self.model, verbose=False)
+                    self._frames_setup = (predictor, [(dict(kwargs), predictor.args)])
+                    self.predictor = predictor
+        predictor = self.predictor
+        with predictor._lock:  # the prepared arguments are shared by all threads using this predictor
+            if self._frames_setup is None or self._frames_setup[0] is not predictor:
+                self._frames_setup = (predictor, [])
+            prepared = self._frames_setup[1]
+            args = next((a for k, a in prepared if k == kwargs), None)
+            if args is None:
+                args = get_cfg(DEFAULT_CFG_DICT, {**self.overrides, **custom, **kwargs, "mode": "predict"})
+                prepared.append((dict(kwargs), args))
+                del prepared[:-8]  # keep the most recent argument sets
+            return predictor.infer_frames(frames, args)
+
     def track(
         self,
         source: Union[str, Path, int, list, tuple, np.ndarray, torch.Tensor] = None,
@@ -581,7 +630,8 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
             **kwargs: Additional keyword arguments for configuring the tracking process.
 
         Returns:
-            (List[ultralytics.engine.results.Results]): A list of tracking results, each a Results object.
+            (List[ultralytics.engine.results.Results]): A list of tracking results, each a Results object, or a
+                LeanResults object when `lean_results=True`.
 
         Raises:
             AttributeError: If the predictor does not have registered trackers.
@@ -591,6 +641,8 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
             >>> results = model.track(source="path/to/video.mp4", show=True)
             >>> for r in results:
             ...     print(r.boxes.id)  # print tracking IDs
+            >>> for r in model.track(source="path/to/video.mp4", stream=True, lean_results=True):
+            ...     print(r.boxes["id"])  # structured array of records, no Results objects are built
 
         Notes:
             - This method sets a default confidence threshold of 0.1 for ByteTrack-based tracking.
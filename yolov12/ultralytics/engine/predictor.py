@@ -41,7 +41,9 @@ import torch
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
-from ultralytics.data.augment import LetterBox, classify_transforms
+from ultralytics.data.augment import LetterBox, LetterBoxBuffer, classify_transforms, letterbox_buckets, select_bucket
+from ultralytics.data.loaders import SourceTypes
+from ultralytics.engine.results import LeanResults
 from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
@@ -108,9 +110,11 @@ class BasePredictor:
         self.batch = None
         self.results = None
         self.transforms = None
+        self.input_buffer = None  # reusable LetterBoxBuffer for fused preprocessing
+        self.buckets = None  # fixed letterbox canvases (h, w), smallest area first
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
-        self._lock = threading.Lock()  # for automatic thread-safe inference
+        self._lock = threading.RLock()  # for automatic thread-safe inference, re-entered by Model.infer_frames
         callbacks.add_integration_callbacks(self)
 
     def preprocess(self, im):
@@ -121,6 +125,9 @@ class BasePredictor:
             im (torch.Tensor | List(np.ndarray)): BCHW for tensor, [(HWC) x B] for list.
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        if not_tensor and self.args.fused_preprocess:
+            im = self.fused_transform(im).to(self.device, non_blocking=True)
+            return im.half() if self.model.fp16 else im
         if not_tensor:
             im = np.stack(self.pre_transform(im))
             im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW, (n, 3, h, w)
@@ -142,24 +149,75 @@ class BasePredictor:
         )
         return self.model(im, augment=self.args.augment, visualize=visualize, embed=self.args.embed, *args, **kwargs)
 
-    def pre_transform(self, im):
+    def get_letterbox(self, im):
         """
-        Pre-transform input image before inference.
+        Returns the LetterBox transform that resizes and pads the input images for inference.
 
         Args:
-            im (List(np.ndarray)): (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+            im (List(np.ndarray)): [(h, w, 3) x N] input images.
 
         Returns:
-            (list): A list of transformed images.
+            (LetterBox): The letterbox transform.
         """
+        if self.buckets:  # letterbox to a fixed canvas so input shapes stay stable
+            shapes = {select_bucket(x.shape[:2], self.buckets, self.imgsz) for x in im}
+            return LetterBox(shapes.pop() if len(shapes) == 1 else self.imgsz, stride=self.model.stride)
         same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        return LetterBox(
             self.imgsz,
             auto=same_shapes and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
+
+    def pre_transform(self, im):
+        """
+        Pre-transform input image before inference.
+
+        Args:
+            im (List(np.ndarray)): (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+
+        Returns:
+            (list): A list of transformed images.
+        """
+        letterbox = self.get_letterbox(im)
         return [letterbox(image=x) for x in im]
 
+    def bucket_batches(self, im):
+        """
+        Groups a batch by letterbox bucket so that each forward pass has a single fixed input shape.
+
+        Args:
+            im (List[np.ndarray] | torch.Tensor): [(h, w, 3) x N] input images or a BCHW tensor.
+
+        Returns:
+            (List[List[int]]): Image indices of each group, in order of first appearance. The whole batch is one group
+                when bucketing is off, the input is a tensor or all images share a bucket.
+        """
+        if not self.buckets or isinstance(im, torch.Tensor):
+            return [list(range(len(im)))]
+        groups = {}
+        for i, x in enumerate(im):
+            groups.setdefault(select_bucket(x.shape[:2], self.buckets, self.imgsz), []).append(i)
+        return list(groups.values())
+
+    def fused_transform(self, im):
+        """
+        Letterbox, convert BGR to RGB and normalize images in a single pass into a reusable input buffer.
+
+        Selected with `fused_preprocess=True`. The buffer is page-locked when inferring on CUDA so the host-to-device
+        copy is asynchronous, and is overwritten by the next batch.
+
+        Args:
+            im (List(np.ndarray)): [(h, w, 3) x N] BGR input images.
+
+        Returns:
+            (torch.Tensor): (N, 3, h, w) float32 RGB input in 0.0-1.0 on the CPU.
+        """
+        if self.input_buffer is None:
+            self.input_buffer = LetterBoxBuffer(None, pin_memory=self.device.type == "cuda")
+        self.input_buffer.letterbox = self.get_letterbox(im)
+        return self.input_buffer(im)
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-processes predictions for an image and returns them."""
         return preds
@@ -188,8 +246,8 @@ class BasePredictor:
         for _ in gen:  # sourcery skip: remove-empty-nested-block, noqa
             pass
 
-    def setup_source(self, source):
-        """Sets up source and inference mode."""
+    def setup_transforms(self):
+        """Checks the inference image size and sets up the classification transforms."""
         self.imgsz = check_imgsz(self.args.imgsz, stride=self.model.stride, min_dim=2)  # check image size
         self.transforms = (
             getattr(
@@ -200,6 +258,19 @@ class BasePredictor:
             if self.args.task == "classify"
             else None
         )
+        buckets = self.args.buckets
+        if buckets is None:
+            buckets = bool(getattr(self.model, "compiled", None))  # compiled models default to bucketed inputs
+        flexible = self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)
+        self.buckets = (
+            letterbox_buckets(self.imgsz, self.model.stride, canvases=None if buckets is True else buckets)
+            if buckets and flexible and self.args.task != "classify"
+            else None
+        )
+
+    def setup_source(self, source):
+        """Sets up source and inference mode."""
+        self.setup_transforms()
         self.dataset = load_inference_source(
             source=source,
             batch=self.args.batch,
@@ -236,7 +307,8 @@ class BasePredictor:
 
             # Warmup model
             if not self.done_warmup:
-                self.model.warmup(imgsz=(1 if self.model.pt or self.model.triton else self.dataset.bs, 3, *self.imgsz))
+                bs = 1 if (self.model.pt and not self.model.compiled) or self.model.triton else self.dataset.bs
+                self.model.warmup(imgsz=(bs, 3, *self.imgsz), buckets=self.buckets)
                 self.done_warmup = True
 
             self.seen, self.windows, self.batch = 0, [], None
@@ -303,6 +375,42 @@ class BasePredictor:
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    @smart_inference_mode()
+    def infer_frames(self, frames, args=None, *a, **kwargs):
+        """
+        Runs inference on in-memory frames with a prepared predictor, bypassing source setup and callbacks.
+
+        The frames go straight through preprocess, inference and postprocess: no data source is built, no callbacks
+        are run and nothing is saved, shown or logged. With letterbox buckets, frames that map to different buckets
+        (e.g. cameras with different aspect ratios) run as one batch per bucket.
+
+        Args:
+            frames (List[np.ndarray]): BGR frames [(h, w, 3) x N].
+            args (IterableSimpleNamespace, optional): Prepared arguments to run with. Switching to them checks the image
+                size again; passing the same object as the previous call costs nothing.
+
+        Returns:
+            (List[ultralytics.engine.results.Results | ultralytics.engine.results.LeanResults]): One result per frame,
+                as LeanResults when `lean_results=True`.
+        """
+        with self._lock:
+            if (args is not None and args is not self.args) or self.imgsz is None:
+                self.args = args or self.args
+                self.setup_transforms()
+                self.source_type = SourceTypes(from_img=True)
+            if not self.done_warmup:
+                self.model.warmup(imgsz=(1, 3, *self.imgsz), buckets=self.buckets)
+                self.done_warmup = True
+            results = [None] * len(frames)
+            for idx in self.bucket_batches(frames):  # one forward pass per letterbox bucket
+                group = [frames[i] for i in idx]
+                self.batch = ([f"image{i}.jpg" for i in idx], group, [""] * len(idx))
+                im = self.preprocess(group)
+                preds = self.inference(im, *a, **kwargs)
+                for i, r in zip(idx, self.postprocess(preds, im, group)):
+                    results[i] = r
+            return results
+
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
         self.model = AutoBackend(
@@ -314,6 +422,8 @@ class BasePredictor:
             batch=self.args.batch,
             fuse=True,
             verbose=verbose,
+            threads=self.args.threads,
+            compile=self.args.compile,
         )
 
         self.device = self.model.device  # update device
@@ -335,6 +445,8 @@ class BasePredictor:
         self.txt_path = self.save_dir / "labels" / (p.stem + ("" if self.dataset.mode == "image" else f"_{frame}"))
         string += "{:g}x{:g} ".format(*im.shape[2:])
         result = self.results[i]
+        if isinstance(result, LeanResults):  # lean results carry no image to plot, save or show
+            return f"{string}{result.verbose()}{result.speed['inference']:.1f}ms"
         result.save_dir = self.save_dir.__str__()  # used in other locations
         string += f"{result.verbose()}{result.speed['inference']:.1f}ms"
 
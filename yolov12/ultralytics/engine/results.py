@@ -935,6 +935,93 @@ class Results(SimpleClass):
         return json.dumps(self.summary(normalize=normalize, decimals=decimals), indent=2)
 
 
+# Record layout of LeanResults.boxes: one row per detection, id is -1 until a tracker assigns one
+DETECTION_DTYPE = np.dtype([("xyxy", np.float32, (4,)), ("conf", np.float32), ("cls", np.int32), ("id", np.int32)])
+
+
+class LeanResults:
+    """
+    A lightweight, array-native container for the detections of a single image.
+
+    Unlike Results, it keeps no image, no tensors and no per-attribute wrapper objects: the detections are one
+    contiguous NumPy structured array of DETECTION_DTYPE records and the class names are the model's own table, so
+    building it costs a single device-to-host copy per batch. It is produced by detection predictors when
+    `lean_results=True` and is meant for high-rate consumers that only need boxes, scores, classes and track IDs.
+
+    Attributes:
+        boxes (np.ndarray): Structured array of shape (N,) with fields xyxy (float32, 4), conf (float32),
+            cls (int32) and id (int32, -1 when untracked), in original image coordinates.
+        names (Dict[int, str]): Class names table shared with the model.
+        orig_shape (Tuple[int, int]): Original image shape in (height, width) format.
+        path (str): Path to the image file.
+        speed (Dict[str, float]): Preprocess, inference and postprocess times in milliseconds.
+
+    Examples:
+        >>> model = YOLO("yolo11n.pt")
+        >>> for r in model.track("video.mp4", stream=True, lean_results=True):
+        ...     keep = r.boxes[r.boxes["conf"] > 0.5]
+        ...     print(keep["xyxy"], keep["id"], [r.names[c] for c in keep["cls"]])
+    """
+
+    __slots__ = ("boxes", "names", "orig_shape", "path", "speed")
+
+    def __init__(self, boxes, names, orig_shape, path=""):
+        """
+        Initializes a LeanResults instance.
+
+        Args:
+            boxes (np.ndarray): Structured array of DETECTION_DTYPE records.
+            names (Dict[int, str]): Class names table.
+            orig_shape (Tuple[int, int]): Original image shape in (height, width) format.
+            path (str): Path to the image file.
+        """
+        self.boxes = boxes
+        self.names = names
+        self.orig_shape = tuple(orig_shape)
+        self.path = path
+        self.speed = {"preprocess": None, "inference": None, "postprocess": None}
+
+    def __len__(self):
+        """Returns the number of detections."""
+        return len(self.boxes)
+
+    def __getitem__(self, idx):
+        """Returns a LeanResults instance holding the detections selected by `idx`."""
+        return LeanResults(self.boxes[np.atleast_1d(idx)], self.names, self.orig_shape, self.path)
+
+    def __repr__(self):
+        """Returns a short description with the number of detections and the image shape."""
+        return f"{self.__class__.__name__}({len(self)} detections, orig_shape={self.orig_shape})"
+
+    def verbose(self):
+        """Returns a log string with the detection count per class, in the same format as Results.verbose()."""
+        if not len(self):
+            return "(no detections), "
+        classes, counts = np.unique(self.boxes["cls"], return_counts=True)
+        return "".join(f"{n} {self.names[int(c)]}{'s' * int(n > 1)}, " for c, n in zip(classes, counts))
+
+    @staticmethod
+    def from_detections(det, names, orig_shape, path=""):
+        """
+        Builds a LeanResults instance from an array of detections.
+
+        Args:
+            det (np.ndarray): Detections of shape (N, 6) as [x1, y1, x2, y2, conf, cls], or (N, 7) with the track ID
+                in the fifth column as produced by the trackers.
+            names (Dict[int, str]): Class names table.
+            orig_shape (Tuple[int, int]): Original image shape in (height, width) format.
+            path (str): Path to the image file.
+
+        Returns:
+            (LeanResults): The detections as DETECTION_DTYPE records.
+        """
+        boxes = np.empty(len(det), dtype=DETECTION_DTYPE)
+        boxes["xyxy"] = det[:, :4]
+        boxes["conf"], boxes["cls"] = det[:, -2], det[:, -1]
+        boxes["id"] = det[:, 4] if det.shape[1] == 7 else -1
+        return LeanResults(boxes, names, orig_shape, path)
+
+
 class Boxes(BaseTensor):
     """
     A class for managing and manipulating detection boxes.
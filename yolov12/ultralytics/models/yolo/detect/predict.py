@@ -1,7 +1,9 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import torch
+
 from ultralytics.engine.predictor import BasePredictor
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import LeanResults, Results
 from ultralytics.utils import ops
 
 
@@ -31,6 +33,9 @@ class DetectionPredictor(BasePredictor):
             classes=self.args.classes,
         )
 
+        if self.args.lean_results:
+            return self.construct_lean_results(preds, img, orig_imgs)
+
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
             orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)
 
@@ -39,3 +44,37 @@ class DetectionPredictor(BasePredictor):
             pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
             results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred))
         return results
+
+    def construct_lean_results(self, preds, img, orig_imgs):
+        """
+        Builds array-native LeanResults from the NMS output without creating Results objects.
+
+        The detections of the whole batch are concatenated, scaled once per distinct image shape (frames from one
+        camera share a shape) and copied to the host in one transfer; each image then gets a contiguous slice of that
+        buffer as a structured array of records.
+
+        Args:
+            preds (List[torch.Tensor]): NMS output per image, each of shape (N, 6) as [x1, y1, x2, y2, conf, cls].
+            img (torch.Tensor): Preprocessed input batch.
+            orig_imgs (List[np.ndarray] | torch.Tensor): Original images.
+
+        Returns:
+            (List[ultralytics.engine.results.LeanResults]): One LeanResults object per image.
+        """
+        if isinstance(orig_imgs, list):
+            shapes = [tuple(im.shape[:2]) for im in orig_imgs]
+        else:  # input images are a torch.Tensor, not a list
+            shapes = [tuple(orig_imgs.shape[2:])] * len(preds)
+        counts = [len(pred) for pred in preds]
+        det = torch.cat(preds)
+        if len(set(shapes)) == 1:
+            det[:, :4] = ops.scale_boxes(img.shape[2:], det[:, :4], shapes[0])
+        else:
+            for pred, shape in zip(det.split(counts), shapes):
+                pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], shape)
+        batch = LeanResults.from_detections(det.cpu().numpy(), self.model.names, (0, 0))
+        results, start = [], 0
+        for n, shape, img_path in zip(counts, shapes, self.batch[0]):
+            results.append(LeanResults(batch.boxes[start : start + n], self.model.names, shape, path=img_path))
+            start += n
+        return results
@@ -3,6 +3,8 @@
 import ast
 import json
 import platform
+import time
+import warnings
 import zipfile
 from collections import OrderedDict, namedtuple
 from pathlib import Path
@@ -91,6 +93,8 @@ class AutoBackend(nn.Module):
         batch=1,
         fuse=True,
         verbose=True,
+        threads=0,
+        compile=False,
     ):
         """
         Initialize the AutoBackend for inference.
@@ -104,6 +108,10 @@ class AutoBackend(nn.Module):
             batch (int): Batch-size to assume for inference.
             fuse (bool): Fuse Conv2D + BatchNorm layers for optimization. Defaults to True.
             verbose (bool): Enable verbose logging. Defaults to True.
+            threads (int): CPU threads for ONNX Runtime and OpenVINO inference, 0 lets the runtime decide.
+            compile (bool | str): Compile PyTorch weights for inference, True or 'compile' for torch.compile (falling
+                back to a TorchScript trace where it fails), 'trace' for a TorchScript trace. One graph is built per
+                input shape, so inputs should come in a few fixed shapes. Defaults to False.
         """
         super().__init__()
         w = str(weights[0] if isinstance(weights, list) else weights)
@@ -201,7 +209,10 @@ class AutoBackend(nn.Module):
                 cuda = False
             LOGGER.info(f"Using ONNX Runtime {providers[0]}")
             if onnx:
-                session = onnxruntime.InferenceSession(w, providers=providers)
+                options = onnxruntime.SessionOptions()
+                if threads:
+                    options.intra_op_num_threads = threads
+                session = onnxruntime.InferenceSession(w, options, providers=providers)
             else:
                 check_requirements(
                     ["model-compression-toolkit==2.1.1", "sony-custom-layers[torch]==0.2.0", "onnxruntime-extensions"]
@@ -251,10 +262,13 @@ class AutoBackend(nn.Module):
             # OpenVINO inference modes are 'LATENCY', 'THROUGHPUT' (not recommended), or 'CUMULATIVE_THROUGHPUT'
             inference_mode = "CUMULATIVE_THROUGHPUT" if batch > 1 else "LATENCY"
             LOGGER.info(f"Using OpenVINO {inference_mode} mode for batch={batch} inference...")
+            config = {"PERFORMANCE_HINT": inference_mode}
+            if threads:
+                config["INFERENCE_NUM_THREADS"] = threads
             ov_compiled_model = core.compile_model(
                 ov_model,
                 device_name="AUTO",  # AUTO selects best available device, do not modify
-                config={"PERFORMANCE_HINT": inference_mode},
+                config=config,
             )
             input_name = ov_compiled_model.input().get_any_name()
             metadata = w.parent / "metadata.yaml"
@@ -498,6 +512,12 @@ class AutoBackend(nn.Module):
             for p in model.parameters():
                 p.requires_grad = False
 
+        # Compiled inference, one graph per input shape
+        compiled = None
+        if compile and pt:
+            compiled = "compile" if compile in {True, "compile"} and hasattr(torch, "compile") else "trace"
+        graphs = {}
+
         self.__dict__.update(locals())  # assign all variables to self
 
     def forward(self, im, augment=False, visualize=False, embed=None):
@@ -521,7 +541,10 @@ class AutoBackend(nn.Module):
 
         # PyTorch
         if self.pt or self.nn_module:
-            y = self.model(im, augment=augment, visualize=visualize, embed=embed)
+            if self.compiled and not (augment or visualize or embed):
+                y = self.compiled_forward(im)
+            else:
+                y = self.model(im, augment=augment, visualize=visualize, embed=embed)
 
         # TorchScript
         elif self.jit:
@@ -715,17 +738,51 @@ class AutoBackend(nn.Module):
         """
         return torch.tensor(x).to(self.device) if isinstance(x, np.ndarray) else x
 
-    def warmup(self, imgsz=(1, 3, 640, 640)):
+    def compiled_forward(self, im):
+        """
+        Runs the compiled PyTorch model, building the graph for an input shape the first time it is seen.
+
+        Args:
+            im (torch.Tensor): The image tensor to perform inference on.
+
+        Returns:
+            (torch.Tensor | tuple): Raw model output.
+        """
+        key = (*im.shape, im.dtype)
+        if key not in self.graphs:
+            if self.compiled == "compile":
+                try:
+                    graph = torch.compile(self.model, dynamic=False)
+                    y = graph(im)  # compiles now
+                    self.graphs[key] = graph
+                    return y
+                except Exception as e:
+                    LOGGER.warning(f"WARNING ⚠️ torch.compile failed, falling back to TorchScript trace: {e}")
+                    self.compiled = "trace"
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # TracerWarnings for shape-dependent Python branches
+                self.graphs[key] = torch.jit.trace(self.model, im, strict=False, check_trace=False)
+        return self.graphs[key](im)
+
+    def warmup(self, imgsz=(1, 3, 640, 640), buckets=None):
         """
         Warm up the model by running one forward pass with a dummy input.
 
         Args:
             imgsz (tuple): The shape of the dummy input tensor in the format (batch_size, channels, height, width)
+            buckets (List[Tuple[int, int]], optional): Input shapes (height, width) to build graphs for when the model
+                is compiled, warming every shape the predictor letterboxes to. Defaults to the shape of `imgsz`.
         """
         import torchvision  # noqa (import here so torchvision import time not recorded in postprocess time)
 
         warmup_types = self.pt, self.jit, self.onnx, self.engine, self.saved_model, self.pb, self.triton, self.nn_module
-        if any(warmup_types) and (self.device.type != "cpu" or self.triton):
+        if self.compiled:
+            for shape in buckets or [imgsz[2:]]:
+                t = time.perf_counter()
+                shape = (*imgsz[:2], *shape)
+                self.forward(torch.zeros(shape, dtype=torch.half if self.fp16 else torch.float, device=self.device))
+                LOGGER.info(f"Built {self.compiled} graph for input {shape} in {time.perf_counter() - t:.1f}s")
+        elif any(warmup_types) and (self.device.type != "cpu" or self.triton):
             im = torch.empty(*imgsz, dtype=torch.half if self.fp16 else torch.float, device=self.device)  # input
             for _ in range(2 if self.jit else 1):
                 self.forward(im)  # warmup
@@ -882,8 +882,12 @@ class Attention(nn.Module):
         qkv (Conv): Convolutional layer for computing the query, key, and value.
         proj (Conv): Convolutional layer for projecting the attended values.
         pe (Conv): Convolutional layer for positional encoding.
+        backend (str): Attention kernel, 'sdpa' for torch scaled_dot_product_attention or 'eager' for explicit matmul
+            and softmax. 'auto' (default) selects 'sdpa'. Set on the class or on an instance.
     """
 
+    backend = "auto"
+
     def __init__(self, dim, num_heads=8, attn_ratio=0.5):
         """Initializes multi-head attention module with query, key, and value convolutions and positional encoding."""
         super().__init__()
@@ -914,10 +918,14 @@ class Attention(nn.Module):
             [self.key_dim, self.key_dim, self.head_dim], dim=2
         )
 
-        attn = (q.transpose(-2, -1) @ k) * self.scale
-        attn = attn.softmax(dim=-1)
-        x = (v @ attn.transpose(-2, -1)).view(B, C, H, W) + self.pe(v.reshape(B, C, H, W))
-        x = self.proj(x)
+        if attention_backend(self.backend, x) == "eager":
+            attn = (q.transpose(-2, -1) @ k) * self.scale
+            attn = attn.softmax(dim=-1)
+            x = (v @ attn.transpose(-2, -1)).view(B, C, H, W)
+        else:  # (B, heads, N, dim) layout, the default scale is key_dim**-0.5 like self.scale
+            x = F.scaled_dot_product_attention(q.transpose(-2, -1), k.transpose(-2, -1), v.transpose(-2, -1))
+            x = x.transpose(-2, -1).reshape(B, C, H, W)
+        x = self.proj(x + self.pe(v.reshape(B, C, H, W)))
         return x
 
 
@@ -1167,12 +1175,32 @@ try:
         from flash_attn.flash_attn_interface import flash_attn_func
         USE_FLASH_ATTN = True
     else:
-        from torch.nn.functional import scaled_dot_product_attention as sdpa
         logger.warning("FlashAttention is not available on this device. Using scaled_dot_product_attention instead.")
 except Exception:
-    from torch.nn.functional import scaled_dot_product_attention as sdpa
     logger.warning("FlashAttention is not available on this device. Using scaled_dot_product_attention instead.")
 
+ATTENTION_BACKENDS = {"auto", "flash", "sdpa", "eager"}
+
+
+def attention_backend(backend, x):
+    """
+    Resolves the attention kernel for an input tensor.
+
+    Args:
+        backend (str): Requested backend, one of 'auto', 'flash', 'sdpa' or 'eager'.
+        x (torch.Tensor): Input tensor of the attention module.
+
+    Returns:
+        (str): 'flash' for flash_attn_func (CUDA with flash-attn installed only), 'sdpa' for
+            torch.nn.functional.scaled_dot_product_attention or 'eager' for explicit matmul and softmax. 'auto' picks
+            'flash' where available and 'sdpa' everywhere else.
+    """
+    assert backend in ATTENTION_BACKENDS, f"invalid attention backend '{backend}', valid are {ATTENTION_BACKENDS}"
+    if backend in {"auto", "flash"}:
+        return "flash" if x.is_cuda and USE_FLASH_ATTN else "sdpa"
+    return backend
+
+
 class AAttn(nn.Module):
     """
     Area-attention module with the requirement of flash attention.
@@ -1195,9 +1223,14 @@ class AAttn(nn.Module):
 
     Notes:
         recommend that dim//num_heads be a multiple of 32 or 64.
+        The attention kernel is chosen by the `backend` attribute ('auto', 'flash', 'sdpa' or 'eager'), settable on the
+        class or on an instance; 'auto' uses flash attention on CUDA when available and scaled_dot_product_attention
+        everywhere else.
 
     """
 
+    backend = "auto"
+
     def __init__(self, dim, num_heads, area=1):
         """Initializes the area-attention module, a simple yet efficient attention module for YOLO."""
         super().__init__()
@@ -1230,7 +1263,8 @@ class AAttn(nn.Module):
             B, N, _ = qk.shape
         q, k = qk.split([C, C], dim=2)
 
-        if x.is_cuda and USE_FLASH_ATTN:
+        backend = attention_backend(self.backend, x)
+        if backend == "flash":
             q = q.view(B, N, self.num_heads, self.head_dim)
             k = k.view(B, N, self.num_heads, self.head_dim)
             v = v.view(B, N, self.num_heads, self.head_dim)
@@ -1240,6 +1274,12 @@ class AAttn(nn.Module):
                 k.contiguous().half(),
                 v.contiguous().half()
             ).to(q.dtype)
+        elif backend == "sdpa":
+            # (B, heads, N, head_dim) layout; every area is an independent batch entry after the split above
+            q = q.view(B, N, self.num_heads, self.head_dim).transpose(1, 2)
+            k = k.view(B, N, self.num_heads, self.head_dim).transpose(1, 2)
+            v = v.reshape(B, N, self.num_heads, self.head_dim).transpose(1, 2)
+            x = F.scaled_dot_product_attention(q, k, v).transpose(1, 2)
         else:
             q = q.transpose(1, 2).view(B, self.num_heads, self.head_dim, N)
             k = k.transpose(1, 2).view(B, self.num_heads, self.head_dim, N)
@@ -1,10 +1,13 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import contextlib
+import hashlib
+import os
 import pickle
 import re
 import types
 from copy import deepcopy
+from datetime import datetime
 from pathlib import Path
 
 import thop
@@ -66,6 +69,7 @@ from ultralytics.nn.modules import (
     v10Detect,
     A2C2f,
 )
+from ultralytics import __version__
 from ultralytics.utils import DEFAULT_CFG_DICT, DEFAULT_CFG_KEYS, LOGGER, colorstr, emojis, yaml_load
 from ultralytics.utils.checks import check_requirements, check_suffix, check_yaml
 from ultralytics.utils.loss import (
@@ -79,6 +83,7 @@ from ultralytics.utils.loss import (
 from ultralytics.utils.ops import make_divisible
 from ultralytics.utils.plotting import feature_visualization
 from ultralytics.utils.torch_utils import (
+    TORCH_2_1,
     fuse_conv_and_bn,
     fuse_deconv_and_bn,
     initialize_weights,
@@ -88,6 +93,8 @@ from ultralytics.utils.torch_utils import (
     time_sync,
 )
 
+READY_SUFFIX = ".ready.pt"  # ready-to-serve checkpoints written by ready_checkpoint()
+
 
 class BaseModel(nn.Module):
     """The BaseModel class serves as a base class for all the models in the Ultralytics YOLO family."""
@@ -787,7 +794,7 @@ class SafeUnpickler(pickle.Unpickler):
             return SafeClass
 
 
-def torch_safe_load(weight, safe_only=False):
+def torch_safe_load(weight, safe_only=False, mmap=False):
     """
     Attempts to load a PyTorch model with the torch.load() function. If a ModuleNotFoundError is raised, it catches the
     error, logs a warning message, and attempts to install the missing module via the check_requirements() function.
@@ -796,6 +803,7 @@ def torch_safe_load(weight, safe_only=False):
     Args:
         weight (str): The file path of the PyTorch model.
         safe_only (bool): If True, replace unknown classes with SafeClass during loading.
+        mmap (bool): If True, memory-map the tensors from the file instead of reading them into memory (torch>=2.1).
 
     Example:
     ```python
@@ -833,7 +841,7 @@ def torch_safe_load(weight, safe_only=False):
                 with open(file, "rb") as f:
                     ckpt = torch.load(f, pickle_module=safe_pickle)
             else:
-                ckpt = torch.load(file, map_location="cpu")
+                ckpt = torch.load(file, map_location="cpu", **({"mmap": True} if mmap and TORCH_2_1 else {}))
 
     except ModuleNotFoundError as e:  # e.name is missing module name
         if e.name == "models":
@@ -906,9 +914,10 @@ def attempt_load_weights(weights, device=None, inplace=True, fuse=False):
 
 def attempt_load_one_weight(weight, device=None, inplace=True, fuse=False):
     """Loads a single model weights."""
-    ckpt, weight = torch_safe_load(weight)  # load ckpt
+    ckpt, weight = torch_safe_load(weight, mmap=str(weight).endswith(READY_SUFFIX))  # load ckpt
     args = {**DEFAULT_CFG_DICT, **(ckpt.get("train_args", {}))}  # combine model and default args, preferring model args
-    model = (ckpt.get("ema") or ckpt["model"]).to(device).float()  # FP32 model
+    model = (ckpt.get("ema") or ckpt["model"]).to(device)
+    model = model if ckpt.get("ready") else model.float()  # FP32 model, ready-to-serve checkpoints keep their precision
 
     # Model compatibility updates
     model.args = {k: v for k, v in args.items() if k in DEFAULT_CFG_KEYS}  # attach args to model
@@ -930,6 +939,61 @@ def attempt_load_one_weight(weight, device=None, inplace=True, fuse=False):
     return model, ckpt
 
 
+def ready_checkpoint(weight, cache_dir=None, half=False):
+    """
+    Returns a ready-to-serve checkpoint of a model, building it the first time.
+
+    The checkpoint holds the model already fused, in eval mode and converted to FP16 or FP32, so loading it skips the
+    dtype conversion and Conv+BN fusion, and its tensors are memory-mapped from the file instead of being read into
+    memory. The file name is keyed by the SHA-256 of the weights, the torch version and the precision, so changed
+    weights or a torch upgrade build a new checkpoint.
+
+    Args:
+        weight (str | Path): Path to the *.pt weights.
+        cache_dir (str | Path, optional): Directory to keep the checkpoints in. Defaults to the directory of the weights.
+        half (bool): Store the model in FP16 instead of FP32.
+
+    Returns:
+        (Path): Path to the ready-to-serve checkpoint, loadable with `YOLO(path)` or `attempt_load_one_weight()`.
+
+    Example:
+        ```python
+        from ultralytics import YOLO
+        from ultralytics.nn.tasks import ready_checkpoint
+
+        model = YOLO(ready_checkpoint("path/to/best.pt"))
+        ```
+    """
+    weight = Path(weight)
+    sha = hashlib.sha256()
+    with open(weight, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    key = f"{sha.hexdigest()[:16]}-torch{torch.__version__}-{'fp16' if half else 'fp32'}"
+    file = Path(cache_dir or weight.parent) / f"{weight.stem}-{key}{READY_SUFFIX}"
+    if not file.exists():
+        with torch.no_grad():
+            model, ckpt = attempt_load_one_weight(weight, fuse=True)
+        model.half() if half else model.float()
+        for p in model.parameters():
+            p.requires_grad = False
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_suffix(f".{os.getpid()}.tmp")  # write then rename, so concurrent loaders never see a partial file
+        torch.save(
+            {
+                "model": model,
+                "train_args": ckpt.get("train_args", {}),
+                "date": datetime.now().isoformat(),
+                "version": __version__,
+                "ready": {"weights": str(weight), "key": key},
+            },
+            tmp,
+        )
+        os.replace(tmp, file)
+        LOGGER.info(f"Saved ready-to-serve checkpoint {file}")
+    return file
+
+
 def parse_model(d, ch, verbose=True):  # model_dict, input_channels(3)
     """Parse a YOLO model.yaml dictionary into a PyTorch model."""
     import ast
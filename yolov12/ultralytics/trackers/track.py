@@ -5,7 +5,8 @@ from pathlib import Path
 
 import torch
 
-from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.engine.results import LeanResults
+from ultralytics.utils import IterableSimpleNamespace, ops, yaml_load
 from ultralytics.utils.checks import check_yaml
 
 from .bot_sort import BOTSORT
@@ -74,12 +75,22 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
             tracker.reset()
             predictor.vid_path[i if is_stream else 0] = vid_path
 
-        det = (predictor.results[i].obb if is_obb else predictor.results[i].boxes).cpu().numpy()
-        if len(det) == 0:
+        result = predictor.results[i]
+        if isinstance(result, LeanResults):
+            boxes = result.boxes
+            det = IterableSimpleNamespace(conf=boxes["conf"], xywh=ops.xyxy2xywh(boxes["xyxy"]), cls=boxes["cls"])
+        else:
+            det = (result.obb if is_obb else result.boxes).cpu().numpy()
+        if len(det.conf) == 0:
             continue
         tracks = tracker.update(det, im0s[i])
         if len(tracks) == 0:
             continue
+        if isinstance(result, LeanResults):
+            predictor.results[i] = LeanResults.from_detections(
+                tracks[:, :-1], result.names, result.orig_shape, result.path
+            )
+            continue
         idx = tracks[:, -1].astype(int)
         predictor.results[i] = predictor.results[i][idx]
 
@@ -183,6 +183,9 @@ def non_max_suppression(
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
 
+    Unless apriori labels or rotated boxes are given, candidates of the whole batch are filtered together and only they
+    are converted to xyxy; on CUDA a single NMS call with per-image box offsets covers the batch.
+
     Args:
         prediction (torch.Tensor): A tensor of shape (batch_size, num_classes + 4 + num_masks, num_boxes)
             containing the predicted boxes, classes, and masks. The tensor should be in the format
@@ -239,13 +242,61 @@ def non_max_suppression(
     multi_label &= nc > 1  # multiple labels per box (adds 0.5ms/img)
 
     prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
+    t = time.time()
+    if not rotated and not labels:
+        # Batched path: filter the whole batch at once, converting only the candidates to xyxy (the input is not
+        # modified), then split the grouped candidates back per image
+        xi, _ = xc.nonzero(as_tuple=True)  # image index of each candidate, in image order
+        x = prediction[xc]  # confidence
+        x[:, :4] = xywh2xyxy(x[:, :4])  # xywh to xyxy
+        box, cls, mask = x.split((4, nc, nm), 1)
+
+        if multi_label:
+            i, j = torch.where(cls > conf_thres)
+            x, xi = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1), xi[i]
+        else:  # best class only
+            conf, j = cls.max(1, keepdim=True)
+            i = conf.view(-1) > conf_thres
+            x, xi = torch.cat((box, conf, j.float(), mask), 1)[i], xi[i]
+
+        # Filter by class
+        if classes is not None:
+            i = (x[:, 5:6] == classes).any(1)
+            x, xi = x[i], xi[i]
+
+        # Keep the max_nms most confident boxes of each image
+        if x.shape[0] > max_nms and torch.bincount(xi, minlength=bs).max() > max_nms:
+            i = x[:, 4].argsort(descending=True)
+            i = i[xi[i].sort(stable=True)[1]]  # by image, then by confidence
+            rank = torch.arange(len(i), device=x.device) - torch.searchsorted(xi[i], xi[i])
+            i = i[rank < max_nms]
+            x, xi = x[i], xi[i]
+
+        c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+        boxes, scores = x[:, :4] + c, x[:, 4]  # boxes (offset by class), scores
+        if x.is_cuda:
+            # Single NMS call, boxes also offset by image in float64 where the large image offsets are exact
+            boxes = boxes.double() + xi[:, None].double() * (max_wh * (2 if agnostic else nc + 2))
+            i = torchvision.ops.nms(boxes, scores.double(), iou_thres)  # sorted by decreasing confidence
+            i = i[xi[i].sort(stable=True)[1]]  # by image, then by confidence
+            output = [y[:max_det] for y in x[i].split(torch.bincount(xi[i], minlength=bs).tolist())]
+        else:
+            # CPU NMS cost grows quadratically with the number of boxes, so run it per image on the grouped slices
+            counts = torch.bincount(xi, minlength=bs).tolist() if bs > 1 else [len(x)]
+            output = [
+                y[torchvision.ops.nms(b, s, iou_thres)[:max_det]]
+                for y, b, s in zip(x.split(counts), boxes.split(counts), scores.split(counts))
+            ]
+        if (time.time() - t) > time_limit:
+            LOGGER.warning(f"WARNING ⚠️ NMS time limit {time_limit:.3f}s exceeded")
+        return output
+
     if not rotated:
         if in_place:
             prediction[..., :4] = xywh2xyxy(prediction[..., :4])  # xywh to xyxy
         else:
             prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
 
-    t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
     for xi, x in enumerate(prediction):  # image index, image inference
         # Apply constraints
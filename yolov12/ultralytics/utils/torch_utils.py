@@ -35,7 +35,9 @@ from ultralytics.utils.checks import check_version
 TORCH_1_9 = check_version(torch.__version__, "1.9.0")
 TORCH_1_13 = check_version(torch.__version__, "1.13.0")
 TORCH_2_0 = check_version(torch.__version__, "2.0.0")
+TORCH_2_1 = check_version(torch.__version__, "2.1.0")
 TORCH_2_4 = check_version(torch.__version__, "2.4.0")
+TORCH_2_9 = check_version(torch.__version__, "2.9.0")
 TORCHVISION_0_10 = check_version(TORCHVISION_VERSION, "0.10.0")
 TORCHVISION_0_11 = check_version(TORCHVISION_VERSION, "0.11.0")
 TORCHVISION_0_13 = check_version(TORCHVISION_VERSION, "0.13.0")
@@ -443,6 +445,11 @@ def copy_attr(a, b, include=(), exclude=()):
 
 def get_latest_opset():
     """Return the second-most recent ONNX opset version supported by this version of PyTorch, adjusted for maturity."""
+    if TORCH_2_9:
+        # PyTorch>=2.9 no longer exposes every 'symbolic_opset' module, ask the TorchScript exporter for its maximum
+        from torch.onnx import _constants
+
+        return _constants.ONNX_TORCHSCRIPT_EXPORTER_MAX_OPSET - 1
     if TORCH_1_13:
         # If the PyTorch>=1.13, dynamically compute the latest opset minus one using 'symbolic_opset'
         return max(int(k[14:]) for k in vars(torch.onnx) if "symbolic_opset" in k) - 1